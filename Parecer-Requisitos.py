@@ -12,6 +12,8 @@ Funcionalidades:
 - Preenche uma planilha Excel com os dados extraídos e a ação recomendada.
 - Oferece modos de execução para processamento completo, reprocessamento de falhas
   e correção de dados na planilha de saída.
+- Pode ser executado sem interação pela linha de comando, inclusive dividindo as propostas
+  entre várias máquinas (shards) e mesclando os resultados depois.
 
 Pré-requisitos:
 - Python 3.x
@@ -20,21 +22,115 @@ Pré-requisitos:
 - Uma instância do Google Chrome deve ser iniciada em modo de depuração na porta 9222.
   Exemplo de comando (Windows):
   "C:\Program Files\Google\Chrome\Application\chrome.exe" --remote-debugging-port=9222 --user-data-dir="C:\ChromeDebug"
+
+Uso:
+  python Parecer-Requisitos.py                                   (menu interativo)
+  python Parecer-Requisitos.py completo --filtro Convênio --shard 1/3 --pasta D:\robo\output
+  python Parecer-Requisitos.py mesclar --pasta D:\robo\output
+  python Parecer-Requisitos.py --help                            (demais modos e opções)
 """
 
-import pandas as pd
 import time
+
+# Referência para o tempo de inicialização (ver main e benchmark_inicializacao).
+INICIO_PROCESSO = time.perf_counter()
+
+import argparse
 import os
+import sys
 import json
+import gzip
+import hashlib
+import heapq
+import importlib
+import importlib.util
+import queue
+import sqlite3
+import subprocess
+import threading
+import re
 import unicodedata
-from selenium import webdriver
-from bs4 import BeautifulSoup
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from datetime import datetime
+import zlib
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from functools import lru_cache
+from io import StringIO
+from urllib.request import urlopen
+from datetime import datetime, timedelta
+
+
+# Tempo gasto em cada importação adiada: {módulo: segundos}.
+TEMPOS_IMPORTACAO = {}
+
+
+class ImportacaoTardia:
+    """
+    Substituto de um módulo (ou de um atributo dele) que só é importado no primeiro uso.
+
+    pandas, Selenium, webdriver_manager, BeautifulSoup, requests, lxml e selectolax somam a maior parte
+    do tempo de carga do script; adiando-os, o menu aparece antes e cada modo paga apenas pelo que usa.
+    O substituto repassa atributos e chamadas e pode ser usado como classe base.
+    """
+
+    def __init__(self, modulo, atributo=None):
+        self._modulo = modulo
+        self._atributo = atributo
+        self._alvo = None
+
+    def _carregar(self):
+        if self._alvo is None:
+            inicio = time.perf_counter()
+            alvo = importlib.import_module(self._modulo)
+            self._alvo = getattr(alvo, self._atributo) if self._atributo else alvo
+            TEMPOS_IMPORTACAO.setdefault(self._modulo, time.perf_counter() - inicio)
+        return self._alvo
+
+    def __getattr__(self, nome):
+        return getattr(self._carregar(), nome)
+
+    def __call__(self, *args, **kwargs):
+        return self._carregar()(*args, **kwargs)
+
+    def __mro_entries__(self, bases):
+        return (self._carregar(),)
+
+
+def modulo_disponivel(nome):
+    """Indica se um módulo pode ser importado, sem importá-lo."""
+    try:
+        return importlib.util.find_spec(nome) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+pd = ImportacaoTardia("pandas")
+webdriver = ImportacaoTardia("selenium.webdriver")
+Service = ImportacaoTardia("selenium.webdriver.chrome.service", "Service")
+ChromeDriverManager = ImportacaoTardia("webdriver_manager.chrome", "ChromeDriverManager")
+By = ImportacaoTardia("selenium.webdriver.common.by", "By")
+WebDriverWait = ImportacaoTardia("selenium.webdriver.support.ui", "WebDriverWait")
+EC = ImportacaoTardia("selenium.webdriver.support.expected_conditions")
+BeautifulSoup = ImportacaoTardia("bs4", "BeautifulSoup")
+
+# Dependências opcionais do caminho rápido via HTTP (ver ExtratorHTTP).
+if modulo_disponivel("requests"):
+    requests = ImportacaoTardia("requests")
+    HTTPAdapter = ImportacaoTardia("requests.adapters", "HTTPAdapter")
+else:
+    requests = None
+
+lxml_html = ImportacaoTardia("lxml.html") if modulo_disponivel("lxml") else None
+
+# Parser HTML rápido opcional para a página de Pareceres (ver BACKEND_HTML).
+if modulo_disponivel("selectolax.lexbor"):
+    HTMLParser = ImportacaoTardia("selectolax.lexbor", "LexborHTMLParser")
+elif modulo_disponivel("selectolax"):
+    HTMLParser = ImportacaoTardia("selectolax.parser", "HTMLParser")
+else:
+    HTMLParser = None
 
 # --- Configuração Global ---
 # Lista de nomes de técnicos para filtrar os pareceres relevantes.
@@ -50,660 +146,4668 @@ NOMES_TECNICOS = [
     "João Victor Cavalcante Teodoro"
 ]
 
+# Endereço base do portal. Pode ser apontado para um servidor local que sirva páginas gravadas.
+URL_BASE = "https://discricionarias.transferegov.sistema.gov.br"
+
+# Quando ativado, as páginas de Pareceres e Requisitos de propostas já visitadas são baixadas
+# diretamente via HTTP (reaproveitando os cookies do navegador). O Selenium continua sendo usado
+# para o login e como alternativa sempre que o caminho HTTP falhar.
+USAR_EXTRACAO_HTTP = False
+
+# Parser usado na página de Pareceres: "selectolax", "lxml", "html.parser" (BeautifulSoup) ou
+# "auto", que escolhe o mais rápido disponível nesta ordem.
+BACKEND_HTML = "auto"
+
+# Contêineres da página de Pareceres e o rótulo usado no log de cada um.
+CONTEINERES_PARECERES = {
+    "divPareceresProposta": "PARECER PROPOSTA",
+    "divPareceresPlanoTrabalho": "PARECER PLANO",
+}
+
+# XPaths das tabelas da aba 'Requisitos', compartilhados entre o Selenium e o caminho HTTP.
+XPATHS_REQUISITOS = {
+    "Certidões": "/html/body/div[3]/div[16]/div[2]/div[2]/form/div[1]/div[1]/table",
+    "Declarações": "/html/body/div[3]/div[16]/div[2]/div[2]/form/div[1]/div[2]/table",
+    "Comprovantes de Execução": "/html/body/div[3]/div[16]/div[2]/div[2]/form/div[1]/div[3]/table",
+    "Outros": "/html/body/div[3]/div[16]/div[2]/div[2]/form/div[1]/div[4]/table",
+}
+XPATH_HISTORICO = "/html/body/div[3]/div[16]/div[2]/div[2]/form/div[1]/div[5]/table"
+
+# Tempo máximo (em segundos) de cada etapa de espera da navegação. As esperas terminam assim que o
+# sinal de prontidão aparece; estes valores só limitam o pior caso. Ajuste-os com base no resumo
+# impresso ao final de cada execução (ver resumo_esperas).
+TEMPOS_ESPERA = {
+    "pagina_principal": 10,
+    "menu": 5,
+    "submenu": 5,
+    "transicao_pesquisa": 5,
+    "campo_pesquisa": 5,
+    "botao_pesquisar": 1,
+    "transicao_resultado": 5,
+    "link_proposta": 3,
+    "link_direto": 5,
+    "nova_aba": 5,
+    "plano_trabalho": 10,
+    "transicao_plano": 3,
+    "subaba_pareceres": 10,
+    "pagina_pareceres": 5,
+    "aba_requisitos": 10,
+    "transicao_requisitos": 3,
+    "subaba_requisitos": 10,
+    "pagina_requisitos": 5,
+}
+
+# Causa tipada de cada falha de proposta -> tratamento no reprocessamento (ver reprocessar_falhas).
+# 'transitoria': nova tentativa na mesma execução, com espera exponencial e limite de tentativas.
+# 'permanente': a proposta não é mais tentada. 'sessao': interrompe a passada até um novo login.
+CAUSAS_FALHA = {
+    "timeout": "transitoria",
+    "seletor_ausente": "transitoria",
+    "erro_inesperado": "transitoria",
+    "sessao_expirada": "sessao",
+    "nao_encontrado": "permanente",
+}
+TENTATIVAS_MAXIMAS = 3
+ESPERA_BASE_RETENTATIVA = 5
+ESPERA_MAXIMA_RETENTATIVA = 60
+# Trechos de URL que indicam que o portal redirecionou para a tela de login.
+MARCADORES_LOGIN = ["login", "acesso.gov.br", "sessaoexpirada"]
+# Valores de 'Ação Necessária (Automação)' gravados quando a proposta falhou.
+ACOES_FALHA = ["Instrumento não encontrado", "Erro de Navegação", "Erro"]
+
+# XPaths e seletores da pesquisa de propostas e da página de pareceres.
+XPATH_CAMPO_PESQUISA = "/html/body/div[3]/div[15]/div[3]/div/div/form/table/tbody/tr[1]/td[2]/input"
+XPATH_BOTAO_PESQUISAR = "/html/body/div[3]/div[15]/div[3]/div/div/form/table/tbody/tr[1]/td[2]/span/input"
+XPATH_LINK_PROPOSTA = "/html/body/div[3]/div[15]/div[3]/div[3]/table/tbody/tr/td[1]/div/a"
+XPATH_LINKS_RESULTADO = "/html/body/div[3]/div[15]/div[3]/div[3]/table/tbody/tr/td[1]/div/a"
+XPATH_PROXIMA_PAGINA = "//span[contains(@class, 'pagelinks')]//a[contains(normalize-space(.), 'Próx')]"
+SELETOR_PARECERES = "#divPareceresProposta, #divPareceresPlanoTrabalho"
+
+# Elementos clicados na navegação -> estratégias de localização em ordem de preferência (ver RegistroSeletores).
+# Cada estratégia é (tipo, seletor), com tipo 'id', 'css' ou 'xpath'; '{num_proposta}' é preenchido na pesquisa.
+# A primeira é o seletor original do portal; as seguintes se apoiam em ids, atributos (href, type) ou no texto
+# visível e só são usadas quando ela deixa de funcionar. A chave também é a etapa de TEMPOS_ESPERA.
+SELETORES = {
+    "menu": [
+        ("xpath", "/html/body/div[1]/div[3]/div[1]/div[1]/div[1]/div[3]"),
+        ("xpath", "//div[normalize-space(text())='Propostas']"),
+    ],
+    "submenu": [
+        ("xpath", "/html/body/div[1]/div[3]/div[2]/div[1]/div[1]/ul/li[3]/a"),
+        ("css", "a[href*='ConsultarProposta']"),
+        ("xpath", "//a[normalize-space(.)='Consultar Propostas']"),
+    ],
+    "campo_pesquisa": [
+        ("xpath", XPATH_CAMPO_PESQUISA),
+        ("css", "form[action*='ConsultarProposta'] input[type='text']"),
+        ("xpath", "//input[@type='submit' and normalize-space(@value)='Pesquisar']/ancestor::td[1]/input[@type='text']"),
+    ],
+    "botao_pesquisar": [
+        ("xpath", XPATH_BOTAO_PESQUISAR),
+        ("css", "form[action*='ConsultarProposta'] input[type='submit']"),
+        ("xpath", "//input[@type='submit' and normalize-space(@value)='Pesquisar']"),
+    ],
+    "link_proposta": [
+        ("xpath", XPATH_LINK_PROPOSTA),
+        ("css", "table a[href*='Detalhar']"),
+        ("xpath", "//table//a[normalize-space(.)='{num_proposta}']"),
+    ],
+    "plano_trabalho": [
+        ("xpath", "//*[@id='div_997366806']/span/span"),
+        ("id", "div_997366806"),
+        ("xpath", "//a[.//span[normalize-space(text())='Plano de Trabalho']]//span/span"),
+    ],
+    "subaba_pareceres": [
+        ("xpath", "/html/body/div[3]/div[15]/div[1]/div/div[2]/a[10]/div/span/span"),
+        ("css", "a[href*='Parecer'] div span span"),
+        ("xpath", "//a[.//span[normalize-space(text())='Pareceres']]//span/span"),
+    ],
+    "aba_requisitos": [
+        ("xpath", "/html/body/div[3]/div[15]/div[1]/div/div[1]/a[3]/div/span/span"),
+        ("css", "a[href*='RequisitosMenu'] div span span"),
+        ("xpath", "(//a[.//span[normalize-space(text())='Requisitos']])[1]//span/span"),
+    ],
+    "subaba_requisitos": [
+        ("css", "a[id='menu_link_2144784112_100344749'] div[class='inactiveTab'] span span"),
+        ("id", "menu_link_2144784112_100344749"),
+        ("xpath", "(//a[.//span[normalize-space(text())='Requisitos']])[last()]//span/span"),
+    ],
+}
+# Propostas seguidas em que um mesmo alvo de SELETORES pode não ser encontrado antes de a execução ser interrompida.
+LIMITE_FALHAS_SELETOR = 5
+
+# Aba da planilha de entrada e estrutura do DataFrame de saída. Apenas estas colunas são lidas da entrada.
+ABA_ENTRADA = 'Propostas 2025'
+COLUNAS_SAIDA = [
+    'Nº Proposta', 'Instrumento', 'Técnico Responsável pela Formalização',
+    'Lista Pareceres de Proposta', 'Lista Pareceres do plano de Trabalho',
+    'Certidões', 'Declarações', 'Comprovantes de Execução', 'Outros',
+    'Histórico (Data)', 'Histórico (Evento)',
+    'Fator Pendente para Celebração (Exceto Documentação)',
+    'Situacional (Documentação)', 'Ação Necessária (Automação)'
+]
+
+# Incrementar quando a preparação da planilha de entrada mudar, invalidando os caches existentes.
+VERSAO_CACHE_ENTRADA = 1
+
+# Colunas de saída preenchidas pela extração web (e guardadas na base de estado das propostas).
+COLUNAS_EXTRAIDAS = [
+    'Lista Pareceres de Proposta', 'Lista Pareceres do plano de Trabalho',
+    'Certidões', 'Declarações', 'Comprovantes de Execução', 'Outros',
+    'Histórico (Data)', 'Histórico (Evento)'
+]
+
+# Colunas gravadas no diário de resultados para cada proposta processada.
+COLUNAS_DIARIO = COLUNAS_EXTRAIDAS + ['Ação Necessária (Automação)']
+
+# Campo de ResultadoProposta -> coluna de saída correspondente (na ordem de COLUNAS_DIARIO).
+CAMPOS_RESULTADO = dict(zip(
+    ["pareceres_proposta", "pareceres_plano", "certidoes", "declaracoes", "comprovantes",
+     "outros", "historico_data", "historico_evento", "acao"],
+    COLUNAS_DIARIO,
+))
+
+# Cada gravação da planilha de saída informa a memória do processo antes e depois (ver memoria_processo).
+# Esta opção mede também o pico das alocações feitas durante a escrita (tracemalloc), que deixa a escrita
+# várias vezes mais lenta, então fica desligada fora de investigações de desempenho.
+MEDIR_MEMORIA_ESCRITA = False
+
+# Documentos que não são de conformidade (ex: planos de trabalho) e não contam como envio da entidade.
+PALAVRAS_IGNORAR = [
+    "atestado", "capacidade", "técnica", "projeto", "técnico",
+    "pedagógico", "ptp", "plano", "trabalho", "planilha", "custos"
+]
+
+# Modo enxuto de carregamento (opcional): o Chrome deixa de baixar imagens, fontes, mídia e
+# scripts de analytics, que o robô não lê. Padrões no formato de Network.setBlockedURLs (curinga *).
+MODO_ENXUTO = False
+RECURSOS_BLOQUEADOS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*hotjar.com*", "*clarity.ms*",
+]
+# Recursos de que a navegação depende (menus e abas): nunca são bloqueados, mesmo que algum
+# padrão de RECURSOS_BLOQUEADOS os alcance (esse padrão é descartado).
+RECURSOS_PERMITIDOS = ["*/voluntarias/*.js", "*/voluntarias/*.css"]
+
+# Cache do caminho do chromedriver e da sua versão principal (ver caminho_chromedriver). Fica na pasta
+# dos arquivos (definido por configurar_arquivos_apoio); sem ela, o driver é resolvido a cada execução.
+ARQUIVO_CHROMEDRIVER = None
+# Última estratégia de SELETORES que encontrou cada alvo (ver RegistroSeletores). Fica na pasta dos
+# arquivos (definido por configurar_arquivos_apoio); sem ela, a preferência vale só para a execução.
+ARQUIVO_SELETORES = None
+
+# Cache de páginas (opcional): guarda o HTML de Pareceres e Requisitos de cada proposta, comprimido e
+# endereçado pelo conteúdo, para refazer a análise sem o navegador (ver CacheHTML e reavaliar_cache).
+# Retenção: as últimas 'versoes' de cada página por proposta; versões antigas somem após 'dias'.
+USAR_CACHE_HTML = False
+RETENCAO_CACHE_HTML = {"versoes": 3, "dias": 90}
+
+# Abas do Chrome de depuração (ver GerenciadorAbas). As abas abertas para cada proposta são fechadas ao
+# fim dela; a sessão é reciclada (aba nova e limpa, abas do robô fechadas; cookies e login ficam no
+# perfil) quando um limite é ultrapassado ou a cada RECICLAR_A_CADA propostas (0 desliga).
+FECHAR_ABAS_PROPOSTA = True
+LIMITE_ABAS = 4
+LIMITE_HEAP_MB = 768
+LIMITE_NOS_DOM = 150000
+VERIFICAR_MEMORIA_A_CADA = 10
+RECICLAR_A_CADA = 300
+# Quantidade de propostas usadas para comparar a latência antes e depois de cada reciclagem.
+JANELA_LATENCIA = 10
+
+# Pipeline de análise (ver PipelineAnalise): o navegador só navega e lê o conteúdo bruto das páginas;
+# a análise, a decisão da ação e as gravações rodam em uma thread à parte, enquanto o navegador já
+# carrega a proposta seguinte. Com LIMITE_FILA_ANALISE propostas aguardando análise, o navegador espera.
+PIPELINE_ANALISE = True
+LIMITE_FILA_ANALISE = 8
+
+# Ordem da fila (ver prioridade_propostas): cada proposta pendente soma os pontos abaixo e as de maior
+# pontuação são processadas primeiro (empates mantêm a ordem da planilha); as resolvidas pelo situacional
+# nem entram na fila. 'falha' vale pelo tipo da causa da última falha (ver CAUSAS_FALHA); 'acao_anterior',
+# pela ação que os fatos gravados dão com as regras atuais; 'atividade_recente' vale integralmente para um
+# Histórico ou documento de hoje e cai a zero em 'janela_dias' dias; 'situacional' soma pontos por situacional.
+ORDENAR_POR_PRIORIDADE = True
+PRIORIDADE_FILA = {
+    "sem_extracao": 100,
+    "falha": {"transitoria": 60, "sessao": 60, "permanente": -50},
+    # Pendência da entidade: um envio novo muda a ação para 'Técnico Analisar'
+    "acao_anterior": {"Entidade Pendência de Documentação": 40, "Técnico Analisar": 20},
+    "atividade_recente": 30,
+    "janela_dias": 30,
+    "situacional": {},
+}
+
+# Arquivo JSON opcional que substitui as listas acima sem editar o script:
+# {"nomes_tecnicos": [...], "palavras_ignorar": [...]} (chaves ausentes mantêm a lista padrão).
+# Fica na pasta dos arquivos, como termos_analise.json (definido por configurar_arquivos_apoio).
+ARQUIVO_TERMOS = None
+
+# Tabela de regras da 'Ação Necessária (Automação)', avaliada em ordem (a primeira regra que casa vence).
+# 'situacional': ação definida apenas pela pré-análise, sem extração web.
+# 'datas': condição sobre os fatos extraídos (ver CONDICOES_ACAO) -> ação.
+# Incremente 'versao' a cada mudança nas regras; ver reavaliar_acoes.
+REGRAS_ACAO = {
+    "versao": 1,
+    "situacional": [
+        ("Em Celebração", [
+            "Parecer e Termo para Correção", "Parecer e Termo Corrigido (Necessidade de Ajuste)",
+            "Parecer para Assinatura", "Termo Disponibilizado Usuário Externo",
+            "Termo Disponibilizado Secretário(a)", "Processo Enviado ao GAB - Para Publicação",
+        ]),
+        ("Parceria Celebrada", ["Aguardando Registro Transferegov CGFP", "Cláusula Suspensiva 2025", "Enviado à CGAP"]),
+        ("Proposta Rejeitada", ["Alteração de Beneficiário", "Proposta Rejeitada"]),
+        ("Técnico Analisar", ["Enviar Link Declarações", "Enviado Link Declarações"]),
+    ],
+    "datas": [
+        ("parecer_mais_recente", "Entidade Pendência de Documentação"),
+        ("requisito_mais_recente", "Técnico Analisar"),
+        ("empate_complementacao_solicitada", "Entidade Pendência de Documentação"),
+        ("empate", "Técnico Analisar"),
+        ("sempre", "Entidade Pendência de Documentação"),  # Nenhum documento ou parecer encontrado
+    ],
+}
+
 
 # ==============================================================================
 # Funções Utilitárias e de Interação com o Navegador
 # ==============================================================================
 
-def conectar_navegador_existente():
+def normalizar_texto(texto):
+    """Remove acentos (decomposição NFKD) e caixa, para comparações como 'Técnica' == 'tecnica'."""
+    texto = str(texto)
+    if not texto.isascii():
+        texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return texto.lower()
+
+
+class CorrespondenciaTermos:
+    """
+    Verifica se um texto contém algum termo de uma lista, ignorando acentos e caixa.
+
+    Os termos são normalizados uma única vez e compilados em uma só expressão regular
+    (alternância, termos mais longos primeiro), em vez de percorrer a lista a cada texto.
+    """
+
+    def __init__(self, termos):
+        self.termos = [termo for termo in dict.fromkeys(normalizar_texto(t).strip() for t in termos) if termo]
+        alternativas = "|".join(re.escape(termo) for termo in sorted(self.termos, key=len, reverse=True))
+        self._padrao = re.compile(alternativas) if alternativas else None
+
+    def encontrar(self, texto):
+        """Retorna o termo (normalizado) encontrado no texto, ou None."""
+        if not self._padrao or not texto:
+            return None
+        ocorrencia = self._padrao.search(normalizar_texto(texto))
+        return ocorrencia.group(0) if ocorrencia else None
+
+    def contem(self, texto):
+        return self.encontrar(texto) is not None
+
+
+_CORRESPONDENCIAS = {}
+
+
+def configurar_termos(caminho=None):
+    """
+    (Re)carrega os termos de NOMES_TECNICOS e PALAVRAS_IGNORAR, sobrepostos pelo arquivo JSON
+    de configuração (caminho ou ARQUIVO_TERMOS) quando ele existir, e recompila as correspondências.
+    """
+    caminho = caminho or ARQUIVO_TERMOS
+    termos = {"nomes_tecnicos": NOMES_TECNICOS, "palavras_ignorar": PALAVRAS_IGNORAR}
+    if caminho and os.path.exists(caminho):
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                configurados = json.load(f)
+            termos.update({chave: configurados[chave] for chave in termos if chave in configurados})
+            print(f"[INFO] Termos de análise carregados de '{caminho}'.")
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"[WARNING] Arquivo de termos '{caminho}' ilegível ({e}). Usando as listas padrão.")
+    _CORRESPONDENCIAS.update({chave: CorrespondenciaTermos(lista) for chave, lista in termos.items()})
+
+
+def correspondencia(chave):
+    """Retorna a CorrespondenciaTermos de 'nomes_tecnicos' ou 'palavras_ignorar' (carregada na primeira chamada)."""
+    if chave not in _CORRESPONDENCIAS:
+        configurar_termos()
+    return _CORRESPONDENCIAS[chave]
+
+
+def versao_principal(texto):
+    """Extrai a versão principal de textos como 'Chrome/124.0.6367.91' ou 'ChromeDriver 124.0.6367.91 (...)'."""
+    encontrado = re.search(r"(\d+)\.\d+\.\d+", texto or "")
+    return int(encontrado.group(1)) if encontrado else None
+
+
+def versao_chrome_depuracao(porta):
+    """Versão principal do Chrome em depuração na porta, lida do endpoint local /json/version (sem internet)."""
+    try:
+        with urlopen(f"http://localhost:{porta}/json/version", timeout=2) as resposta:
+            return versao_principal(json.load(resposta).get("Browser"))
+    except Exception:
+        return None
+
+
+def versao_chromedriver(caminho):
+    try:
+        saida = subprocess.run([caminho, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except Exception:
+        return None
+    return versao_principal(saida)
+
+
+_chromedriver_resolvido = None
+
+
+def caminho_chromedriver(porta=None):
+    """
+    Resolve o caminho do chromedriver uma única vez por execução.
+
+    O caminho e a versão principal do driver ficam gravados em ARQUIVO_CHROMEDRIVER. Enquanto o arquivo
+    existir e a versão bater com a do Chrome em depuração (consultada localmente), ele é usado sem
+    acessar a rede; caso contrário, o ChromeDriverManager baixa/localiza o driver e o cache é regravado.
+
+    Args:
+        porta (int): Porta de depuração do Chrome a comparar (opcional).
+
+    Returns:
+        str: Caminho do executável do chromedriver.
+    """
+    global _chromedriver_resolvido
+    if _chromedriver_resolvido:
+        return _chromedriver_resolvido
+
+    versao_chrome = versao_chrome_depuracao(porta) if porta else None
+    cache = {}
+    if ARQUIVO_CHROMEDRIVER:
+        try:
+            with open(ARQUIVO_CHROMEDRIVER, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+    caminho = cache.get("caminho")
+    if caminho and os.path.isfile(caminho) and os.access(caminho, os.X_OK) \
+            and (versao_chrome is None or cache.get("versao") == versao_chrome):
+        _chromedriver_resolvido = caminho
+        return caminho
+
+    inicio = time.perf_counter()
+    caminho = ChromeDriverManager().install()
+    print(f"[INFO] chromedriver resolvido pelo ChromeDriverManager em {time.perf_counter() - inicio:.1f}s: {caminho}")
+    if ARQUIVO_CHROMEDRIVER:
+        try:
+            with open(ARQUIVO_CHROMEDRIVER, 'w', encoding='utf-8') as f:
+                json.dump({"caminho": caminho, "versao": versao_chromedriver(caminho)}, f)
+        except OSError as erro:
+            print(f"[WARNING] Não foi possível gravar o cache do chromedriver: {erro}")
+    _chromedriver_resolvido = caminho
+    return caminho
+
+
+def conectar_navegador_existente(porta=9222):
     """
     Conecta-se a uma instância do Google Chrome em execução com a porta de depuração remota ativada.
 
+    Args:
+        porta (int): A porta de depuração remota do Chrome (padrão: 9222).
+
     Returns:
         webdriver.Chrome: Objeto do driver do Selenium conectado ao navegador.
-        None: Se a conexão falhar, o script é encerrado.
+        Se a conexão falhar, o script é encerrado com código de saída 1.
     """
     options = webdriver.ChromeOptions()
-    options.debugger_address = "localhost:9222"
+    options.debugger_address = f"localhost:{porta}"
     try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        print("[SUCCESS] Conectado com sucesso ao navegador existente.")
+        driver = webdriver.Chrome(service=Service(caminho_chromedriver(porta)), options=options)
+        print(f"[SUCCESS] Conectado com sucesso ao navegador existente (porta {porta}).")
         return driver
     except Exception as erro:
         print(f"[ERROR] Falha ao conectar ao navegador: {erro}.")
-        print("[INFO] Verifique se o Chrome foi iniciado com o modo de depuração ativado na porta 9222.")
-        exit()
+        print(f"[INFO] Verifique se o Chrome foi iniciado com o modo de depuração ativado na porta {porta}.")
+        sys.exit(1)
+
+
+class SessoesNavegador:
+    """
+    Conexões com o Chrome em depuração, uma por porta, reaproveitadas entre as opções do menu.
+
+    Uma sessão só é recriada se a anterior deixou de responder; encerrar() finaliza as sessões
+    do chromedriver sem fechar o navegador, que pertence ao usuário.
+    """
+
+    def __init__(self):
+        self._drivers = {}
+
+    def obter(self, porta=9222):
+        if driver := self._drivers.get(porta):
+            try:
+                driver.window_handles
+                return driver
+            except Exception:
+                print(f"[WARNING] A sessão com o navegador (porta {porta}) não responde. Reconectando.")
+                self._descartar(driver)
+        self._drivers[porta] = driver = conectar_navegador_existente(porta)
+        return driver
+
+    def _descartar(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def encerrar(self):
+        for driver in self._drivers.values():
+            self._descartar(driver)
+        self._drivers.clear()
+
+
+def ler_portas_depuracao(texto):
+    """
+    Converte a entrada do usuário em uma lista de portas de depuração.
+
+    Args:
+        texto (str): Portas separadas por vírgula (ex: "9222,9223"). Vazio equivale a 9222.
+
+    Returns:
+        list[int]: Lista de portas sem repetição, na ordem informada.
+    """
+    portas = []
+    for parte in texto.split(','):
+        parte = parte.strip()
+        if parte.isdigit() and int(parte) not in portas:
+            portas.append(int(parte))
+    return portas or [9222]
+
+
+# Tempos efetivamente aguardados por etapa: {etapa: [(segundos, sucesso), ...]}.
+REGISTRO_ESPERAS = defaultdict(list)
+_trava_esperas = threading.Lock()
+
+
+def registrar_espera(etapa, segundos, sucesso):
+    """Registra quanto tempo uma etapa de espera levou e se o sinal esperado apareceu."""
+    if etapa:
+        with _trava_esperas:
+            REGISTRO_ESPERAS[etapa].append((segundos, sucesso))
+
+
+def resumo_esperas():
+    """Imprime, por etapa, a quantidade de esperas, a média, o máximo e os estouros de tempo."""
+    with _trava_esperas:
+        itens = sorted(REGISTRO_ESPERAS.items())
+    if not itens:
+        return
+    print("\n[INFO] Resumo das esperas por etapa (segundos):")
+    for etapa, registros in itens:
+        tempos = [segundos for segundos, _ in registros]
+        estouros = sum(1 for _, sucesso in registros if not sucesso)
+        print(f"  {etapa:<22} n={len(tempos):<5} média={sum(tempos) / len(tempos):.2f} "
+              f"máx={max(tempos):.2f} limite={TEMPOS_ESPERA.get(etapa, '-')} estouros={estouros}")
+
+
+def resumo_tempos(valores):
+    """Retorna (quantidade, média, p50, p95, máximo) de uma lista de durações em segundos."""
+    if not valores:
+        return 0, 0.0, 0.0, 0.0, 0.0
+    ordenados = sorted(valores)
+
+    def percentil(p):
+        return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+    return len(ordenados), sum(ordenados) / len(ordenados), percentil(50), percentil(95), ordenados[-1]
+
+
+class RegistroEtapas:
+    """
+    Registro de spans de tempo por etapa do processamento (navegação, leitura, gravação).
+
+    Cada span guarda a etapa, o Nº da proposta em andamento, a duração e o resultado. Ao final da
+    execução os spans são agregados por etapa (p50/p95) e podem ser exportados em JSON Lines e
+    no formato de textfile do Prometheus (node_exporter).
+    """
+
+    def __init__(self):
+        self._spans = []
+        self._trava = threading.Lock()
+        self._contexto = threading.local()
+
+    @property
+    def proposta_atual(self):
+        return getattr(self._contexto, "num_proposta", None)
+
+    @contextmanager
+    def medir(self, etapa, num_proposta=None):
+        """
+        Mede o bloco como um span da etapa. O dicionário entregue permite definir o 'resultado'
+        (padrão 'ok'; 'erro' se o bloco levantar exceção). Informar num_proposta o associa também
+        aos spans abertos dentro do bloco, na mesma thread.
+        """
+        anterior = self.proposta_atual
+        if num_proposta is not None:
+            self._contexto.num_proposta = num_proposta
+        span = {"resultado": "ok"}
+        inicio_relogio = datetime.now()
+        inicio = time.perf_counter()
+        try:
+            yield span
+        except Exception:
+            span["resultado"] = "erro"
+            raise
+        finally:
+            duracao = time.perf_counter() - inicio
+            self._contexto.num_proposta = anterior
+            with self._trava:
+                self._spans.append({
+                    "etapa": etapa, "num_proposta": num_proposta or anterior, "resultado": str(span["resultado"]),
+                    "inicio": inicio_relogio.isoformat(timespec="milliseconds"), "duracao": round(duracao, 6),
+                })
+
+    def spans(self):
+        with self._trava:
+            return list(self._spans)
+
+    def limpar(self):
+        with self._trava:
+            self._spans.clear()
+
+    def resumo(self):
+        """Retorna {etapa: {'tempos': (n, média, p50, p95, máx), 'resultados': {resultado: quantidade}}}."""
+        por_etapa = defaultdict(list)
+        for span in self.spans():
+            por_etapa[span["etapa"]].append(span)
+        resumo = {}
+        for etapa, spans in por_etapa.items():
+            resultados = defaultdict(int)
+            for span in spans:
+                resultados[span["resultado"]] += 1
+            resumo[etapa] = {"tempos": resumo_tempos([span["duracao"] for span in spans]), "resultados": dict(resultados)}
+        return resumo
+
+    def imprimir_resumo(self):
+        if not (resumo := self.resumo()):
+            return
+        print("\n[INFO] Tempos por etapa (segundos):")
+        print(f"  {'Etapa':<38}{'n':>6}{'média':>9}{'p50':>9}{'p95':>9}{'máx':>9}  resultados")
+        for etapa, dados in sorted(resumo.items()):
+            quantidade, media, p50, p95, maximo = dados["tempos"]
+            resultados = ", ".join(f"{r}={q}" for r, q in sorted(dados["resultados"].items()))
+            print(f"  {etapa:<38}{quantidade:>6}{media:>9.3f}{p50:>9.3f}{p95:>9.3f}{maximo:>9.3f}  {resultados}")
+
+    def exportar_jsonl(self, caminho):
+        """Acrescenta os spans registrados ao arquivo JSON Lines."""
+        with open(caminho, 'a', encoding='utf-8') as f:
+            for span in self.spans():
+                f.write(json.dumps(span, ensure_ascii=False) + "\n")
+
+    def exportar_prometheus(self, caminho):
+        """Grava o resumo no formato textfile do Prometheus (substituição atômica do arquivo)."""
+        def rotulo(valor):
+            return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+        linhas = [
+            "# HELP robo_propostas_etapa_segundos Duração das etapas do robô de análise de propostas.",
+            "# TYPE robo_propostas_etapa_segundos summary",
+        ]
+        contagens = ["# HELP robo_propostas_etapa_total Spans por etapa e resultado.",
+                     "# TYPE robo_propostas_etapa_total counter"]
+        por_etapa = defaultdict(list)
+        for span in self.spans():
+            por_etapa[span["etapa"]].append(span["duracao"])
+        for etapa, dados in sorted(self.resumo().items()):
+            quantidade, _, p50, p95, _ = dados["tempos"]
+            etiqueta = f'etapa="{rotulo(etapa)}"'
+            linhas += [
+                f'robo_propostas_etapa_segundos{{{etiqueta},quantile="0.5"}} {p50:.6f}',
+                f'robo_propostas_etapa_segundos{{{etiqueta},quantile="0.95"}} {p95:.6f}',
+                f'robo_propostas_etapa_segundos_sum{{{etiqueta}}} {sum(por_etapa[etapa]):.6f}',
+                f'robo_propostas_etapa_segundos_count{{{etiqueta}}} {quantidade}',
+            ]
+            contagens += [f'robo_propostas_etapa_total{{{etiqueta},resultado="{rotulo(r)}"}} {q}'
+                          for r, q in sorted(dados["resultados"].items())]
+        temporario = caminho + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            f.write("\n".join(linhas + contagens) + "\n")
+        os.replace(temporario, caminho)
+
+
+REGISTRO_ETAPAS = RegistroEtapas()
+medir_etapa = REGISTRO_ETAPAS.medir
+
+
+def finalizar_metricas(paths):
+    """Imprime o resumo das etapas, exporta os spans (se houver caminhos em paths) e limpa o registro."""
+    REGISTRO_ETAPAS.imprimir_resumo()
+    try:
+        if paths.get('metricas'):
+            REGISTRO_ETAPAS.exportar_jsonl(paths['metricas'])
+        if paths.get('prometheus'):
+            REGISTRO_ETAPAS.exportar_prometheus(paths['prometheus'])
+    except IOError as e:
+        print(f"[WARNING] Não foi possível exportar as métricas das etapas: {e}")
+    REGISTRO_ETAPAS.limpar()
+
+
+# Causa da falha da proposta em andamento, por thread (cada thread do modo paralelo processa uma proposta).
+_falha_atual = threading.local()
+
+
+def limpar_falha():
+    """Descarta a causa de falha registrada para a proposta anterior desta thread."""
+    _falha_atual.causa = None
+    _falha_atual.espera = None
+
+
+def sinalizar_falha(causa=None):
+    """
+    Registra a causa da falha da proposta em andamento (vale a primeira registrada).
+    Sem causa explícita, usa a da última espera estourada (ver esperar_condicao).
+    """
+    if getattr(_falha_atual, "causa", None) is None:
+        _falha_atual.causa = causa or getattr(_falha_atual, "espera", None) or "seletor_ausente"
+
+
+def causa_falha_atual():
+    return getattr(_falha_atual, "causa", None)
+
+
+def causa_ultima_espera():
+    """'timeout' se a página não terminou de carregar na última espera estourada, 'seletor_ausente' se carregou."""
+    return getattr(_falha_atual, "espera", None)
+
+
+def causa_da_excecao(erro):
+    """Classifica uma exceção do Selenium em uma das causas de CAUSAS_FALHA."""
+    from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+    if isinstance(erro, TimeoutException):
+        return "timeout"
+    if isinstance(erro, (NoSuchElementException, StaleElementReferenceException)):
+        return "seletor_ausente"
+    return "erro_inesperado"
+
+
+def sessao_expirada(driver):
+    """Indica se a aba atual foi redirecionada para a tela de login do portal."""
+    try:
+        url = driver.current_url.lower()
+    except Exception:
+        return False
+    return any(marcador in url for marcador in MARCADORES_LOGIN)
+
+
+def esperar_condicao(driver, condicao, etapa=None, tempo=None):
+    """
+    Aguarda até que uma condição seja verdadeira, registrando o tempo gasto na etapa.
+
+    Args:
+        driver (webdriver.Chrome): A instância do driver do Selenium.
+        condicao (callable): Condição no formato do WebDriverWait (recebe o driver).
+        etapa (str): Nome da etapa; define o tempo limite via TEMPOS_ESPERA e identifica o registro.
+        tempo (float): Tempo máximo explícito, sobrepondo TEMPOS_ESPERA.
+
+    Returns:
+        O valor retornado pela condição, ou None se o tempo limite for atingido.
+    """
+    if tempo is None:
+        tempo = TEMPOS_ESPERA.get(etapa, 5)
+    inicio = time.perf_counter()
+    try:
+        resultado = WebDriverWait(driver, tempo, poll_frequency=0.2).until(condicao)
+    except Exception:
+        resultado = None
+    registrar_espera(etapa, time.perf_counter() - inicio, resultado is not None)
+    if resultado is None:
+        try:
+            _falha_atual.espera = "seletor_ausente" if documento_pronto(driver) else "timeout"
+        except Exception:
+            _falha_atual.espera = "timeout"
+    return resultado
+
+
+def documento_pronto(driver):
+    """Condição: o documento atual terminou de carregar."""
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def transicao_concluida(elemento_anterior=None, alvo=None):
+    """
+    Cria uma condição que indica o fim de uma navegação disparada por um clique.
+
+    A navegação é considerada concluída quando o elemento clicado foi desanexado da página
+    (a página anterior foi descartada) ou quando o alvo da próxima etapa já está presente,
+    e o documento está pronto.
+
+    Args:
+        elemento_anterior (WebElement): O elemento clicado na etapa anterior.
+        alvo (tuple): Localizador (By, seletor) do elemento esperado na página seguinte.
+    """
+    from selenium.common.exceptions import StaleElementReferenceException
+
+    def condicao(driver):
+        sinal = False
+        if elemento_anterior is not None:
+            try:
+                elemento_anterior.is_enabled()
+            except StaleElementReferenceException:
+                sinal = True
+        if not sinal and alvo is not None:
+            sinal = bool(driver.find_elements(*alvo))
+        return sinal and documento_pronto(driver)
+    return condicao
 
 
-def esperar_elemento(driver, xpath, tempo=1):
+def esperar_elemento(driver, xpath, tempo=None, etapa=None):
     """
     Aguarda explicitamente até que um elemento seja clicável na página.
 
     Args:
         driver (webdriver.Chrome): A instância do driver do Selenium.
         xpath (str): O seletor XPath do elemento a ser aguardado.
-        tempo (int): O tempo máximo de espera em segundos.
+        tempo (int): O tempo máximo de espera em segundos (padrão: TEMPOS_ESPERA[etapa] ou 1).
+        etapa (str): Nome da etapa, usado para o tempo limite e o registro de esperas.
 
     Returns:
         WebElement: O elemento encontrado.
         None: Se o elemento não for encontrado dentro do tempo limite.
     """
-    try:
-        return WebDriverWait(driver, tempo).until(EC.element_to_be_clickable((By.XPATH, xpath)))
-    except:
-        return None
+    if tempo is None:
+        tempo = TEMPOS_ESPERA.get(etapa, 1)
+    return esperar_condicao(driver, EC.element_to_be_clickable((By.XPATH, xpath)), etapa, tempo)
 
 
-def esperar_elemento_JSPATH(driver, jspath, tempo=5):
+def esperar_elemento_JSPATH(driver, jspath, tempo=None, etapa=None):
     """
     Aguarda explicitamente até que um elemento (via seletor CSS) seja clicável.
 
     Args:
         driver (webdriver.Chrome): A instância do driver do Selenium.
         jspath (str): O seletor CSS do elemento.
-        tempo (int): O tempo máximo de espera em segundos.
+        tempo (int): O tempo máximo de espera em segundos (padrão: TEMPOS_ESPERA[etapa] ou 5).
+        etapa (str): Nome da etapa, usado para o tempo limite e o registro de esperas.
 
     Returns:
         WebElement: O elemento encontrado.
         None: Se o elemento não for encontrado.
     """
-    try:
-        return WebDriverWait(driver, tempo).until(EC.element_to_be_clickable((By.CSS_SELECTOR, jspath)))
-    except:
-        return None
+    if tempo is None:
+        tempo = TEMPOS_ESPERA.get(etapa, 5)
+    return esperar_condicao(driver, EC.element_to_be_clickable((By.CSS_SELECTOR, jspath)), etapa, tempo)
 
 
-def extrair_data(texto_data):
+class RegistroSeletores:
     """
-    Converte uma string de data em um objeto datetime, testando múltiplos formatos.
+    Registro central dos elementos clicados na navegação, cada um com estratégias alternativas (ver SELETORES).
 
-    Args:
-        texto_data (str): A string contendo a data (ex: "dd/mm/aaaa HH:MM:SS").
+    localizar() faz uma única espera da etapa, em que cada verificação consulta as estratégias do alvo em ordem
+    de preferência: a última que funcionou vem primeiro (gravada em ARQUIVO_SELETORES, vale entre execuções).
+    Quando o portal muda um XPath absoluto ou um id gerado, a alternativa é achada dentro da mesma espera e passa
+    a ser a preferida, sem custar o tempo limite nas propostas seguintes.
 
-    Returns:
-        tuple: Uma tupla contendo (objeto datetime, string de data formatada) ou (None, None) se a conversão falhar.
+    Um alvo não encontrado em limite_falhas propostas seguidas é dado como quebrado: 'quebrado' recebe o nome
+    do alvo e os laços de processamento param antes da próxima proposta, em vez de estourar o tempo em todas.
     """
-    if not texto_data:
-        return None, None
-    
-    formatos_suportados = ["%d/%m/%Y %H:%M:%S", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]
-    for formato in formatos_suportados:
+
+    def __init__(self, seletores=None, caminho=ARQUIVO_SELETORES, limite_falhas=LIMITE_FALHAS_SELETOR):
+        self.seletores = SELETORES if seletores is None else seletores
+        self.caminho = caminho
+        self.limite_falhas = limite_falhas
+        self.quebrado = None
+        self._preferidas = None
+        self._sequencias = defaultdict(list)
+        self._trava = threading.Lock()
+
+    def _carregar(self):
+        """Estratégias preferidas gravadas, descartando as que não constam mais de SELETORES."""
+        if not self.caminho:
+            return {}
         try:
-            data_obj = datetime.strptime(texto_data, formato)
-            return data_obj, data_obj.strftime("%d/%m/%Y %H:%M:%S")
-        except ValueError:
-            continue
-    return None, None
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                gravadas = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            gravadas = {}
+        return {alvo: tuple(estrategia) for alvo, estrategia in gravadas.items()
+                if isinstance(estrategia, list) and tuple(estrategia) in self.seletores.get(alvo, [])}
+
+    def _gravar(self):
+        if not self.caminho:
+            return
+        try:
+            temporario = self.caminho + ".tmp"
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(self._preferidas, f, ensure_ascii=False, indent=2)
+            os.replace(temporario, self.caminho)
+        except OSError as erro:
+            print(f"[WARNING] Não foi possível gravar as estratégias preferidas dos seletores: {erro}")
+
+    @staticmethod
+    def _localizador(estrategia, valores):
+        tipo, seletor = estrategia
+        por = {"id": By.ID, "css": By.CSS_SELECTOR, "xpath": By.XPATH}[tipo]
+        return por, seletor.format(**valores) if valores else seletor
+
+    def estrategias(self, alvo):
+        """Estratégias do alvo na ordem em que são consultadas: a preferida e depois as demais de SELETORES."""
+        with self._trava:
+            if self._preferidas is None:
+                self._preferidas = self._carregar()
+            preferida = self._preferidas.get(alvo)
+        estrategias = list(self.seletores[alvo])
+        if preferida in estrategias:
+            estrategias.remove(preferida)
+            estrategias.insert(0, preferida)
+        return estrategias
+
+    def localizador(self, alvo, **valores):
+        """Localizador (By, seletor) da estratégia preferida do alvo, para as condições de transição."""
+        return self._localizador(self.estrategias(alvo)[0], valores)
+
+    def localizar(self, driver, alvo, tempo=None, **valores):
+        """
+        Aguarda até que o elemento do alvo seja clicável, por qualquer uma das suas estratégias.
+
+        Args:
+            driver (webdriver.Chrome): A instância do driver do Selenium.
+            alvo (str): Chave de SELETORES; também é a etapa de TEMPOS_ESPERA e do registro de esperas.
+            tempo (float): Tempo máximo explícito, sobrepondo TEMPOS_ESPERA.
+            **valores: Campos preenchidos nos seletores que são modelos (ex: num_proposta).
+
+        Returns:
+            WebElement: O elemento encontrado.
+            None: Se nenhuma estratégia encontrar o elemento dentro do tempo limite.
+        """
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        estrategias = self.estrategias(alvo)
+        localizadores = [self._localizador(estrategia, valores) for estrategia in estrategias]
+
+        def condicao(d):
+            for estrategia, localizador in zip(estrategias, localizadores):
+                for elemento in d.find_elements(*localizador):
+                    try:
+                        if elemento.is_displayed() and elemento.is_enabled():
+                            return elemento, estrategia
+                    except StaleElementReferenceException:
+                        continue
+            return False
+
+        encontrado = esperar_condicao(driver, condicao, alvo, tempo)
+        self._registrar(alvo, estrategias, encontrado[1] if encontrado else None)
+        return encontrado[0] if encontrado else None
+
+    def _registrar(self, alvo, estrategias, estrategia):
+        """Promove a estratégia que encontrou o alvo ou soma a proposta atual à sequência de falhas dele."""
+        num_proposta = REGISTRO_ETAPAS.proposta_atual
+        with self._trava:
+            if estrategia is not None:
+                self._sequencias.pop(alvo, None)
+                if estrategia == estrategias[0]:
+                    return
+                self._preferidas[alvo] = estrategia
+                self._gravar()
+                print(f"[WARNING] Seletor '{alvo}' não encontrado pela estratégia preferida; encontrado por "
+                      f"{estrategia[0]} \"{estrategia[1]}\", que passa a ser a preferida.")
+                return
+            sequencia = self._sequencias[alvo]
+            if num_proposta not in sequencia:
+                sequencia.append(num_proposta)
+            if len(sequencia) < self.limite_falhas or self.quebrado:
+                return
+            self.quebrado = alvo
+        print(f"[ERROR] Seletor '{alvo}' não encontrado em {len(sequencia)} propostas seguidas "
+              f"({', '.join(str(num) for num in sequencia)}) por nenhuma das {len(estrategias)} estratégias de "
+              f"SELETORES. A execução será interrompida: atualize SELETORES['{alvo}'].")
+
+    def propostas_afetadas(self):
+        """Propostas da sequência de falhas do alvo quebrado (vazia se nenhum quebrou)."""
+        with self._trava:
+            return list(self._sequencias.get(self.quebrado, [])) if self.quebrado else []
+
+    def usar_arquivo(self, caminho):
+        """Passa a ler e gravar as estratégias preferidas em caminho (relidas na próxima consulta)."""
+        with self._trava:
+            self.caminho = caminho
+            self._preferidas = None
+
+    def reiniciar(self):
+        """Zera as sequências de falhas e o alvo quebrado, no início de cada execução."""
+        with self._trava:
+            self._sequencias.clear()
+            self.quebrado = None
+
+
+REGISTRO_SELETORES = RegistroSeletores()
+localizar_elemento = REGISTRO_SELETORES.localizar
+
+
+# Acumula, por aba, os bytes transferidos e o tempo de carga de cada página ao sair dela (pagehide),
+# para que a soma de todas as páginas de uma proposta possa ser lida ao final (ver coletar_carga_proposta).
+SCRIPT_MEDIR_CARGA = """
+(() => {
+    const medir = () => {
+        const navegacao = performance.getEntriesByType('navigation')[0];
+        let bytes = navegacao ? navegacao.transferSize : 0;
+        for (const recurso of performance.getEntriesByType('resource')) { bytes += recurso.transferSize || 0; }
+        const carga = navegacao && navegacao.loadEventEnd ? navegacao.loadEventEnd - navegacao.startTime : 0;
+        return {bytes: bytes, carga_ms: carga};
+    };
+    window.__roboMedirCarga = medir;
+    window.addEventListener('pagehide', () => {
+        if (window.__roboCargaContada) { return; }
+        try {
+            const pagina = medir();
+            const total = JSON.parse(sessionStorage.getItem('__roboCarga') || '{"bytes":0,"carga_ms":0,"paginas":0}');
+            total.bytes += pagina.bytes; total.carga_ms += pagina.carga_ms; total.paginas += 1;
+            sessionStorage.setItem('__roboCarga', JSON.stringify(total));
+        } catch (e) {}
+    });
+})();
+"""
+
+# Lê e zera o acumulado das páginas anteriores, somando a página atual (que passa a ser dada como contada).
+SCRIPT_COLETAR_CARGA = """
+    let total = {bytes: 0, carga_ms: 0, paginas: 0};
+    try { total = JSON.parse(sessionStorage.getItem('__roboCarga') || JSON.stringify(total)); } catch (e) {}
+    if (window.__roboMedirCarga && !window.__roboCargaContada) {
+        const pagina = window.__roboMedirCarga();
+        total.bytes += pagina.bytes; total.carga_ms += pagina.carga_ms; total.paginas += 1;
+        window.__roboCargaContada = true;
+    }
+    try { sessionStorage.removeItem('__roboCarga'); } catch (e) {}
+    return total;
+"""
+
+ESTATISTICAS_CARGA = {"propostas": 0, "bytes": 0, "carga_ms": 0.0, "paginas": 0}
+_trava_carga = threading.Lock()
+_abas_preparadas = set()
+
+
+def padroes_bloqueio(bloqueados=None, permitidos=None):
+    """Retorna os padrões de bloqueio, descartando os que alcançariam algum recurso permitido."""
+    bloqueados = RECURSOS_BLOQUEADOS if bloqueados is None else bloqueados
+    permitidos = RECURSOS_PERMITIDOS if permitidos is None else permitidos
+    return [padrao for padrao in bloqueados if not any(fnmatch(permitido, padrao) for permitido in permitidos)]
+
+
+def preparar_aba(driver):
+    """
+    Configura a aba atual via Chrome DevTools: instala a medição de carga das páginas e, com
+    MODO_ENXUTO, bloqueia os recursos desnecessários e ignora service workers (que alimentam
+    caches e armazenamento no perfil). Cada aba é preparada uma única vez.
+    """
+    try:
+        chave = (id(driver), driver.current_window_handle)
+        with _trava_carga:
+            if chave in _abas_preparadas:
+                return
+            _abas_preparadas.add(chave)
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": SCRIPT_MEDIR_CARGA})
+        if MODO_ENXUTO:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": padroes_bloqueio()})
+            driver.execute_cdp_cmd("Network.setBypassServiceWorker", {"bypass": True})
+            print(f"[INFO] Modo enxuto ativo nesta aba: {len(padroes_bloqueio())} padrões de recursos bloqueados.")
+    except Exception as e:
+        print(f"[WARNING] Não foi possível configurar a aba via DevTools: {e}")
+
+
+def coletar_carga_proposta(driver):
+    """
+    Lê quantos bytes foram transferidos e quanto tempo as páginas levaram para carregar desde a
+    última coleta nesta aba, e soma às estatísticas da execução.
+
+    Returns:
+        dict: {'bytes', 'carga_ms', 'paginas'} ou None se a medição não estiver disponível.
+    """
+    try:
+        carga = driver.execute_script(SCRIPT_COLETAR_CARGA)
+    except Exception:
+        return None
+    if not carga or not carga.get("paginas"):
+        return None
+    with _trava_carga:
+        ESTATISTICAS_CARGA["propostas"] += 1
+        ESTATISTICAS_CARGA["bytes"] += carga["bytes"]
+        ESTATISTICAS_CARGA["carga_ms"] += carga["carga_ms"]
+        ESTATISTICAS_CARGA["paginas"] += carga["paginas"]
+    return carga
+
+
+def descrever_carga(carga):
+    if not carga:
+        return ""
+    return f" | {carga['bytes'] / 1024:.0f} KB em {carga['paginas']} páginas, carga {carga['carga_ms'] / 1000:.2f}s"
+
+
+def resumo_carga_paginas():
+    """Imprime a média de bytes transferidos e de tempo de carga das páginas por proposta."""
+    with _trava_carga:
+        estatisticas = dict(ESTATISTICAS_CARGA)
+        for chave in ESTATISTICAS_CARGA:
+            ESTATISTICAS_CARGA[chave] = 0
+    if estatisticas["propostas"]:
+        propostas = estatisticas["propostas"]
+        print(f"[INFO] Carga de páginas ({'modo enxuto' if MODO_ENXUTO else 'modo normal'}): "
+              f"{estatisticas['bytes'] / propostas / 1024:.0f} KB e {estatisticas['carga_ms'] / propostas / 1000:.2f}s "
+              f"por proposta, em média ({propostas} propostas, {estatisticas['paginas']} páginas).")
+
+
+# Reciclagens da sessão feitas nesta execução (ver GerenciadorAbas.reciclar).
+RECICLAGENS = []
+_GERENCIADORES_ABAS = {}
+_trava_abas = threading.Lock()
+
+
+class GerenciadorAbas:
+    """
+    Controla as abas que o robô abre em um Chrome de depuração.
+
+    A aba em que o driver estava ao ser conectado é a principal (menus e pesquisa); abas já abertas
+    pelo usuário nessa hora nunca são fechadas. Ao fim de cada proposta, as abas abertas pelo link do
+    resultado são fechadas e o foco volta para a principal. A cada VERIFICAR_MEMORIA_A_CADA propostas,
+    a quantidade de abas e o heap JS e os nós DOM da aba (Performance.getMetrics) são comparados com
+    os limites; ao ultrapassá-los, ou a cada RECICLAR_A_CADA propostas, a sessão é reciclada.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.principal = driver.current_window_handle
+        self.preexistentes = set(driver.window_handles) - {self.principal}
+        self.propostas = 0
+        self.desde_reciclagem = 0
+        self.latencias = deque(maxlen=JANELA_LATENCIA)
+        self._ultima_reciclagem = None
+
+    def _fechar(self, handles):
+        for handle in handles:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(self.principal)
+
+    def liberar_abas(self):
+        """Fecha as abas abertas pelo robô, exceto a principal, e volta o foco para ela."""
+        handles = self.driver.window_handles
+        if self.principal not in handles:
+            self.principal = handles[0]
+        extras = [h for h in handles if h != self.principal and h not in self.preexistentes]
+        if extras or self.driver.current_window_handle != self.principal:
+            self._fechar(extras)
+
+    def metricas(self):
+        """Abas do robô abertas, heap JS (MB) e nós DOM da aba atual."""
+        try:
+            self.driver.execute_cdp_cmd("Performance.enable", {})
+            valores = {m["name"]: m["value"] for m in self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+        except Exception:
+            valores = {}
+        abas = len(set(self.driver.window_handles) - self.preexistentes)
+        return {"abas": abas, "heap_mb": valores.get("JSHeapUsedSize", 0) / 2 ** 20, "nos_dom": int(valores.get("Nodes", 0))}
+
+    def motivo_reciclagem(self):
+        if RECICLAR_A_CADA and self.desde_reciclagem >= RECICLAR_A_CADA:
+            return f"{self.desde_reciclagem} propostas desde a última reciclagem"
+        if self.propostas % VERIFICAR_MEMORIA_A_CADA:
+            return None
+        metricas = self.metricas()
+        if metricas["abas"] > LIMITE_ABAS:
+            return f"{metricas['abas']} abas abertas (limite {LIMITE_ABAS})"
+        if metricas["heap_mb"] > LIMITE_HEAP_MB:
+            return f"heap JS de {metricas['heap_mb']:.0f} MB (limite {LIMITE_HEAP_MB})"
+        if metricas["nos_dom"] > LIMITE_NOS_DOM:
+            return f"{metricas['nos_dom']} nós DOM (limite {LIMITE_NOS_DOM})"
+        return None
+
+    def apos_proposta(self, segundos):
+        """Registra a latência da proposta, fecha as abas dela e recicla a sessão se for o caso."""
+        self.propostas += 1
+        self.desde_reciclagem += 1
+        self.latencias.append(segundos)
+        if (registro := self._ultima_reciclagem) and registro["propostas_depois"] < JANELA_LATENCIA:
+            registro["propostas_depois"] += 1
+            registro["latencia_depois"] = sum(self.latencias) / len(self.latencias)
+            if registro["propostas_depois"] == JANELA_LATENCIA:
+                print(f"[INFO] Latência por proposta: {registro['latencia_antes']:.2f}s antes da reciclagem, "
+                      f"{registro['latencia_depois']:.2f}s depois.")
+        try:
+            if FECHAR_ABAS_PROPOSTA:
+                self.liberar_abas()
+            if motivo := self.motivo_reciclagem():
+                self.reciclar(motivo)
+        except Exception as e:
+            print(f"[WARNING] Falha ao organizar as abas do navegador: {e}")
+
+    def reciclar(self, motivo):
+        """
+        Recicla a sessão sem perder o login: abre uma aba nova, fecha as abas do robô (inclusive a
+        principal antiga, com o histórico e a memória acumulados) e volta à página principal.
+        """
+        print(f"[INFO] Reciclando a sessão do navegador: {motivo}.")
+        antes = self.metricas()
+        with medir_etapa("navegador.reciclar"):
+            self.driver.switch_to.new_window("tab")
+            self.principal = self.driver.current_window_handle
+            self._fechar([h for h in self.driver.window_handles if h != self.principal and h not in self.preexistentes])
+            preparar_aba(self.driver)
+            self.driver.get(f"{URL_BASE}/voluntarias/Principal/Principal.do")
+            esperar_condicao(self.driver, documento_pronto, "pagina_principal")
+        if sessao_expirada(self.driver):
+            print("[WARNING] A sessão do portal expirou; as próximas propostas falharão até um novo login.")
+        registro = {"propostas": self.propostas, "motivo": motivo, "antes": antes, "depois": self.metricas(),
+                    "latencia_antes": sum(self.latencias) / len(self.latencias) if self.latencias else 0.0,
+                    "latencia_depois": None, "propostas_depois": 0}
+        with _trava_abas:
+            RECICLAGENS.append(registro)
+        self._ultima_reciclagem = registro
+        self.latencias.clear()
+        self.desde_reciclagem = 0
+
+
+def gerenciador_abas(driver):
+    """O GerenciadorAbas do driver, criado no primeiro uso (um por driver conectado)."""
+    with _trava_abas:
+        if (gerenciador := _GERENCIADORES_ABAS.get(id(driver))) is None or gerenciador.driver is not driver:
+            gerenciador = _GERENCIADORES_ABAS[id(driver)] = GerenciadorAbas(driver)
+        return gerenciador
+
+
+def resumo_reciclagens():
+    """Imprime as reciclagens da sessão feitas na execução, com a latência antes e depois de cada uma."""
+    with _trava_abas:
+        registros = list(RECICLAGENS)
+        RECICLAGENS.clear()
+    if not registros:
+        return
+    print(f"\n[INFO] Reciclagens do navegador: {len(registros)}")
+    for registro in registros:
+        depois = f"{registro['latencia_depois']:.2f}s" if registro["latencia_depois"] is not None else "-"
+        print(f"  após {registro['propostas']} propostas ({registro['motivo']}): heap {registro['antes']['heap_mb']:.0f} -> "
+              f"{registro['depois']['heap_mb']:.0f} MB | latência {registro['latencia_antes']:.2f}s -> {depois} "
+              f"({registro['propostas_depois']} propostas)")
+
+
+# Formatos aceitos por extrair_data, na ordem original de tentativa, com a expressão que reconhece
+# cada um pelo formato do texto. Um texto nunca é aceito por mais de um formato.
+FORMATOS_DATA = [
+    ("%d/%m/%Y %H:%M:%S", re.compile(r"\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{1,2}:\d{1,2}")),
+    ("%d/%m/%Y", re.compile(r"\d{1,2}/\d{1,2}/\d{4}")),
+    ("%Y-%m-%d %H:%M:%S", re.compile(r"\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{1,2}:\d{1,2}")),
+    ("%Y-%m-%d", re.compile(r"\d{4}-\d{1,2}-\d{1,2}")),
+]
+
+# Quantidade de textos distintos guardados no cache de extrair_data.
+TAMANHO_CACHE_DATAS = 4096
+
+
+def _extrair_data_por_formatos(texto_data):
+    """Conversão original: tenta cada formato com strptime. Usada para os textos que FORMATOS_DATA não reconhece."""
+    if not texto_data:
+        return None, None
+    
+    formatos_suportados = ["%d/%m/%Y %H:%M:%S", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]
+    for formato in formatos_suportados:
+        try:
+            data_obj = datetime.strptime(texto_data, formato)
+            return data_obj, data_obj.strftime("%d/%m/%Y %H:%M:%S")
+        except ValueError:
+            continue
+    return None, None
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_DATAS)
+def _extrair_data_cacheada(texto_data):
+    for formato, padrao in FORMATOS_DATA:
+        if padrao.fullmatch(texto_data):
+            try:
+                data_obj = datetime.strptime(texto_data, formato)
+            except ValueError:
+                break
+            return data_obj, data_obj.strftime("%d/%m/%Y %H:%M:%S")
+    # Formato não reconhecido (ou data inválida): mesmo caminho da implementação original
+    return _extrair_data_por_formatos(texto_data)
+
+
+def extrair_data(texto_data):
+    """
+    Converte uma string de data em um objeto datetime, testando múltiplos formatos.
+
+    O formato é escolhido pelo formato do texto (ver FORMATOS_DATA) e os resultados ficam em um
+    cache limitado, já que a mesma data se repete em várias células. O resultado é idêntico ao da
+    conversão original (_extrair_data_por_formatos; ver tests/test_paridade.py).
+
+    Args:
+        texto_data (str): A string contendo a data (ex: "dd/mm/aaaa HH:MM:SS").
+
+    Returns:
+        tuple: Uma tupla contendo (objeto datetime, string de data formatada) ou (None, None) se a conversão falhar.
+    """
+    if not texto_data:
+        return None, None
+    if not isinstance(texto_data, str):
+        return _extrair_data_por_formatos(texto_data)
+    return _extrair_data_cacheada(texto_data)
+
+
+def extrair_datas(textos):
+    """
+    Versão em lote de extrair_data para colunas inteiras: cada texto distinto é convertido uma vez.
+
+    Args:
+        textos (pd.Series): Coluna com as strings de data.
+
+    Returns:
+        tuple[pd.Series, pd.Series]: (datas como datetime64, NaT se inválida; datas formatadas, None se inválida).
+    """
+    convertidas = {texto: extrair_data(texto) for texto in textos.dropna().unique()}
+    datas = pd.to_datetime(textos.map({texto: par[0] for texto, par in convertidas.items()}), errors='coerce')
+    formatadas = textos.map({texto: par[1] for texto, par in convertidas.items()}).astype(object)
+    return datas, formatadas.where(formatadas.notna(), None)
+
+
+def benchmark_extrair_data(total_celulas=200000, textos_distintos=2000):
+    """
+    Compara a conversão original (_extrair_data_por_formatos) com extrair_data em células sintéticas com repetição
+    (como nas tabelas reais, onde a mesma data aparece em vários documentos).
+
+    Args:
+        total_celulas (int): Quantidade de células convertidas.
+        textos_distintos (int): Quantidade de datas distintas entre as células.
+    """
+    distintos = [f"{1 + i % 28:02d}/{1 + i % 12:02d}/2025 {i % 24:02d}:{i % 60:02d}:00" for i in range(textos_distintos)]
+    distintos[::10] = [f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}" for i in range(0, textos_distintos, 10)]
+    celulas = [distintos[(i * 7919) % textos_distintos] for i in range(total_celulas)]
+
+    inicio = time.perf_counter()
+    esperado = [_extrair_data_por_formatos(texto) for texto in celulas]
+    tempo_legado = time.perf_counter() - inicio
+
+    _extrair_data_cacheada.cache_clear()
+    inicio = time.perf_counter()
+    obtido = [extrair_data(texto) for texto in celulas]
+    tempo_novo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    extrair_datas(pd.Series(celulas))
+    tempo_lote = time.perf_counter() - inicio
+
+    print(f"[BENCH] {total_celulas} células ({textos_distintos} distintas) | original: {tempo_legado:.2f}s | "
+          f"extrair_data: {tempo_novo:.3f}s | em lote: {tempo_lote:.3f}s | "
+          f"ganho: {tempo_legado / max(tempo_novo, 1e-9):.0f}x | resultados idênticos: {'sim' if esperado == obtido else 'NÃO'}")
+
+
+# ==============================================================================
+# Funções de Lógica de Negócio e Web Scraping
+# ==============================================================================
+
+def abrir_pesquisa_propostas(driver):
+    """
+    Abre a tela de pesquisa de propostas a partir da página principal do Transferegov.
+
+    Args:
+        driver (webdriver.Chrome): A instância do driver do Selenium.
+
+    Returns:
+        bool: True se o campo de pesquisa estiver disponível, False caso contrário.
+    """
+    with medir_etapa("navegar.pagina_principal"):
+        driver.get(f"{URL_BASE}/voluntarias/Principal/Principal.do")
+        esperar_condicao(driver, documento_pronto, "pagina_principal")
+
+    # Sequência de cliques para navegar pelos menus
+    with medir_etapa("navegar.menu") as span:
+        if not (elemento_menu := localizar_elemento(driver, "menu")):
+            span["resultado"] = "não encontrado"
+            sinalizar_falha()
+            print("[WARNING] Elemento do menu principal não encontrado.")
+            return False
+        elemento_menu.click()
+
+    with medir_etapa("navegar.submenu") as span:
+        if not (elemento_submenu := localizar_elemento(driver, "submenu")):
+            span["resultado"] = "não encontrado"
+            sinalizar_falha()
+            print("[WARNING] Elemento do submenu não encontrado.")
+            return False
+        elemento_submenu.click()
+        esperar_condicao(driver, transicao_concluida(elemento_submenu, REGISTRO_SELETORES.localizador("campo_pesquisa")), "transicao_pesquisa")
+    return True
+
+
+def abrir_pareceres_da_proposta(driver):
+    """
+    A partir da página de uma proposta, abre a aba 'Plano de Trabalho' e a sub-aba 'Pareceres'.
+
+    Args:
+        driver (webdriver.Chrome): A instância do driver do Selenium.
+
+    Returns:
+        bool: True se a página de pareceres foi aberta, False caso contrário.
+    """
+    with medir_etapa("navegar.plano_trabalho") as span:
+        if not (plano_trabalho := localizar_elemento(driver, "plano_trabalho")):
+            span["resultado"] = "não encontrado"
+            sinalizar_falha()
+            print("[WARNING] Aba 'Plano de Trabalho' não encontrada.")
+            return False
+        plano_trabalho.click()
+        esperar_condicao(driver, transicao_concluida(plano_trabalho), "transicao_plano")
+
+    with medir_etapa("navegar.subaba_pareceres") as span:
+        if not (subaba_pareceres := localizar_elemento(driver, "subaba_pareceres")):
+            span["resultado"] = "não encontrado"
+            sinalizar_falha()
+            print("[WARNING] Sub-aba 'Pareceres' não encontrada.")
+            return False
+        subaba_pareceres.click()
+        esperar_condicao(
+            driver,
+            transicao_concluida(subaba_pareceres, (By.CSS_SELECTOR, SELETOR_PARECERES)),
+            "pagina_pareceres",
+        )
+    return True
+
+
+def pagina_da_proposta(driver, num_proposta):
+    """Condição: o documento está pronto e exibe o número da proposta esperada."""
+    try:
+        return documento_pronto(driver) and driver.execute_script(
+            "return document.body ? document.body.innerText.includes(arguments[0]) : false;", num_proposta)
+    except Exception:
+        return False
+
+
+def navegar_por_link_direto(driver, num_proposta, indice_propostas):
+    """
+    Tenta chegar aos pareceres da proposta usando os links gravados no índice persistente.
+
+    Args:
+        driver (webdriver.Chrome): A instância do driver do Selenium.
+        num_proposta (str): O número da proposta.
+        indice_propostas (IndicePropostas): O índice de links das propostas.
+
+    Returns:
+        bool: True se a página de pareceres da proposta foi aberta. Quando o link gravado não leva
+              mais à proposta, a entrada é descartada do índice e False é retornado.
+    """
+    entrada = indice_propostas.obter(num_proposta)
+    if not entrada:
+        return False
+
+    try:
+        if url_pareceres := entrada.get("url_pareceres"):
+            with medir_etapa("navegar.link_direto") as span:
+                driver.get(url_pareceres)
+                if esperar_condicao(driver, lambda d: d.find_elements(By.CSS_SELECTOR, SELETOR_PARECERES)
+                                    and pagina_da_proposta(d, num_proposta), "link_direto"):
+                    print("[SUCCESS] Página de pareceres aberta pelo link direto.")
+                    return True
+                span["resultado"] = "desatualizado"
+
+        if url_proposta := entrada.get("url_proposta"):
+            driver.get(url_proposta)
+            if esperar_condicao(driver, lambda d: pagina_da_proposta(d, num_proposta), "link_direto") \
+                    and abrir_pareceres_da_proposta(driver):
+                indice_propostas.registrar(num_proposta, url_pareceres=driver.current_url)
+                print("[SUCCESS] Proposta aberta pelo link direto.")
+                return True
+    except Exception as e:
+        print(f"[WARNING] Falha ao usar o link direto da proposta {num_proposta}: {e}")
+
+    print(f"[INFO] Link gravado da proposta {num_proposta} está desatualizado. Usando a pesquisa.")
+    indice_propostas.invalidar(num_proposta)
+    return False
+
+
+def navegar_menu_principal(driver, num_proposta, indice_propostas=None):
+    """
+    Navega através do menu do Transferegov para encontrar e abrir uma proposta específica.
+
+    Quando um índice de propostas é informado, os links gravados em execuções anteriores são
+    usados primeiro; a pesquisa pelo menu só é feita se o link não existir ou estiver desatualizado.
+
+    Args:
+        driver (webdriver.Chrome): A instância do driver do Selenium.
+        num_proposta (str): O número da proposta a ser pesquisada.
+        indice_propostas (IndicePropostas): Índice persistente de links (opcional).
+
+    Returns:
+        bool: True se a navegação até a página de pareceres for bem-sucedida, False caso contrário.
+    """
+    try:
+        print(f"[INFO] Navegando para a proposta: {num_proposta}")
+        if indice_propostas and navegar_por_link_direto(driver, num_proposta, indice_propostas):
+            return True
+
+        if not abrir_pesquisa_propostas(driver):
+            return False
+
+        # Pesquisa pela proposta
+        with medir_etapa("navegar.pesquisar") as span:
+            if not (campo_pesquisa := localizar_elemento(driver, "campo_pesquisa")):
+                span["resultado"] = "não encontrado"
+                sinalizar_falha()
+                print("[WARNING] Campo de pesquisa não encontrado.")
+                return False
+            campo_pesquisa.clear()
+            campo_pesquisa.send_keys(num_proposta)
+
+            if not (botao_pesquisar := localizar_elemento(driver, "botao_pesquisar")):
+                span["resultado"] = "não encontrado"
+                sinalizar_falha()
+                print("[WARNING] Botão de pesquisa não encontrado.")
+                return False
+            botao_pesquisar.click()
+            esperar_condicao(driver, transicao_concluida(
+                botao_pesquisar, REGISTRO_SELETORES.localizador("link_proposta", num_proposta=num_proposta)),
+                "transicao_resultado")
+
+        # Abre a proposta encontrada e muda o foco para a nova aba
+        with medir_etapa("navegar.abrir_proposta") as span:
+            if not (link_proposta := localizar_elemento(driver, "link_proposta", num_proposta=num_proposta)):
+                span["resultado"] = "não encontrado"
+                # Com a lista de resultados carregada, a proposta não existe para este usuário
+                sinalizar_falha("nao_encontrado" if causa_ultima_espera() == "seletor_ausente" else None)
+                print(f"[WARNING] Proposta '{num_proposta}' não encontrada na lista de resultados.")
+                return False
+            abas_antes = set(driver.window_handles)
+            link_proposta.click()
+            # O link pode abrir uma nova aba ou carregar a proposta na aba atual
+            esperar_condicao(
+                driver,
+                lambda d: len(d.window_handles) > len(abas_antes) or transicao_concluida(link_proposta)(d),
+                "nova_aba",
+            )
+
+            # Muda para a aba aberta pelo link (as demais abas são fechadas ao fim da proposta; ver GerenciadorAbas)
+            if abas_novas := [aba for aba in driver.window_handles if aba not in abas_antes]:
+                driver.switch_to.window(abas_novas[-1])
+                preparar_aba(driver)
+            url_proposta = driver.current_url
+
+        # Navega para a aba de pareceres
+        if not abrir_pareceres_da_proposta(driver):
+            return False
+
+        if indice_propostas:
+            indice_propostas.registrar(num_proposta, url_proposta=url_proposta, url_pareceres=driver.current_url)
+
+        print("[SUCCESS] Navegação até a página de pareceres concluída.")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Ocorreu um erro inesperado durante a navegação: {e}")
+        sinalizar_falha(causa_da_excecao(e))
+        return False
+
+
+def colher_indice_resultados(driver, indice_propostas, max_paginas=200):
+    """
+    Preenche o índice em lote: pesquisa sem filtro e grava o link de cada proposta da listagem.
+
+    Cada página de resultados é lida com uma única chamada de JavaScript. A coleta segue a
+    paginação até não haver mais página seguinte ou até atingir max_paginas.
+
+    Args:
+        driver (webdriver.Chrome): A instância do driver do Selenium.
+        indice_propostas (IndicePropostas): O índice a ser preenchido.
+        max_paginas (int): Limite de páginas de resultado percorridas.
+
+    Returns:
+        int: Quantidade de propostas gravadas no índice.
+    """
+    print("\n--- MODO: COLETA DO ÍNDICE DE PROPOSTAS ---")
+    if not abrir_pesquisa_propostas(driver):
+        return 0
+    if not (campo_pesquisa := localizar_elemento(driver, "campo_pesquisa")):
+        print("[WARNING] Campo de pesquisa não encontrado.")
+        return 0
+    campo_pesquisa.clear()
+    if not (botao_pesquisar := localizar_elemento(driver, "botao_pesquisar")):
+        print("[WARNING] Botão de pesquisa não encontrado.")
+        return 0
+    botao_pesquisar.click()
+    esperar_condicao(driver, transicao_concluida(botao_pesquisar, REGISTRO_SELETORES.localizador("link_proposta")), "transicao_resultado")
+
+    script_links = """
+        const resultado = [];
+        const links = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (let i = 0; i < links.snapshotLength; i++) {
+            const link = links.snapshotItem(i);
+            resultado.push([link.innerText.trim(), link.href]);
+        }
+        return resultado;
+    """
+    coletadas = {}
+    for pagina in range(1, max_paginas + 1):
+        for numero, href in driver.execute_script(script_links, XPATH_LINKS_RESULTADO) or []:
+            if numero and href and href.startswith("http"):
+                coletadas[numero] = href
+        print(f"[INFO] Página {pagina} de resultados lida. Propostas coletadas: {len(coletadas)}")
+
+        proxima = driver.find_elements(By.XPATH, XPATH_PROXIMA_PAGINA)
+        if not proxima:
+            break
+        proxima[0].click()
+        esperar_condicao(driver, transicao_concluida(proxima[0]), "transicao_resultado")
+
+    indice_propostas.registrar_lote({numero: {"url_proposta": href} for numero, href in coletadas.items()})
+    print(f"[SUCCESS] Índice atualizado com {len(coletadas)} propostas.")
+    return len(coletadas)
+
+
+def resolver_backend_html(backend=None):
+    """Retorna o parser efetivo para o backend pedido (ou BACKEND_HTML), considerando o que está instalado."""
+    backend = backend or BACKEND_HTML
+    if backend == "auto":
+        if HTMLParser is not None:
+            return "selectolax"
+        if lxml_html is not None:
+            return "lxml"
+        return "html.parser"
+    return backend
+
+
+def extrair_tabelas_pareceres(html, backend=None):
+    """
+    Lê as linhas das tabelas de pareceres com o parser escolhido, analisando o documento uma única vez.
+
+    Args:
+        html (str): O HTML da página completa ou apenas dos contêineres de pareceres.
+        backend (str): "selectolax", "lxml" ou "html.parser" (padrão: BACKEND_HTML).
+
+    Returns:
+        dict: Para cada id de CONTEINERES_PARECERES, a lista de linhas (texto das células),
+              None se o contêiner não existir ou a exceção encontrada ao ler sua tabela.
+    """
+    backend = resolver_backend_html(backend)
+    tabelas = {}
+
+    if backend == "selectolax":
+        arvore = HTMLParser(html)
+        for id_conteiner in CONTEINERES_PARECERES:
+            try:
+                if (conteiner := arvore.css_first(f"div#{id_conteiner}")) is None:
+                    tabelas[id_conteiner] = None
+                    continue
+                corpo = conteiner.css_first("tbody")
+                tabelas[id_conteiner] = [[td.text() for td in tr.css("td")] for tr in corpo.css("tr")]
+            except Exception as e:
+                tabelas[id_conteiner] = e
+    elif backend == "lxml":
+        arvore = lxml_html.fromstring(html)
+        for id_conteiner in CONTEINERES_PARECERES:
+            try:
+                if not (conteiner := arvore.xpath(f"//div[@id='{id_conteiner}']")):
+                    tabelas[id_conteiner] = None
+                    continue
+                corpo = conteiner[0].xpath(".//tbody")[0]
+                tabelas[id_conteiner] = [[td.text_content() for td in tr.iter("td")] for tr in corpo.iter("tr")]
+            except Exception as e:
+                tabelas[id_conteiner] = e
+    else:
+        soup = BeautifulSoup(html, 'html.parser')
+        for id_conteiner in CONTEINERES_PARECERES:
+            try:
+                if (conteiner := soup.find("div", {"id": id_conteiner})) is None:
+                    tabelas[id_conteiner] = None
+                    continue
+                tabelas[id_conteiner] = [
+                    [td.text for td in tr.find_all("td")] for tr in conteiner.find("tbody").find_all("tr")
+                ]
+            except Exception as e:
+                tabelas[id_conteiner] = e
+    return tabelas
+
+
+def datas_pareceres_tecnicos(linhas, rotulo):
+    """
+    Filtra as linhas de uma tabela de pareceres, mantendo as datas emitidas pelos técnicos de NOMES_TECNICOS.
+
+    Args:
+        linhas (list): Linhas da tabela (texto das células: data, ..., responsável).
+        rotulo (str): Rótulo usado no log (ex: "PARECER PROPOSTA").
+
+    Returns:
+        list[datetime]: As datas válidas encontradas.
+    """
+    datas = []
+    tecnicos = correspondencia("nomes_tecnicos")
+    for celulas in linhas:
+        if len(celulas) >= 3:
+            data_texto = celulas[0].strip()
+            responsavel = celulas[2].strip()
+
+            if tecnicos.contem(responsavel):
+                data_obj, data_formatada = extrair_data(data_texto)
+                if data_obj:
+                    datas.append(data_obj)
+                    print(f"  [{rotulo}] Data encontrada: {data_formatada} (Responsável: {responsavel})")
+    return datas
+
+
+def analisar_html_pareceres(html, backend=None):
+    """
+    Extrai as datas dos pareceres da proposta e do plano de trabalho a partir do HTML da página,
+    considerando apenas os técnicos listados em NOMES_TECNICOS.
+
+    Args:
+        html (str): O HTML da página de Pareceres (do navegador ou de uma requisição HTTP),
+                    completo ou restrito aos contêineres de pareceres.
+        backend (str): Parser a ser usado (padrão: BACKEND_HTML).
+
+    Returns:
+        tuple: Contém (ação, data_proposta, data_plano, data_ajuste, data_mais_recente_geral).
+               Retorna strings de erro em caso de falha.
+    """
+    try:
+        tabelas = extrair_tabelas_pareceres(html, backend)
+
+        datas_pareceres_validas = []
+        for id_conteiner, rotulo in CONTEINERES_PARECERES.items():
+            linhas = tabelas.get(id_conteiner)
+            if isinstance(linhas, Exception):
+                print(f"[WARNING] Não foi possível extrair dados de {id_conteiner}: {linhas}")
+            elif linhas:
+                datas_pareceres_validas.extend(datas_pareceres_tecnicos(linhas, rotulo))
+
+        # Determina a data mais recente entre todos os pareceres válidos
+        data_mais_recente_obj = None
+        proposta_data = ""
+        if datas_pareceres_validas:
+            data_mais_recente_obj = max(datas_pareceres_validas)
+            proposta_data = data_mais_recente_obj.strftime('%d/%m/%Y %H:%M:%S')
+            print(f"[INFO] Data mais recente de parecer (Proposta/Plano): {proposta_data}")
+
+        proposta_str = proposta_data if proposta_data else "Nenhum parecer localizado"
+        
+        # O campo 'plano_str' e 'ajuste_str' podem ser preenchidos se necessário,
+        # mas a lógica atual consolida tudo em 'proposta_str'
+        plano_str = "Nenhum parecer localizado" 
+        ajuste_str = "Nenhum parecer localizado"
+
+        return "Ação a Definir", proposta_str, plano_str, ajuste_str, data_mais_recente_obj
+
+    except Exception as e:
+        print(f"[ERROR] Falha crítica ao verificar pareceres: {e}")
+        return "Erro ao verificar", "Erro ao extrair", "Erro ao extrair", "Erro ao extrair", None
+
+
+# Devolve apenas o outerHTML dos contêineres de pareceres, evitando trafegar e analisar a página inteira.
+SCRIPT_CONTEINERES_PARECERES = """
+    return arguments[0].map(id => {
+        const elemento = document.getElementById(id);
+        return elemento ? elemento.outerHTML : '';
+    }).join('');
+"""
+
+
+def html_conteineres_pareceres(driver):
+    """Obtém o HTML apenas dos contêineres de pareceres (ou a página inteira, se o script falhar)."""
+    try:
+        fragmento = driver.execute_script(SCRIPT_CONTEINERES_PARECERES, list(CONTEINERES_PARECERES))
+        return f"<html><body>{fragmento}</body></html>"
+    except Exception:
+        return driver.page_source
+
+
+def ler_pareceres(driver):
+    """
+    Lê, sem analisar, o HTML dos pareceres da página atualmente aberta no navegador.
+
+    Returns:
+        str: O HTML dos contêineres de pareceres.
+        None: Se a leitura falhar (a causa fica registrada em sinalizar_falha).
+    """
+    try:
+        print("[INFO] Iniciando verificação de pareceres...")
+        with medir_etapa("verificar_pareceres"):
+            return html_conteineres_pareceres(driver)
+    except Exception as e:
+        print(f"[ERROR] Falha crítica ao verificar pareceres: {e}")
+        sinalizar_falha(causa_da_excecao(e))
+        return None
+
+
+def analisar_pareceres_lidos(html):
+    """analisar_html_pareceres para o retorno de ler_pareceres (None vira o retorno de erro)."""
+    if html is None:
+        return "Erro ao verificar", "Erro ao extrair", "Erro ao extrair", "Erro ao extrair", None
+    return analisar_html_pareceres(html)
+
+
+def verificar_pareceres(driver, num_proposta=None):
+    """
+    Extrai as datas dos pareceres da página atualmente aberta no navegador.
+
+    Args:
+        driver (webdriver.Chrome): A instância do driver do Selenium.
+        num_proposta (str): Número da proposta, para guardar a página no cache de páginas (opcional).
+
+    Returns:
+        tuple: O mesmo retorno de analisar_html_pareceres.
+    """
+    html = ler_pareceres(driver)
+    guardar_pagina(num_proposta, "pareceres", html)
+    return analisar_pareceres_lidos(html)
+
+
+def benchmark_parsers_pareceres(caminhos_fixtures, repeticoes=20):
+    """
+    Micro-benchmark dos parsers de Pareceres sobre páginas salvas em disco.
+
+    Para cada página compara o caminho original (BeautifulSoup/html.parser na página inteira) com
+    cada backend disponível na página inteira e restrito aos contêineres, medindo o tempo médio e o
+    pico de memória (tracemalloc), e confere que todos chegam ao mesmo resultado. O tracemalloc só
+    enxerga alocações feitas pelo Python; a memória interna de lxml e selectolax (C) fica de fora.
+
+    Args:
+        caminhos_fixtures (list[str]): Arquivos HTML da página de Pareceres.
+        repeticoes (int): Execuções por combinação para o cálculo do tempo médio.
+    """
+    import contextlib
+    import io
+    import tracemalloc
+
+    backends = ["html.parser"] + [nome for nome, modulo in (("lxml", lxml_html), ("selectolax", HTMLParser)) if modulo]
+
+    for caminho in caminhos_fixtures:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            html_completo = f.read()
+        # Simula o que o navegador devolve via SCRIPT_CONTEINERES_PARECERES
+        soup = BeautifulSoup(html_completo, 'html.parser')
+        fragmento = "<html><body>" + "".join(
+            str(conteiner) for id_conteiner in CONTEINERES_PARECERES
+            if (conteiner := soup.find("div", {"id": id_conteiner}))
+        ) + "</body></html>"
+
+        print(f"\n[BENCH] {os.path.basename(caminho)} ({len(html_completo) / 1024:.0f} KB; contêineres: {len(fragmento) / 1024:.1f} KB)")
+        referencia = None
+        for backend in backends:
+            for rotulo, html in (("página inteira", html_completo), ("contêineres", fragmento)):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    inicio = time.perf_counter()
+                    for _ in range(repeticoes):
+                        resultado = analisar_html_pareceres(html, backend)
+                    tempo_medio = (time.perf_counter() - inicio) / repeticoes
+                    tracemalloc.start()
+                    analisar_html_pareceres(html, backend)
+                    _, pico = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                referencia = referencia or resultado
+                marca = "" if resultado == referencia else "  <- RESULTADO DIFERENTE"
+                print(f"  {backend:<12} {rotulo:<15} {tempo_medio * 1000:8.2f} ms  pico {pico / 1024:8.0f} KB{marca}")
+
+
+def benchmark_correspondencia_termos(total_linhas=100000):
+    """
+    Compara, em tabelas sintéticas, a busca original (any(... in ...) sobre as listas, com lower()
+    a cada linha) com as correspondências compiladas, para responsáveis e nomes de arquivos.
+
+    Args:
+        total_linhas (int): Quantidade de linhas sintéticas de cada tabela.
+    """
+    variacoes = NOMES_TECNICOS + ["Fulano de Tal", "JOAO VICTOR CAVALCANTE TEODORO", "Servidor Substituto"]
+    responsaveis = [f"{variacoes[i % len(variacoes)]} (Matrícula {i})" for i in range(total_linhas)]
+    arquivos_base = ["Certidao_FGTS.pdf", "Plano de Trabalho.pdf", "Atestado de Capacidade Tecnica.pdf",
+                     "Declaração de Adimplência.pdf", "Planilha de Custos.xlsx", "Estatuto Social.pdf", "Relatorio Tecnico.pdf"]
+    arquivos = [f"{i}_{arquivos_base[i % len(arquivos_base)]}" for i in range(total_linhas)]
+
+    casos = [
+        ("responsáveis", responsaveis, correspondencia("nomes_tecnicos"),
+         lambda texto: any(nome.lower() in texto.lower() for nome in NOMES_TECNICOS)),
+        ("arquivos", arquivos, correspondencia("palavras_ignorar"),
+         lambda texto: any(palavra in texto.lower() for palavra in PALAVRAS_IGNORAR)),
+    ]
+    for rotulo, textos, compilada, legado in casos:
+        inicio = time.perf_counter()
+        esperado = [legado(texto) for texto in textos]
+        tempo_legado = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        obtido = [compilada.contem(texto) for texto in textos]
+        tempo_compilado = time.perf_counter() - inicio
+
+        # Diferenças esperadas: apenas textos que só casam ignorando acentos (ex: "Tecnica")
+        so_sem_acento = sum(1 for e, o in zip(esperado, obtido) if o and not e)
+        perdidos = sum(1 for e, o in zip(esperado, obtido) if e and not o)
+        print(f"[BENCH] {rotulo}: {total_linhas} linhas | lista: {tempo_legado:.3f}s | compilado: {tempo_compilado:.3f}s "
+              f"| ganho: {tempo_legado / max(tempo_compilado, 1e-9):.1f}x | a mais (acentos): {so_sem_acento} | perdidos: {perdidos}")
+
+
+def consolidar_requisitos(tabelas):
+    """
+    Aplica as regras de datas e de documentos ignorados às tabelas da aba 'Requisitos'.
+
+    Args:
+        tabelas (dict): Mapeia cada categoria de XPATHS_REQUISITOS para a lista de linhas da tabela
+                        (cada linha é uma lista com o texto das células) ou None se a extração falhou.
+                        A chave 'Histórico' contém as células da primeira linha do histórico ou None.
+
+    Returns:
+        tuple: (data_mais_recente, certidoes, declaracoes, comprovantes, outros, historico_data, historico_evento).
+    """
+    def extrair_data_valida_categoria(linhas, categoria_nome):
+        """Função aninhada para extrair a data mais recente de uma tabela de documentos."""
+        if linhas is None:
+            return None, f"Erro ao extrair {categoria_nome.lower()}"
+        datas_validas = []
+        ignorar = correspondencia("palavras_ignorar")
+        for tds in linhas:
+            if len(tds) >= 2:
+                nome_arquivo = tds[0].strip()
+                data_arquivo_str = tds[1].strip()
+
+                # Ignora documentos que não são de conformidade (ex: planos de trabalho)
+                if not ignorar.contem(nome_arquivo):
+                    if (data_dt := extrair_data(data_arquivo_str)[0]):
+                        datas_validas.append(data_dt)
+
+        if datas_validas:
+            data_recente = max(datas_validas)
+            data_formatada = data_recente.strftime('%d/%m/%Y %H:%M:%S')
+            print(f"  [{categoria_nome}] Data mais recente encontrada: {data_formatada}")
+            return data_recente, data_formatada
+        return None, f"Nenhum(a) {categoria_nome.lower()} localizado(a)"
+
+    # Extrai data para cada categoria de documento
+    datas_categorias = []
+    textos_categorias = []
+    for categoria in XPATHS_REQUISITOS:
+        with medir_etapa(f"requisitos.{categoria}") as span:
+            data_obj, texto = extrair_data_valida_categoria(tabelas.get(categoria), categoria)
+            span["resultado"] = "ok" if data_obj else ("erro" if tabelas.get(categoria) is None else "vazio")
+        datas_categorias.append(data_obj)
+        textos_categorias.append(texto)
+
+    # --- Histórico ---
+    historico_data = ""
+    historico_evento = ""
+    historico = tabelas.get("Histórico")
+    if historico and len(historico) >= 3:
+        historico_evento = historico[0].strip()
+        _, historico_data = extrair_data(historico[2].strip())
+        print(f"  [HISTÓRICO] Evento: '{historico_evento}', Data: {historico_data}")
+    else:
+        print("[WARNING] Não foi possível extrair dados do histórico.")
+
+    # Consolida todas as datas de requisitos para encontrar a mais recente
+    datas_requisitos_validas = [d for d in datas_categorias if d]
+    data_mais_recente_requisitos = max(datas_requisitos_validas) if datas_requisitos_validas else None
+
+    return (data_mais_recente_requisitos, *textos_categorias, historico_data, historico_evento)
+
+
+# Lê todas as tabelas da aba 'Requisitos' em uma única chamada ao navegador.
+# Recebe {categoria: xpath} e o xpath do histórico; devolve a mesma estrutura de consolidar_requisitos.
+SCRIPT_TABELAS_REQUISITOS = """
+    const localizar = (xpath) => document.evaluate(
+        xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const linhas = (tabela) => {
+        if (!tabela) { return []; }
+        const corpo = tabela.tBodies.length ? tabela.tBodies[0] : tabela;
+        return Array.from(corpo.rows).map(tr => Array.from(tr.cells)
+            .filter(c => c.tagName === 'TD').map(td => td.innerText));
+    };
+    const resultado = {};
+    for (const [categoria, xpath] of Object.entries(arguments[0])) {
+        resultado[categoria] = linhas(localizar(xpath));
+    }
+    const historico = linhas(localizar(arguments[1]));
+    resultado['Histórico'] = historico.length ? historico[0] : null;
+    return resultado;
+"""
+
+# Contadores de chamadas ao WebDriver na leitura dos requisitos (atual x abordagem elemento a elemento).
+ESTATISTICAS_REQUISITOS = {"propostas": 0, "chamadas_atuais": 0, "chamadas_legado": 0}
+_trava_estatisticas = threading.Lock()
+
+
+def estimar_chamadas_legado(tabelas):
+    """
+    Calcula quantas chamadas ao WebDriver a leitura elemento a elemento faria para as mesmas tabelas:
+    um find_elements por tabela, um por linha (células), um .text por célula lida e,
+    no histórico, dois find_element e dois .text.
+    """
+    chamadas = 4
+    for categoria in XPATHS_REQUISITOS:
+        for celulas in tabelas.get(categoria) or []:
+            chamadas += 1 + (2 if len(celulas) >= 2 else 0)
+    return chamadas
+
+
+def resumo_chamadas_requisitos():
+    """Imprime o total de chamadas ao WebDriver economizadas na leitura dos requisitos."""
+    with _trava_estatisticas:
+        estatisticas = dict(ESTATISTICAS_REQUISITOS)
+    if estatisticas["propostas"]:
+        economizadas = estatisticas["chamadas_legado"] - estatisticas["chamadas_atuais"]
+        print(f"[INFO] Leitura de requisitos: {estatisticas['chamadas_atuais']} chamadas ao WebDriver em "
+              f"{estatisticas['propostas']} propostas (elemento a elemento seriam {estatisticas['chamadas_legado']}; "
+              f"{economizadas} economizadas).")
+
+
+def extrair_tabelas_requisitos_driver(driver):
+    """
+    Lê as tabelas da aba 'Requisitos' já aberta no navegador com uma única chamada de JavaScript.
+
+    Args:
+        driver (webdriver.Chrome): A instância do driver do Selenium.
+
+    Returns:
+        dict: Estrutura aceita por consolidar_requisitos.
+    """
+    tabelas = driver.execute_script(SCRIPT_TABELAS_REQUISITOS, XPATHS_REQUISITOS, XPATH_HISTORICO)
+    chamadas_legado = estimar_chamadas_legado(tabelas)
+    with _trava_estatisticas:
+        ESTATISTICAS_REQUISITOS["propostas"] += 1
+        ESTATISTICAS_REQUISITOS["chamadas_atuais"] += 1
+        ESTATISTICAS_REQUISITOS["chamadas_legado"] += chamadas_legado
+    print(f"  [REQUISITOS] Tabelas lidas em 1 chamada (elemento a elemento seriam {chamadas_legado}).")
+    return tabelas
+
+
+def extrair_tabelas_requisitos_elementos(driver):
+    """
+    Leitura elemento a elemento das tabelas da aba 'Requisitos' (uma chamada ao WebDriver por
+    linha e por célula). Mantida apenas como referência para benchmark_leitura_requisitos.
+    """
+    tabelas = {}
+    for categoria, xpath_tabela in XPATHS_REQUISITOS.items():
+        try:
+            linhas = driver.find_elements(By.XPATH, xpath_tabela + "/tbody/tr")
+            tabelas[categoria] = []
+            for linha in linhas:
+                tds = linha.find_elements(By.TAG_NAME, "td")
+                tabelas[categoria].append([tds[0].text, tds[1].text] if len(tds) >= 2 else [])
+        except Exception:
+            tabelas[categoria] = None
+
+    try:
+        tabelas["Histórico"] = [
+            driver.find_element(By.XPATH, XPATH_HISTORICO + "/tbody/tr[1]/td[1]").text,
+            "",
+            driver.find_element(By.XPATH, XPATH_HISTORICO + "/tbody/tr[1]/td[3]").text,
+        ]
+    except Exception:
+        tabelas["Histórico"] = None
+    return tabelas
+
+
+def benchmark_leitura_requisitos(driver, repeticoes=5):
+    """
+    Compara, na aba 'Requisitos' aberta no navegador, a leitura elemento a elemento com a leitura
+    em uma única chamada de JavaScript, e confere que ambas produzem o mesmo resultado.
+
+    Args:
+        driver (webdriver.Chrome): Driver posicionado na aba 'Requisitos' de uma proposta.
+        repeticoes (int): Quantas vezes cada abordagem é executada.
+    """
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        tabelas_elementos = extrair_tabelas_requisitos_elementos(driver)
+    tempo_elementos = (time.perf_counter() - inicio) / repeticoes
+
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        tabelas_script = driver.execute_script(SCRIPT_TABELAS_REQUISITOS, XPATHS_REQUISITOS, XPATH_HISTORICO)
+    tempo_script = (time.perf_counter() - inicio) / repeticoes
+
+    chamadas = estimar_chamadas_legado(tabelas_script)
+    mesmo_resultado = consolidar_requisitos(tabelas_elementos) == consolidar_requisitos(tabelas_script)
+    print(f"[BENCH] Elemento a elemento: {chamadas} chamadas, {tempo_elementos * 1000:.0f} ms por leitura")
+    print(f"[BENCH] Script único:        1 chamada, {tempo_script * 1000:.0f} ms por leitura")
+    print(f"[BENCH] Chamadas removidas: {chamadas - 1} | Resultados idênticos: {'sim' if mesmo_resultado else 'NÃO'}")
+
+
+def extrair_tabelas_requisitos_html(html):
+    """
+    Lê as tabelas da aba 'Requisitos' a partir do HTML bruto, usando os mesmos XPaths do Selenium.
+
+    Args:
+        html (str): O HTML da página de Requisitos.
+
+    Returns:
+        dict: Estrutura aceita por consolidar_requisitos.
+    """
+    arvore = lxml_html.fromstring(html)
+
+    def linhas_da_tabela(xpath_tabela):
+        # O navegador insere <tbody> automaticamente; o HTML bruto pode não tê-lo.
+        if not (tabela := arvore.xpath(xpath_tabela)):
+            return []
+        linhas = tabela[0].xpath("./tbody/tr") or tabela[0].xpath("./tr")
+        return [[td.text_content() for td in linha.xpath("./td")] for linha in linhas]
+
+    tabelas = {categoria: linhas_da_tabela(xpath) for categoria, xpath in XPATHS_REQUISITOS.items()}
+    historico = linhas_da_tabela(XPATH_HISTORICO)
+    tabelas["Histórico"] = historico[0] if historico else None
+    return tabelas
+
+
+def html_para_cache(driver):
+    """O HTML completo da página aberta, quando o cache de páginas está ativo (senão None)."""
+    if _cache_html is None:
+        return None
+    try:
+        return driver.execute_script("return document.documentElement.outerHTML")
+    except Exception as e:
+        print(f"[WARNING] Não foi possível ler o HTML da página para o cache: {e}")
+        return None
+
+
+def verificar_requisitos(driver, num_proposta=None):
+    """
+    Navega para a aba de 'Requisitos', extrai as datas de envio de documentos
+    e o status do histórico mais recente.
+
+    Args:
+        driver (webdriver.Chrome): A instância do driver do Selenium.
+        num_proposta (str): Número da proposta, para guardar a página no cache de páginas (opcional).
+
+    Returns:
+        tuple: Contém os dados extraídos (certidoes, declaracoes, etc.) e a ação derivada.
+               Retorna strings de erro em caso de falha.
+    """
+    tabelas, falha = ler_requisitos(driver)
+    if falha:
+        return falha
+    guardar_pagina(num_proposta, "requisitos", html_para_cache(driver))
+    return consolidar_requisitos(tabelas)
+
+
+def ler_requisitos(driver):
+    """
+    Navega para a aba de 'Requisitos' e lê as tabelas de documentos e o histórico, sem analisá-los.
+
+    Returns:
+        tuple: (tabelas, None), com tabelas na estrutura aceita por consolidar_requisitos, ou
+               (None, retorno de erro de verificar_requisitos) em caso de falha.
+    """
+    try:
+        print("[INFO] Iniciando verificação de requisitos...")
+        
+        # --- Navegação para a aba e sub-aba de Requisitos ---
+        with medir_etapa("requisitos.aba") as span:
+            if not (requisitos_menu := localizar_elemento(driver, "aba_requisitos")):
+                span["resultado"] = "não encontrado"
+                sinalizar_falha()
+                print("[ERROR] Não foi possível acessar a aba 'Requisitos'.")
+                return None, ("Erro de Navegação", "", "", "", "", "", "")
+            requisitos_menu.click()
+            esperar_condicao(driver, transicao_concluida(requisitos_menu), "transicao_requisitos")
+
+        with medir_etapa("requisitos.subaba") as span:
+            if not (subaba_requisitos := localizar_elemento(driver, "subaba_requisitos")):
+                span["resultado"] = "não encontrado"
+                sinalizar_falha()
+                print("[ERROR] Não foi possível acessar a sub-aba 'Requisitos'.")
+                return None, ("Erro de Navegação", "", "", "", "", "", "")
+            subaba_requisitos.click()
+            esperar_condicao(driver, transicao_concluida(subaba_requisitos, (By.XPATH, XPATH_HISTORICO)), "pagina_requisitos")
+
+        with medir_etapa("requisitos.leitura"):
+            return extrair_tabelas_requisitos_driver(driver), None
+
+    except Exception as e:
+        print(f"[ERROR] Falha crítica ao verificar requisitos: {e}")
+        sinalizar_falha(causa_da_excecao(e))
+        return None, (None, "Erro", "Erro", "Erro", "Erro", "Erro", "Erro")
+
+
+class ExtratorHTTP:
+    """
+    Caminho rápido de extração: baixa as páginas de Pareceres e Requisitos via HTTP,
+    reaproveitando os cookies da sessão autenticada do navegador.
+
+    As URLs de cada proposta vêm do IndicePropostas, preenchido na primeira vez em que o Selenium
+    chega às páginas. A partir daí a proposta pode ser lida sem cliques. Qualquer resposta
+    inesperada (sessão expirada, página errada, erro de rede) faz extrair() retornar None e o
+    chamador volta ao fluxo do Selenium.
+    """
+
+    def __init__(self, driver=None, sessao=None, tempo_limite=15, indice_propostas=None):
+        """
+        Args:
+            driver (webdriver.Chrome): Driver autenticado de onde os cookies serão copiados.
+            sessao (requests.Session): Sessão pronta (ex: apontada para um servidor local de testes).
+            tempo_limite (int): Tempo máximo de cada requisição, em segundos.
+            indice_propostas (IndicePropostas): Índice com as URLs das propostas (em memória se omitido).
+        """
+        if sessao is None:
+            sessao = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=1)
+            sessao.mount("http://", adaptador)
+            sessao.mount("https://", adaptador)
+        self.sessao = sessao
+        self.tempo_limite = tempo_limite
+        self.indice = indice_propostas if indice_propostas is not None else IndicePropostas(None)
+        if driver is not None:
+            self.sincronizar_cookies(driver)
+
+    def sincronizar_cookies(self, driver):
+        """Copia os cookies e o User-Agent do navegador para a sessão HTTP."""
+        for cookie in driver.get_cookies():
+            self.sessao.cookies.set(cookie["name"], cookie["value"],
+                                    domain=cookie.get("domain"), path=cookie.get("path", "/"))
+        try:
+            self.sessao.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+        except Exception:
+            pass
+
+    def conhece(self, num_proposta):
+        entrada = self.indice.obter(num_proposta) or {}
+        return bool(entrada.get("url_pareceres") and entrada.get("url_requisitos"))
+
+    def obter_html(self, url):
+        """
+        Baixa uma página do portal.
+
+        Returns:
+            str: O HTML da página.
+            None: Se a requisição falhar ou for redirecionada para o login (causa 'sessao_expirada').
+        """
+        try:
+            resposta = self.sessao.get(url, timeout=self.tempo_limite)
+        except Exception as e:
+            print(f"[WARNING] Falha na requisição HTTP para {url}: {e}")
+            return None
+        if any(marcador in resposta.url.lower() for marcador in MARCADORES_LOGIN):
+            print(f"[WARNING] Requisição HTTP para {url} redirecionada para o login. Usando o Selenium.")
+            sinalizar_falha("sessao_expirada")
+            return None
+        if resposta.status_code != 200:
+            print(f"[WARNING] Resposta HTTP inesperada ({resposta.status_code}) para {url}.")
+            return None
+        return resposta.text
+
+    def extrair(self, num_proposta):
+        """
+        Extrai pareceres e requisitos de uma proposta sem usar o navegador.
+
+        Returns:
+            tuple: (retorno de analisar_html_pareceres, retorno de consolidar_requisitos).
+            None: Se as URLs forem desconhecidas ou as páginas não puderem ser validadas.
+        """
+        if not (baixado := self.baixar(num_proposta)):
+            return None
+        html_pareceres, html_requisitos, tabelas = baixado
+        guardar_pagina(num_proposta, "pareceres", html_pareceres)
+        guardar_pagina(num_proposta, "requisitos", html_requisitos)
+        return analisar_html_pareceres(html_pareceres), consolidar_requisitos(tabelas)
+
+    def baixar(self, num_proposta):
+        """
+        Baixa e valida as páginas de Pareceres e Requisitos de uma proposta, sem analisá-las.
+
+        Returns:
+            tuple: (HTML de pareceres, HTML de requisitos, tabelas de requisitos).
+            None: Nos mesmos casos de extrair().
+        """
+        if not self.conhece(num_proposta):
+            return None
+        urls = self.indice.obter(num_proposta)
+
+        # Páginas .do que dependem do estado da sessão podem devolver a última proposta aberta no
+        # navegador: como em pagina_da_proposta, cada página precisa exibir o número da proposta.
+        html_pareceres = self.obter_html(urls["url_pareceres"])
+        if not html_pareceres or ("divPareceresProposta" not in html_pareceres
+                                  and "divPareceresPlanoTrabalho" not in html_pareceres):
+            return None
+        if num_proposta not in html_pareceres:
+            print(f"[WARNING] A página de Pareceres baixada via HTTP não é a da proposta {num_proposta}.")
+            return None
+
+        html_requisitos = self.obter_html(urls["url_requisitos"])
+        if not html_requisitos:
+            return None
+        if num_proposta not in html_requisitos:
+            print(f"[WARNING] A página de Requisitos baixada via HTTP não é a da proposta {num_proposta}.")
+            return None
+        try:
+            tabelas = extrair_tabelas_requisitos_html(html_requisitos)
+        except Exception as e:
+            print(f"[WARNING] HTML de requisitos inválido para {num_proposta}: {e}")
+            return None
+        if tabelas.get("Histórico") is None:
+            return None
+
+        print(f"[INFO] Proposta {num_proposta} extraída via HTTP.")
+        return html_pareceres, html_requisitos, tabelas
+
+
+def criar_extrator_http(driver, indice_propostas=None):
+    """Cria o ExtratorHTTP quando habilitado em USAR_EXTRACAO_HTTP e com as dependências instaladas."""
+    if not USAR_EXTRACAO_HTTP:
+        return None
+    if requests is None or lxml_html is None:
+        print("[WARNING] Extração via HTTP requer 'requests' e 'lxml'. Usando apenas o Selenium.")
+        return None
+    return ExtratorHTTP(driver, indice_propostas=indice_propostas)
+
+# ==============================================================================
+# Funções de Gerenciamento de Arquivos e Processamento em Lote
+# ==============================================================================
+
+def aplicar_por_proposta(df, tabela):
+    """
+    Copia para df as colunas de COLUNAS_DIARIO de tabela (com coluna 'Nº Proposta'), casando as
+    linhas pelo número da proposta. Em números repetidos na tabela, vale a última linha.
+
+    Returns:
+        tuple: (DataFrame atualizado, quantidade de linhas de df atualizadas).
+    """
+    tabela = tabela.assign(**{"Nº Proposta": tabela["Nº Proposta"].astype(str).str.strip()})
+    tabela = tabela.drop_duplicates("Nº Proposta", keep="last").set_index("Nº Proposta")
+    chaves = df['Nº Proposta'].astype(str).str.strip()
+    presentes = chaves.isin(tabela.index)
+    for coluna in COLUNAS_DIARIO:
+        if coluna in tabela.columns:
+            valores = chaves[presentes].map(tabela[coluna]).dropna()
+            df.loc[valores.index, coluna] = valores.values
+    return df, int(presentes.sum())
+
+
+class DiarioResultados:
+    """
+    Diário de resultados somente-acréscimo (JSON Lines), com um registro por proposta concluída.
+
+    Cada linha processada é gravada imediatamente como um registro identificado pelo
+    'Nº Proposta', com flush e fsync, de modo que uma queda do processo perde no máximo a
+    proposta em andamento. A retomada usa os números já registrados (e não a posição da linha),
+    continuando correta mesmo que o filtro ou a planilha de entrada mudem. A planilha Excel é
+    gerada a partir do diário apenas no fim da execução ou sob demanda (ver aplicar).
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._trava = threading.Lock()
+        self._encerrar_linha_truncada()
+
+    def _encerrar_linha_truncada(self):
+        """Garante que o próximo registro não seja colado a uma linha interrompida por uma queda."""
+        if os.path.exists(self.caminho) and os.path.getsize(self.caminho) > 0:
+            with open(self.caminho, 'rb+') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+    def ler(self):
+        """
+        Lê o diário e devolve o registro mais recente de cada proposta.
+
+        Returns:
+            dict: {Nº Proposta: registro}. Uma última linha truncada (queda durante a escrita) é ignorada.
+        """
+        registros = {}
+        if not os.path.exists(self.caminho):
+            return registros
+        with open(self.caminho, 'r', encoding='utf-8') as f:
+            for numero_linha, texto in enumerate(f, start=1):
+                try:
+                    registro = json.loads(texto)
+                except json.JSONDecodeError:
+                    print(f"[WARNING] Linha {numero_linha} do diário ilegível (provável interrupção). Ignorando.")
+                    continue
+                registros[registro["Nº Proposta"]] = registro
+        return registros
+
+    def propostas_registradas(self):
+        return set(self.ler())
+
+    def registrar(self, resultado):
+        """Acrescenta ao diário o ResultadoProposta de uma proposta (None = coluna inalterada)."""
+        self.registrar_lote([resultado])
+
+    def registrar_lote(self, resultados):
+        """Acrescenta vários ResultadoProposta ao diário com uma única escrita e um único fsync."""
+        if not resultados:
+            return
+        gravado_em = datetime.now().isoformat(timespec='seconds')
+        texto = "".join(
+            json.dumps({"Nº Proposta": resultado.num_proposta, "gravado_em": gravado_em, **resultado.colunas()},
+                       ensure_ascii=False, default=str) + "\n"
+            for resultado in resultados
+        )
+        try:
+            with medir_etapa("diario.registrar"), self._trava, open(self.caminho, 'a', encoding='utf-8') as f:
+                f.write(texto)
+                f.flush()
+                os.fsync(f.fileno())
+        except IOError:
+            numeros = ", ".join(resultado.num_proposta for resultado in resultados)
+            print(f"[WARNING] Não foi possível registrar a(s) proposta(s) {numeros} no diário.")
+
+    def aplicar(self, df):
+        """
+        Aplica ao DataFrame o registro mais recente de cada proposta presente no diário.
+
+        Returns:
+            pd.DataFrame: O DataFrame com as colunas de resultado atualizadas.
+        """
+        if not (registros := self.ler()):
+            return df
+        df, atualizadas = aplicar_por_proposta(df, pd.DataFrame(list(registros.values())))
+        print(f"[INFO] Diário aplicado: {atualizadas} linhas atualizadas a partir de {len(registros)} registros.")
+        return df
+
+    def arquivar(self):
+        """Renomeia o diário após a conclusão, para que a próxima execução comece do zero."""
+        if os.path.exists(self.caminho):
+            raiz, extensao = os.path.splitext(self.caminho)
+            destino = f"{raiz}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extensao}"
+            os.replace(self.caminho, destino)
+            print(f"[INFO] Diário arquivado em: {destino}")
+
+
+class IndicePropostas:
+    """
+    Índice persistente (JSON) que associa cada 'Nº Proposta' aos links internos do portal.
+
+    Cada entrada pode conter 'url_proposta' (página da proposta), 'url_pareceres' e
+    'url_requisitos'. As entradas são gravadas assim que a navegação as resolve e descartadas
+    quando deixam de levar à proposta. Com caminho None o índice vive apenas em memória.
+    O acesso é protegido por trava, permitindo o uso no processamento paralelo.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.entradas = {}
+        self._trava = threading.Lock()
+        if caminho and os.path.exists(caminho):
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    self.entradas = json.load(f)
+                print(f"[INFO] Índice de propostas carregado: {len(self.entradas)} links conhecidos.")
+            except (json.JSONDecodeError, IOError):
+                print("[WARNING] Índice de propostas ilegível. Iniciando um índice vazio.")
+
+    def obter(self, num_proposta):
+        with self._trava:
+            entrada = self.entradas.get(num_proposta)
+            return dict(entrada) if entrada else None
+
+    def registrar(self, num_proposta, **urls):
+        """Grava (ou completa) os links de uma proposta."""
+        self.registrar_lote({num_proposta: urls})
+
+    def registrar_lote(self, novas_entradas):
+        """Grava os links de várias propostas com uma única escrita em disco."""
+        agora = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        with self._trava:
+            for num_proposta, urls in novas_entradas.items():
+                entrada = self.entradas.setdefault(num_proposta, {})
+                entrada.update({chave: valor for chave, valor in urls.items() if valor})
+                entrada["atualizado_em"] = agora
+            self._salvar()
+
+    def invalidar(self, num_proposta):
+        with self._trava:
+            if self.entradas.pop(num_proposta, None) is not None:
+                self._salvar()
+
+    def _salvar(self):
+        if not self.caminho:
+            return
+        try:
+            temporario = self.caminho + ".tmp"
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(self.entradas, f, ensure_ascii=False, indent=1)
+            os.replace(temporario, self.caminho)
+        except IOError:
+            print("[WARNING] Não foi possível salvar o índice de propostas.")
+
+
+class EstadoPropostas:
+    """
+    Base SQLite com o último estado extraído de cada proposta, usada pelo modo incremental.
+
+    Para cada 'Nº Proposta' guarda a impressão digital da aba 'Requisitos' (ver
+    impressao_digital_requisitos) e os fatos extraídos (colunas de COLUNAS_EXTRAIDAS e as datas
+    de parecer e de requisitos), permitindo refazer a decisão sem voltar ao portal. A tabela 'falhas'
+    guarda a causa da última falha de cada proposta e quantas tentativas já falharam (ver reprocessar_falhas).
+    """
+
+    def __init__(self, caminho):
+        self._trava = threading.Lock()
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        with self.conexao:
+            self.conexao.execute(
+                "CREATE TABLE IF NOT EXISTS estado ("
+                " num_proposta TEXT PRIMARY KEY, impressao TEXT NOT NULL,"
+                " fatos TEXT NOT NULL, atualizado_em TEXT NOT NULL)"
+            )
+            self.conexao.execute(
+                "CREATE TABLE IF NOT EXISTS falhas ("
+                " num_proposta TEXT PRIMARY KEY, causa TEXT NOT NULL,"
+                " tentativas INTEGER NOT NULL, atualizado_em TEXT NOT NULL)"
+            )
+
+    def obter(self, num_proposta):
+        """Retorna {'impressao', 'fatos', 'atualizado_em'} da proposta, ou None se ela nunca foi extraída."""
+        with self._trava:
+            linha = self.conexao.execute(
+                "SELECT impressao, fatos, atualizado_em FROM estado WHERE num_proposta = ?", (num_proposta,)
+            ).fetchone()
+        if not linha:
+            return None
+        return {"impressao": linha[0], "fatos": json.loads(linha[1]), "atualizado_em": linha[2]}
+
+    def gravar(self, num_proposta, impressao, fatos):
+        agora = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO estado (num_proposta, impressao, fatos, atualizado_em) VALUES (?, ?, ?, ?)",
+                (num_proposta, impressao, json.dumps(fatos, ensure_ascii=False), agora),
+            )
+
+    def fatos(self):
+        """Retorna um DataFrame com os fatos gravados de todas as propostas (coluna 'Nº Proposta' + fatos)."""
+        with self._trava:
+            linhas = self.conexao.execute("SELECT num_proposta, fatos FROM estado").fetchall()
+        return pd.DataFrame([{"Nº Proposta": num, **json.loads(fatos)} for num, fatos in linhas])
+
+    def registrar_falha(self, num_proposta, causa):
+        """Grava a causa da última falha da proposta e soma uma tentativa. Retorna o total de tentativas."""
+        agora = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                "INSERT INTO falhas (num_proposta, causa, tentativas, atualizado_em) VALUES (?, ?, 1, ?)"
+                " ON CONFLICT(num_proposta) DO UPDATE SET causa = excluded.causa,"
+                " tentativas = tentativas + 1, atualizado_em = excluded.atualizado_em",
+                (num_proposta, causa, agora),
+            )
+            return self.conexao.execute(
+                "SELECT tentativas FROM falhas WHERE num_proposta = ?", (num_proposta,)).fetchone()[0]
+
+    def reclassificar_falhas(self, numeros, causa):
+        """Troca a causa da última falha das propostas informadas, sem somar tentativas."""
+        with self._trava, self.conexao:
+            self.conexao.executemany("UPDATE falhas SET causa = ? WHERE num_proposta = ?",
+                                     [(causa, num) for num in numeros])
+
+    def limpar_falha(self, num_proposta):
+        with self._trava, self.conexao:
+            self.conexao.execute("DELETE FROM falhas WHERE num_proposta = ?", (num_proposta,))
+
+    def falhas(self):
+        """Retorna {Nº Proposta: (causa, tentativas)} das propostas cuja última tentativa falhou."""
+        with self._trava:
+            linhas = self.conexao.execute("SELECT num_proposta, causa, tentativas FROM falhas").fetchall()
+        return {num: (causa, tentativas) for num, causa, tentativas in linhas}
+
+    def fechar(self):
+        with self._trava:
+            self.conexao.close()
+
+
+class CacheHTML:
+    """
+    Cache comprimido e endereçado pelo conteúdo das páginas de Pareceres e Requisitos.
+
+    Cada HTML é gravado uma única vez em 'objetos/<2 primeiros>/<sha256>.html.gz', por mais propostas
+    ou execuções que o repitam. O manifesto SQLite registra, por proposta e página, as versões gravadas
+    (hash e data). limpar() aplica RETENCAO_CACHE_HTML e apaga os objetos sem referência.
+    """
+
+    def __init__(self, pasta):
+        self.pasta = pasta
+        os.makedirs(os.path.join(pasta, "objetos"), exist_ok=True)
+        self._trava = threading.Lock()
+        self.conexao = sqlite3.connect(os.path.join(pasta, "manifesto.sqlite"), check_same_thread=False)
+        with self.conexao:
+            self.conexao.execute(
+                "CREATE TABLE IF NOT EXISTS versoes ("
+                " num_proposta TEXT NOT NULL, pagina TEXT NOT NULL, hash TEXT NOT NULL, gravado_em TEXT NOT NULL)"
+            )
+            self.conexao.execute("CREATE INDEX IF NOT EXISTS idx_versoes ON versoes (num_proposta, pagina, gravado_em)")
+
+    def caminho_objeto(self, hash_html):
+        return os.path.join(self.pasta, "objetos", hash_html[:2], f"{hash_html}.html.gz")
+
+    def gravar(self, num_proposta, pagina, html):
+        """Guarda o HTML de uma página ('pareceres' ou 'requisitos') da proposta. Retorna o hash."""
+        conteudo = html.encode("utf-8")
+        hash_html = hashlib.sha256(conteudo).hexdigest()
+        caminho = self.caminho_objeto(hash_html)
+        if not os.path.exists(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f"{caminho}.{threading.get_ident()}.tmp"
+            with open(temporario, 'wb') as f:
+                f.write(gzip.compress(conteudo, compresslevel=6))
+            os.replace(temporario, caminho)
+
+        agora = datetime.now().isoformat(timespec="seconds")
+        with self._trava, self.conexao:
+            ultima = self.conexao.execute(
+                "SELECT rowid, hash FROM versoes WHERE num_proposta = ? AND pagina = ? ORDER BY gravado_em DESC, rowid DESC LIMIT 1",
+                (num_proposta, pagina)).fetchone()
+            if ultima and ultima[1] == hash_html:
+                self.conexao.execute("UPDATE versoes SET gravado_em = ? WHERE rowid = ?", (agora, ultima[0]))
+            else:
+                self.conexao.execute("INSERT INTO versoes VALUES (?, ?, ?, ?)", (num_proposta, pagina, hash_html, agora))
+        return hash_html
+
+    def ultimas(self):
+        """Retorna {Nº Proposta: {pagina: caminho do objeto}} com a versão mais recente de cada página."""
+        with self._trava:
+            linhas = self.conexao.execute(
+                "SELECT num_proposta, pagina, hash FROM versoes v WHERE rowid = ("
+                " SELECT rowid FROM versoes WHERE num_proposta = v.num_proposta AND pagina = v.pagina"
+                " ORDER BY gravado_em DESC, rowid DESC LIMIT 1)").fetchall()
+        ultimas = defaultdict(dict)
+        for num_proposta, pagina, hash_html in linhas:
+            ultimas[num_proposta][pagina] = self.caminho_objeto(hash_html)
+        return dict(ultimas)
+
+    def limpar(self, retencao=None):
+        """Aplica a política de retenção e apaga os objetos que nenhuma versão referencia mais."""
+        retencao = retencao or RETENCAO_CACHE_HTML
+        limite = (datetime.now() - timedelta(days=retencao["dias"])).isoformat(timespec="seconds")
+        with self._trava, self.conexao:
+            removidas = self.conexao.execute(
+                "DELETE FROM versoes WHERE rowid IN (SELECT rowid FROM ("
+                " SELECT rowid, gravado_em, ROW_NUMBER() OVER (PARTITION BY num_proposta, pagina"
+                " ORDER BY gravado_em DESC, rowid DESC) AS ordem FROM versoes)"
+                " WHERE ordem > ? OR (ordem > 1 AND gravado_em < ?))",
+                (retencao["versoes"], limite)).rowcount
+            referenciados = {linha[0] for linha in self.conexao.execute("SELECT DISTINCT hash FROM versoes")}
+
+        liberados = 0
+        for raiz, _, arquivos in os.walk(os.path.join(self.pasta, "objetos")):
+            for nome in arquivos:
+                if nome.endswith(".html.gz") and nome[:-len(".html.gz")] not in referenciados:
+                    caminho = os.path.join(raiz, nome)
+                    liberados += os.path.getsize(caminho)
+                    os.remove(caminho)
+        if removidas or liberados:
+            print(f"[INFO] Cache de páginas: {removidas} versões antigas removidas, {liberados / 1024:.0f} KB liberados.")
+
+    def fechar(self):
+        with self._trava:
+            self.conexao.close()
+
+
+# Cache de páginas da execução atual (None quando USAR_CACHE_HTML está desligado).
+_cache_html = None
+
+
+def abrir_cache_html(paths):
+    """Abre o cache de páginas da execução, se USAR_CACHE_HTML estiver ligado."""
+    global _cache_html
+    if USAR_CACHE_HTML and _cache_html is None:
+        _cache_html = CacheHTML(paths['cache_html'])
+        print(f"[INFO] Cache de páginas ativo em: {paths['cache_html']}")
+    return _cache_html
+
+
+def fechar_cache_html():
+    """Aplica a retenção e fecha o cache de páginas da execução, se estiver aberto."""
+    global _cache_html
+    if _cache_html is not None:
+        _cache_html.limpar()
+        _cache_html.fechar()
+        _cache_html = None
+
+
+def guardar_pagina(num_proposta, pagina, html):
+    """Guarda o HTML da página da proposta no cache de páginas, se ele estiver ativo."""
+    if _cache_html is not None and num_proposta and html:
+        try:
+            _cache_html.gravar(num_proposta, pagina, html)
+        except Exception as e:
+            print(f"[WARNING] Não foi possível guardar a página '{pagina}' da proposta {num_proposta} no cache: {e}")
+
+
+def exportar_excel_streaming(df, caminho_saida):
+    """
+    Grava o DataFrame inteiro em modo somente-escrita do openpyxl, linha a linha, sem montar
+    o modelo de células completo em memória. Mantém o layout do df.to_excel original: aba
+    'Sheet1', cabeçalho na primeira linha em negrito, centralizado e com borda fina.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    livro = Workbook(write_only=True)
+    planilha = livro.create_sheet("Sheet1")
+    borda = Side(style="thin")
+    cabecalho = []
+    for coluna in df.columns:
+        celula = WriteOnlyCell(planilha, value=str(coluna))
+        celula.font = Font(bold=True)
+        celula.alignment = Alignment(horizontal="center", vertical="top")
+        celula.border = Border(left=borda, right=borda, top=borda, bottom=borda)
+        cabecalho.append(celula)
+    planilha.append(cabecalho)
+
+    for valores in df.itertuples(index=False, name=None):
+        planilha.append([None if pd.isna(valor) else valor for valor in valores])
+
+    temporario = caminho_saida + ".tmp.xlsx"
+    livro.save(temporario)
+    os.replace(temporario, caminho_saida)
+
+
+def atualizar_linhas_excel(df, caminho_saida, indices_alterados):
+    """
+    Atualiza no lugar apenas as células das linhas alteradas, preservando a formatação, larguras,
+    filtros e demais ajustes feitos pelos planejadores na planilha de saída. As linhas são
+    localizadas pelo 'Nº Proposta' e as colunas pelo cabeçalho, então a ordem na planilha não importa.
+
+    Returns:
+        bool: False se a planilha não tiver a estrutura esperada ou tiver um Nº Proposta repetido (o
+              chamador faz a exportação completa).
+    """
+    from openpyxl import load_workbook
+
+    livro = load_workbook(caminho_saida)
+    planilha = livro.worksheets[0]
+    colunas = {celula.value: celula.column for celula in planilha[1] if celula.value}
+    if "Nº Proposta" not in colunas or not all(coluna in colunas for coluna in df.columns):
+        return False
+
+    # Um Nº Proposta repetido não identifica a linha: a planilha é exportada inteira
+    linhas_por_proposta = {}
+    celulas = planilha.iter_rows(min_row=2, min_col=colunas["Nº Proposta"], max_col=colunas["Nº Proposta"], values_only=True)
+    for numero_linha, (valor,) in enumerate(celulas, start=2):
+        if valor is None or not (numero := str(valor).strip()):
+            continue
+        if numero in linhas_por_proposta:
+            return False
+        linhas_por_proposta[numero] = numero_linha
+
+    for idx in indices_alterados:
+        linha = df.loc[idx]
+        if (numero_linha := linhas_por_proposta.get(str(linha["Nº Proposta"]).strip())) is None:
+            return False
+        for coluna, valor in linha.items():
+            celula = planilha.cell(row=numero_linha, column=colunas[coluna])
+            novo = None if pd.isna(valor) or valor == '' else valor
+            if celula.value != novo:
+                celula.value = novo
+
+    temporario = caminho_saida + ".tmp.xlsx"
+    livro.save(temporario)
+    os.replace(temporario, caminho_saida)
+    return True
+
+
+def memoria_processo():
+    """
+    Memória residente atual e pico da memória residente do processo, em MB, lidos do sistema operacional
+    (GetProcessMemoryInfo no Windows, /proc no Linux). Custa uma chamada; (None, None) se não houver como medir.
+    """
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ContadoresMemoria(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (nome, ctypes.c_size_t) for nome in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+        try:
+            contadores = ContadoresMemoria(cb=ctypes.sizeof(ContadoresMemoria))
+            ctypes.windll.kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+            ctypes.windll.psapi.GetProcessMemoryInfo.argtypes = [
+                wintypes.HANDLE, ctypes.POINTER(ContadoresMemoria), wintypes.DWORD]
+            if ctypes.windll.psapi.GetProcessMemoryInfo(
+                    ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(contadores), contadores.cb):
+                return contadores.WorkingSetSize / 2 ** 20, contadores.PeakWorkingSetSize / 2 ** 20
+        except (AttributeError, OSError):
+            pass
+        return None, None
+    try:
+        with open("/proc/self/status", 'r', encoding='utf-8') as f:
+            campos = dict(linha.split(":", 1) for linha in f if ":" in linha)
+        return int(campos["VmRSS"].split()[0]) / 1024, int(campos["VmHWM"].split()[0]) / 1024
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def salvar_resultado(df, caminho_saida, indices_alterados=None):
+    """
+    Salva o DataFrame em um arquivo Excel, informando o tempo de escrita e a memória do processo
+    antes e depois dela (e o pico de alocações da escrita, com MEDIR_MEMORIA_ESCRITA).
+    Retorna True se o arquivo foi gravado.
+
+    Args:
+        df (pd.DataFrame): O DataFrame de resultado.
+        caminho_saida (str): O arquivo Excel de saída.
+        indices_alterados (list): Se informado e a planilha já existir, somente essas linhas são
+                                  atualizadas no lugar; caso contrário a planilha é exportada inteira.
+    """
+    import tracemalloc
+
+    memoria_antes, _ = memoria_processo()
+    inicio = time.perf_counter()
+    if MEDIR_MEMORIA_ESCRITA:
+        tracemalloc.start()
+    try:
+        with medir_etapa("salvar_resultado") as span:
+            modo = _salvar_resultado(df, caminho_saida, indices_alterados)
+            span["resultado"] = modo.split(" ")[0]
+        medicao = f"{modo}: {time.perf_counter() - inicio:.2f}s"
+        memoria_depois, pico = memoria_processo()
+        if memoria_antes is not None and memoria_depois is not None:
+            medicao += f", memória do processo {memoria_antes:.0f} → {memoria_depois:.0f} MB (pico {pico:.0f} MB)"
+        if MEDIR_MEMORIA_ESCRITA:
+            medicao += f", pico das alocações da escrita {tracemalloc.get_traced_memory()[1] / 1024 / 1024:.1f} MB"
+        print(f"[SUCCESS] Resultado salvo com sucesso em: {caminho_saida} ({medicao})")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Falha ao salvar o arquivo de resultado: {e}")
+        return False
+    finally:
+        if MEDIR_MEMORIA_ESCRITA:
+            tracemalloc.stop()
+
+
+def _salvar_resultado(df, caminho_saida, indices_alterados):
+    """Grava a planilha (atualização no lugar ou exportação completa) e retorna a descrição do modo usado."""
+    modo = "exportação completa"
+    if indices_alterados is not None and os.path.exists(caminho_saida):
+        modo = f"atualização de {len(indices_alterados)} linhas"
+        if not atualizar_linhas_excel(df, caminho_saida, indices_alterados):
+            print("[WARNING] Estrutura da planilha de saída diferente da esperada ou Nº Proposta repetido. "
+                  "Exportando por completo.")
+            modo = "exportação completa"
+            exportar_excel_streaming(df, caminho_saida)
+    else:
+        exportar_excel_streaming(df, caminho_saida)
+    return modo
+
+
+def motor_leitura_excel():
+    """Retorna o motor de leitura do pandas: 'calamine' (bem mais rápido) se instalado, senão o padrão."""
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        return None
+
+
+def ler_entrada_excel(caminho):
+    """
+    Lê e prepara a planilha de entrada, filtrando e estruturando os dados.
+
+    Somente as colunas de COLUNAS_SAIDA são lidas. O DataFrame já limpo é guardado em cache
+    (pickle) ao lado da planilha, identificado pelo tamanho e pela data de modificação do
+    arquivo, de modo que as leituras seguintes da mesma planilha são praticamente instantâneas.
+
+    Args:
+        caminho (str): O caminho para o arquivo Excel de entrada.
+
+    Returns:
+        pd.DataFrame: DataFrame preparado para o processamento.
+    """
+    inicio = time.perf_counter()
+    try:
+        info = os.stat(caminho)
+        chave = {
+            "versao": VERSAO_CACHE_ENTRADA, "tamanho": info.st_size, "modificado": info.st_mtime_ns,
+            "aba": ABA_ENTRADA, "colunas": COLUNAS_SAIDA,
+        }
+        caminho_cache = os.path.join(os.path.dirname(caminho) or ".", ".cache_entrada",
+                                     os.path.basename(caminho) + ".pkl")
+        try:
+            cache = pd.read_pickle(caminho_cache)
+            if cache["chave"] == chave:
+                df_saida = cache["df"]
+                print(f"[INFO] Planilha carregada do cache em {time.perf_counter() - inicio:.3f}s. Linhas: {len(df_saida)}.")
+                return df_saida.copy()
+        except Exception:
+            pass
+
+        motor = motor_leitura_excel()
+        df = pd.read_excel(caminho, sheet_name=ABA_ENTRADA, dtype=str, engine=motor,
+                           usecols=lambda coluna: coluna in COLUNAS_SAIDA)
+        print(f"[INFO] Planilha lida. Total de linhas: {len(df)}.")
+
+        colunas_obrigatorias = ['Nº Proposta', 'Instrumento']
+        if not all(col in df.columns for col in colunas_obrigatorias):
+            raise ValueError("As colunas 'Nº Proposta' e 'Instrumento' são obrigatórias.")
+
+        # Limpeza e preparação dos dados
+        df.dropna(subset=['Nº Proposta'], inplace=True)
+        df = df[df['Nº Proposta'].str.strip() != ''].drop_duplicates(subset=['Nº Proposta']).reset_index(drop=True)
+        print(f"[INFO] Após limpeza e remoção de duplicatas: {len(df)} linhas.")
+
+        # Cria um novo DataFrame com a estrutura correta, preservando dados existentes
+        df_saida = pd.DataFrame(columns=COLUNAS_SAIDA)
+        for col in df_saida.columns:
+            if col in df.columns:
+                df_saida[col] = df[col]
+            else:
+                df_saida[col] = ''
+        df_saida = df_saida.fillna('')
+
+        try:
+            os.makedirs(os.path.dirname(caminho_cache), exist_ok=True)
+            pd.to_pickle({"chave": chave, "df": df_saida}, caminho_cache)
+        except Exception as e:
+            print(f"[WARNING] Não foi possível gravar o cache da planilha de entrada: {e}")
+
+        print(f"[INFO] Planilha carregada em {time.perf_counter() - inicio:.2f}s (motor: {motor or 'padrão'}).")
+        return df_saida
+
+    except FileNotFoundError:
+        print(f"[ERROR] Arquivo de entrada não encontrado em: {caminho}")
+        raise
+    except Exception as e:
+        print(f"[ERROR] Erro ao ler e preparar a planilha de entrada: {e}")
+        raise
+
+
+# Condições usadas em REGRAS_ACAO['datas']. Cada uma recebe as colunas 'data_pareceres',
+# 'data_requisitos' (datetime64, NaT = ausente) e 'Histórico (Evento)' e devolve uma máscara booleana.
+CONDICOES_ACAO = {
+    "parecer_mais_recente": lambda f: f["data_pareceres"].notna()
+        & (f["data_requisitos"].isna() | (f["data_pareceres"] > f["data_requisitos"])),
+    "requisito_mais_recente": lambda f: f["data_requisitos"].notna()
+        & (f["data_pareceres"].isna() | (f["data_requisitos"] > f["data_pareceres"])),
+    "empate": lambda f: f["data_pareceres"] == f["data_requisitos"],
+    "empate_complementacao_solicitada": lambda f: (f["data_pareceres"] == f["data_requisitos"])
+        & f["Histórico (Evento)"].str.contains("Complementação Solicitada", regex=False),
+    "sempre": lambda f: pd.Series(True, index=f.index),
+}
+
+# As mesmas condições sobre os valores de uma única proposta (datas como datetime ou None), usadas por
+# decidir_acao no processamento de cada proposta sem montar um DataFrame.
+CONDICOES_ACAO_PROPOSTA = {
+    "parecer_mais_recente": lambda parecer, requisito, evento: parecer is not None
+        and (requisito is None or parecer > requisito),
+    "requisito_mais_recente": lambda parecer, requisito, evento: requisito is not None
+        and (parecer is None or requisito > parecer),
+    "empate": lambda parecer, requisito, evento: parecer is not None and parecer == requisito,
+    "empate_complementacao_solicitada": lambda parecer, requisito, evento: parecer is not None
+        and parecer == requisito and "Complementação Solicitada" in evento,
+    "sempre": lambda parecer, requisito, evento: True,
+}
+
+
+def carregar_regras_acao(caminho=None):
+    """
+    Lê uma tabela de regras no formato de REGRAS_ACAO a partir de um arquivo JSON.
+
+    Args:
+        caminho (str): Arquivo JSON com as regras. Sem caminho, usa REGRAS_ACAO.
+
+    Returns:
+        dict: As regras validadas.
+    """
+    if not caminho:
+        return REGRAS_ACAO
+    with open(caminho, 'r', encoding='utf-8') as f:
+        regras = json.load(f)
+    desconhecidas = {condicao for condicao, _ in regras["datas"]} - set(CONDICOES_ACAO)
+    if "versao" not in regras or desconhecidas:
+        raise ValueError(f"Regras inválidas em '{caminho}' (versão ausente ou condições desconhecidas: {desconhecidas}).")
+    return regras
+
+
+def mapa_situacional(regras=REGRAS_ACAO):
+    """Retorna {situacional: ação} a partir da tabela de regras (a primeira ocorrência prevalece)."""
+    mapa = {}
+    for acao, situacionais in regras["situacional"]:
+        for situacional in situacionais:
+            mapa.setdefault(situacional, acao)
+    return mapa
+
+
+def avaliar_situacional(situacionais, regras=REGRAS_ACAO):
+    """
+    Classifica de uma vez uma coluna de situacionais.
+
+    Returns:
+        pd.Series: A ação definida por cada situacional, ou None onde a extração web é necessária.
+    """
+    acoes = situacionais.fillna('').astype(str).str.strip().map(mapa_situacional(regras))
+    return acoes.astype(object).where(acoes.notna(), None)
+
+
+def avaliar_acoes(fatos, regras=REGRAS_ACAO):
+    """
+    Avalia a tabela de regras sobre um DataFrame de fatos extraídos, sem laço por linha.
+
+    Args:
+        fatos (pd.DataFrame): Colunas 'data_pareceres', 'data_requisitos', 'Histórico (Evento)' e,
+            opcionalmente, 'Situacional (Documentação)'.
+        regras (dict): Tabela de regras (ver REGRAS_ACAO).
+
+    Returns:
+        pd.Series: A ação necessária de cada linha.
+    """
+    tabela = pd.DataFrame({
+        "data_pareceres": pd.to_datetime(fatos["data_pareceres"], errors='coerce'),
+        "data_requisitos": pd.to_datetime(fatos["data_requisitos"], errors='coerce'),
+        "Histórico (Evento)": fatos["Histórico (Evento)"].fillna('').astype(str),
+    }, index=fatos.index)
+
+    acoes = pd.Series(None, index=fatos.index, dtype=object)
+    if "Situacional (Documentação)" in fatos:
+        acoes = avaliar_situacional(fatos["Situacional (Documentação)"], regras)
+
+    pendentes = acoes.isna()
+    for condicao, acao in regras["datas"]:
+        if not pendentes.any():
+            break
+        casou = pendentes & CONDICOES_ACAO[condicao](tabela).fillna(False).astype(bool)
+        acoes[casou] = acao
+        pendentes &= ~casou
+    return acoes
+
+
+def classificar_situacional(situacional, regras=REGRAS_ACAO):
+    """
+    Regras de Negócio baseadas no "Situacional" (pré-análise).
+
+    Args:
+        situacional (str): O valor da coluna 'Situacional (Documentação)'.
+        regras (dict): Tabela de regras (ver REGRAS_ACAO).
+
+    Returns:
+        str: A ação definida pelo situacional, ou None se a proposta exigir extração web.
+    """
+    return mapa_situacional(regras).get(situacional)
+
+
+def decidir_acao(data_pareceres, data_requisitos, historico_evento, regras=REGRAS_ACAO):
+    """
+    Lógica de Decisão da Ação Necessária.
+
+    Compara a data do último parecer do técnico com a data do último documento enviado pela entidade,
+    aplicando REGRAS_ACAO['datas'] a uma única proposta (ver CONDICOES_ACAO_PROPOSTA; para muitas
+    propostas de uma vez, avaliar_acoes).
+
+    Args:
+        data_pareceres (datetime): Data do parecer mais recente dos técnicos (ou None).
+        data_requisitos (datetime): Data do documento mais recente da entidade (ou None).
+        historico_evento (str): Evento mais recente do histórico, usado no desempate.
+
+    Returns:
+        str: A ação necessária.
+    """
+    # NaT (ausente) não é igual a si mesmo
+    data_pareceres = data_pareceres if isinstance(data_pareceres, datetime) and data_pareceres == data_pareceres else None
+    data_requisitos = data_requisitos if isinstance(data_requisitos, datetime) and data_requisitos == data_requisitos else None
+    historico_evento = str(historico_evento) if historico_evento else ''
+    for condicao, acao in regras["datas"]:
+        if CONDICOES_ACAO_PROPOSTA[condicao](data_pareceres, data_requisitos, historico_evento):
+            return acao
+    return None
+
+
+def impressao_digital_requisitos(resultado_requisitos):
+    """
+    Calcula uma impressão digital barata do estado da proposta a partir da aba 'Requisitos':
+    o evento e a data do topo do histórico e a data mais recente de cada categoria de documento.
+
+    Returns:
+        str: Hash do estado, ou None se a leitura dos requisitos falhou.
+    """
+    textos = [str(valor) for valor in resultado_requisitos[1:]]
+    if not isinstance(resultado_requisitos[0], (datetime, type(None))) or any(t.startswith("Erro") for t in textos):
+        return None
+    return hashlib.sha1(json.dumps(textos, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class ResultadoProposta:
+    """
+    Resultado compacto do processamento de uma proposta.
+
+    Cada campo corresponde a uma coluna de saída (ver CAMPOS_RESULTADO); campos None deixam a
+    coluna correspondente da planilha inalterada.
+    'causa_falha' não vai para a planilha: indica, quando a proposta falhou, a causa (ver CAUSAS_FALHA).
+    """
+    indice: int
+    num_proposta: str
+    pareceres_proposta: str | None = None
+    pareceres_plano: str | None = None
+    certidoes: str | None = None
+    declaracoes: str | None = None
+    comprovantes: str | None = None
+    outros: str | None = None
+    historico_data: str | None = None
+    historico_evento: str | None = None
+    acao: str | None = None
+    causa_falha: str | None = None
+
+    def colunas(self):
+        """Retorna {coluna de saída: valor} para todos os campos de resultado."""
+        return {coluna: getattr(self, campo) for campo, coluna in CAMPOS_RESULTADO.items()}
+
+
+class BufferResultados:
+    """
+    Acumula os resultados das propostas em listas por coluna e os aplica ao DataFrame de uma só vez,
+    com uma atribuição vetorizada por coluna em vez de várias escritas df.loc por proposta.
+    Pode receber resultados de várias threads ao mesmo tempo.
+    """
+
+    def __init__(self):
+        self._colunas = {campo: [] for campo in ("indice", *CAMPOS_RESULTADO)}
+        self._trava = threading.Lock()
+
+    def adicionar(self, resultado):
+        with self._trava:
+            for campo, valores in self._colunas.items():
+                valores.append(getattr(resultado, campo))
+
+    def __len__(self):
+        return len(self._colunas["indice"])
+
+    def indices(self):
+        with self._trava:
+            return list(dict.fromkeys(self._colunas["indice"]))
+
+    def aplicar(self, df):
+        """
+        Junta os resultados acumulados ao DataFrame (o último resultado de cada linha prevalece).
+
+        Returns:
+            pd.DataFrame: O DataFrame atualizado.
+        """
+        with self._trava:
+            if not self._colunas["indice"]:
+                return df
+            tabela = pd.DataFrame(self._colunas)
+        tabela = tabela.drop_duplicates(subset="indice", keep="last").set_index("indice")
+        for campo, coluna in CAMPOS_RESULTADO.items():
+            valores = tabela[campo].dropna()
+            if not valores.empty:
+                df.loc[valores.index, coluna] = valores.values
+        return df
+
+
+def resultado_situacional(indice, num_proposta, acao):
+    """ResultadoProposta de uma proposta cuja ação foi definida pelo situacional, sem extração web."""
+    nao_aplicavel = "N/A (Definido pelo Situacional)"
+    return ResultadoProposta(indice, num_proposta, pareceres_proposta=nao_aplicavel, certidoes=nao_aplicavel,
+                             declaracoes=nao_aplicavel, historico_data=nao_aplicavel, acao=acao)
+
+
+def preclassificar_situacionais(df, pendentes, diario, buffer):
+    """
+    Resolve de uma vez, antes de qualquer trabalho no navegador, todas as propostas pendentes cuja
+    ação é definida pelo situacional. Os resultados vão para o diário (em lote) e para o buffer, e
+    as linhas deixam de ser pendentes.
+
+    Args:
+        df (pd.DataFrame): A planilha de entrada (já filtrada).
+        pendentes (list[bool]): Máscara das linhas ainda não processadas; atualizada no lugar.
+
+    Returns:
+        int: Quantidade de propostas resolvidas pelo situacional.
+    """
+    acoes = avaliar_situacional(df['Situacional (Documentação)'])
+    resultados = [
+        resultado_situacional(idx, str(num).strip(), acao)
+        for idx, num, acao in zip(df.index, df['Nº Proposta'], acoes)
+        if acao and pendentes[idx] and str(num).strip()
+    ]
+    for resultado in resultados:
+        buffer.adicionar(resultado)
+        pendentes[resultado.indice] = False
+    diario.registrar_lote(resultados)
+    if resultados:
+        print(f"[INFO] {len(resultados)} propostas com ação definida pelo situacional (regras v{REGRAS_ACAO['versao']}). "
+              f"Sem extração web.")
+    return len(resultados)
+
+
+def resultado_falha(indice, num_proposta, acao, driver=None, causa=None):
+    """
+    ResultadoProposta de uma proposta que falhou, com a causa informada ou, se omitida, a registrada
+    durante o processamento (ou 'sessao_expirada', se o portal voltou para a tela de login).
+    """
+    if causa is None:
+        causa = "sessao_expirada" if sessao_expirada(driver) else causa_falha_atual() or "erro_inesperado"
+    print(f"[WARNING] Proposta {num_proposta} falhou ({acao}). Causa: {causa}.")
+    return ResultadoProposta(indice, num_proposta, acao=acao, causa_falha=causa)
+
+
+def acao_de_falha(resultado_pareceres, resultado_requisitos):
+    """
+    Ação gravada quando a leitura de pareceres ou de requisitos falhou (uma leitura que falhou não
+    pode decidir a ação; a proposta fica marcada para o reprocessamento), ou None se ambas deram certo.
+    """
+    if resultado_requisitos[0] == "Erro de Navegação":
+        return "Erro de Navegação"
+    if resultado_pareceres[0] == "Erro ao verificar" or resultado_requisitos[1] == "Erro":
+        return "Erro"
+    return None
+
+
+def preencher_extracao(resultado, resultado_pareceres, resultado_requisitos):
+    """Copia para o ResultadoProposta os textos lidos das páginas de Pareceres e Requisitos."""
+    _, resultado.pareceres_proposta, resultado.pareceres_plano, _, _ = resultado_pareceres
+    (_, resultado.certidoes, resultado.declaracoes, resultado.comprovantes, resultado.outros,
+     historico_data, resultado.historico_evento) = resultado_requisitos
+    resultado.historico_data = historico_data or ""
+    return resultado
+
+
+def gravar_fatos(estado_propostas, resultado, resultado_requisitos, data_pareceres):
+    """
+    Grava na base de estado os fatos extraídos da proposta, se as leituras de pareceres e requisitos foram
+    válidas. A impressão digital cobre só os requisitos: fatos de uma leitura de pareceres que falhou seriam
+    reaproveitados pelo modo incremental com uma ação decidida sem o parecer (ver acao_de_falha).
+    """
+    if resultado.acao in ACOES_FALHA:
+        return
+    if impressao := impressao_digital_requisitos(resultado_requisitos):
+        data_requisitos = resultado_requisitos[0]
+        fatos = {coluna: valor for coluna, valor in resultado.colunas().items() if coluna in COLUNAS_EXTRAIDAS}
+        fatos["data_pareceres"] = data_pareceres.isoformat() if data_pareceres else None
+        fatos["data_requisitos"] = data_requisitos.isoformat() if data_requisitos else None
+        estado_propostas.gravar(resultado.num_proposta, impressao, fatos)
+
+
+@dataclass(slots=True)
+class ColetaProposta:
+    """
+    Conteúdo bruto lido para uma proposta, ainda sem análise (ver coletar_proposta e analisar_coleta).
+
+    'resultado' já vem preenchido quando a coleta decide sozinha (ação pelo situacional, proposta não
+    encontrada ou fatos reaproveitados no modo incremental). 'paginas' guarda o HTML a gravar no cache
+    de páginas e 'causa_falha', a causa registrada quando a leitura de alguma página falhou.
+    """
+    indice: int
+    num_proposta: str
+    html_pareceres: str | None = None
+    tabelas_requisitos: dict | None = None
+    falha_requisitos: tuple | None = None
+    paginas: dict = field(default_factory=dict)
+    causa_falha: str | None = None
+    resultado: ResultadoProposta | None = None
+
+    def situacao(self):
+        """Resultado do span da coleta: a causa da falha, a ação já decidida ou 'coletada'."""
+        if self.resultado:
+            return self.resultado.causa_falha or self.resultado.acao
+        return self.causa_falha or "coletada"
+
+
+def coletar_proposta(indice, num_proposta, situacional, driver, extrator_http=None, indice_propostas=None, estado_propostas=None):
+    """
+    Parte de processar_proposta que usa o navegador: navega até a proposta e lê o conteúdo bruto das
+    páginas de Pareceres e Requisitos (ou as baixa via HTTP), sem analisá-lo.
+
+    Args:
+        Os mesmos de processar_proposta (estado_propostas só é usado por coletar_proposta_incremental).
+
+    Returns:
+        ColetaProposta: O conteúdo a entregar a analisar_coleta.
+    """
+    situacional = situacional.strip()
+    limpar_falha()
+    coleta = ColetaProposta(indice, num_proposta)
+
+    # Se uma ação foi definida pela pré-análise, pula a extração web
+    if acao_final := classificar_situacional(situacional):
+        print(f"[INFO] Ação definida como '{acao_final}' com base no situacional '{situacional}'. Pulando extração web.")
+        coleta.resultado = resultado_situacional(indice, num_proposta, acao_final)
+        return coleta
+
+    # --- Processo de Extração Web ---
+    if extrator_http and (baixado := extrator_http.baixar(num_proposta)):
+        coleta.html_pareceres, html_requisitos, coleta.tabelas_requisitos = baixado
+        coleta.paginas = {"pareceres": coleta.html_pareceres, "requisitos": html_requisitos}
+        return coleta
+
+    if not navegar_menu_principal(driver, num_proposta, indice_propostas):
+        coleta.resultado = resultado_falha(indice, num_proposta, "Instrumento não encontrado", driver)
+        return coleta
+
+    # Aba fechada ou sessão do WebDriver encerrada: a proposta falha como sessão expirada
+    try:
+        url_pareceres = driver.current_url
+    except Exception as e:
+        print(f"[ERROR] O navegador deixou de responder na proposta {num_proposta}: {e}")
+        coleta.resultado = resultado_falha(indice, num_proposta, "Erro de Navegação", causa="sessao_expirada")
+        return coleta
+    coleta.html_pareceres = coleta.paginas["pareceres"] = ler_pareceres(driver)
+    coleta.tabelas_requisitos, coleta.falha_requisitos = ler_requisitos(driver)
+    if not coleta.falha_requisitos:
+        coleta.paginas["requisitos"] = html_para_cache(driver)
+    navegador_perdido = False
+    try:
+        if indice_propostas and (url_requisitos := driver.current_url) != url_pareceres:
+            indice_propostas.registrar(num_proposta, url_pareceres=url_pareceres, url_requisitos=url_requisitos)
+        if extrator_http:
+            extrator_http.sincronizar_cookies(driver)
+    except Exception as e:
+        print(f"[WARNING] O navegador deixou de responder após a leitura da proposta {num_proposta}: {e}")
+        navegador_perdido = True
+    if coleta.html_pareceres is None or coleta.falha_requisitos:
+        coleta.causa_falha = "sessao_expirada" if navegador_perdido or sessao_expirada(driver) else causa_falha_atual()
+    return coleta
+
+
+def analisar_coleta(coleta, estado_propostas=None):
+    """
+    Parte de processar_proposta que não usa o navegador: analisa o conteúdo coletado, decide a ação,
+    guarda as páginas no cache e grava os fatos na base de estado. Pode rodar em outra thread.
+
+    Returns:
+        ResultadoProposta: Os valores a gravar na linha da proposta.
+    """
+    if coleta.resultado:
+        return coleta.resultado
+    indice, num_proposta = coleta.indice, coleta.num_proposta
+    for pagina, html in coleta.paginas.items():
+        guardar_pagina(num_proposta, pagina, html)
+
+    resultado_pareceres = analisar_pareceres_lidos(coleta.html_pareceres)
+    resultado_requisitos = coleta.falha_requisitos or consolidar_requisitos(coleta.tabelas_requisitos)
+    data_pareceres = resultado_pareceres[4]
+    acao_falha = acao_de_falha(resultado_pareceres, resultado_requisitos)
+    resultado = resultado_falha(indice, num_proposta, acao_falha, causa=coleta.causa_falha or "erro_inesperado") \
+        if acao_falha else ResultadoProposta(
+            indice, num_proposta, acao=decidir_acao(data_pareceres, resultado_requisitos[0], resultado_requisitos[6]))
+    preencher_extracao(resultado, resultado_pareceres, resultado_requisitos)
+    if estado_propostas:
+        gravar_fatos(estado_propostas, resultado, resultado_requisitos, data_pareceres)
+    return resultado
+
+
+def processar_proposta(indice, num_proposta, situacional, driver, extrator_http=None, indice_propostas=None, estado_propostas=None):
+    """
+    Orquestra o processo de extração e análise para uma única proposta.
+
+    Args:
+        indice (int): O índice da linha da proposta no DataFrame.
+        num_proposta (str): O número da proposta a ser analisada.
+        situacional (str): O valor da coluna 'Situacional (Documentação)'.
+        driver (webdriver.Chrome): A instância do driver do Selenium.
+        extrator_http (ExtratorHTTP): Caminho rápido opcional; o Selenium é usado quando ele falha.
+        indice_propostas (IndicePropostas): Índice persistente de links para navegação direta.
+        estado_propostas (EstadoPropostas): Base de estado onde os fatos extraídos são gravados.
+
+    Returns:
+        ResultadoProposta: Os valores a gravar na linha da proposta.
+    """
+    coleta = coletar_proposta(indice, num_proposta, situacional, driver, extrator_http, indice_propostas)
+    return analisar_coleta(coleta, estado_propostas)
+
+
+def aplicar_resultado(df, resultado):
+    """Grava um único ResultadoProposta na linha correspondente do DataFrame."""
+    for coluna, valor in resultado.colunas().items():
+        if valor is not None:
+            df.at[resultado.indice, coluna] = valor
+    return df
+
+
+def preencher_linha(df, indice, driver, num_proposta, extrator_http=None, indice_propostas=None, estado_propostas=None):
+    """
+    Processa uma única proposta (linha do DataFrame) e grava o resultado na própria linha.
+
+    Args:
+        df (pd.DataFrame): O DataFrame principal.
+        indice (int): O índice da linha a ser processada.
+        Demais argumentos: os mesmos de processar_proposta.
+
+    Returns:
+        pd.DataFrame: O DataFrame atualizado com os resultados da linha.
+    """
+    situacional = df.at[indice, "Situacional (Documentação)"]
+    resultado = processar_proposta(indice, num_proposta, situacional, driver, extrator_http, indice_propostas, estado_propostas)
+    return aplicar_resultado(df, resultado)
+
+
+def ler_requisitos_direto(driver, num_proposta, indice_propostas, extrator_http=None):
+    """
+    Lê a aba 'Requisitos' de uma proposta pelo link gravado no índice, sem passar pela pesquisa.
+
+    Returns:
+        tuple: O retorno de consolidar_requisitos, ou None se o link não existir ou não levar à proposta.
+    """
+    entrada = indice_propostas.obter(num_proposta) if indice_propostas else None
+    if not entrada or not (url_requisitos := entrada.get("url_requisitos")):
+        return None
+
+    if extrator_http and (html := extrator_http.obter_html(url_requisitos)) and num_proposta in html:
+        try:
+            tabelas = extrair_tabelas_requisitos_html(html)
+            if tabelas.get("Histórico") is not None:
+                return consolidar_requisitos(tabelas)
+        except Exception as e:
+            print(f"[WARNING] HTML de requisitos inválido para {num_proposta}: {e}")
+
+    try:
+        driver.get(url_requisitos)
+        if esperar_condicao(driver, lambda d: d.find_elements(By.XPATH, XPATH_HISTORICO)
+                            and pagina_da_proposta(d, num_proposta), "link_direto"):
+            return consolidar_requisitos(extrair_tabelas_requisitos_driver(driver))
+    except Exception as e:
+        print(f"[WARNING] Falha ao abrir os requisitos da proposta {num_proposta} pelo link direto: {e}")
+    return None
+
+
+def ler_pareceres_direto(driver, num_proposta, indice_propostas, extrator_http=None):
+    """
+    Lê a página de Pareceres de uma proposta pelo link gravado no índice, sem passar pela pesquisa.
+
+    Returns:
+        tuple: O retorno de analisar_html_pareceres, ou None se o link não existir ou não levar à proposta.
+    """
+    entrada = indice_propostas.obter(num_proposta) if indice_propostas else None
+    if not entrada or not (url_pareceres := entrada.get("url_pareceres")):
+        return None
+
+    if extrator_http and (html := extrator_http.obter_html(url_pareceres)) and num_proposta in html \
+            and ("divPareceresProposta" in html or "divPareceresPlanoTrabalho" in html):
+        return analisar_html_pareceres(html)
+
+    try:
+        driver.get(url_pareceres)
+        if esperar_condicao(driver, lambda d: d.find_elements(By.CSS_SELECTOR, SELETOR_PARECERES)
+                            and pagina_da_proposta(d, num_proposta), "link_direto"):
+            return analisar_pareceres_lidos(ler_pareceres(driver))
+    except Exception as e:
+        print(f"[WARNING] Falha ao abrir os pareceres da proposta {num_proposta} pelo link direto: {e}")
+    return None
+
+
+def pareceres_inalterados(resultado_pareceres, fatos):
+    """Indica se os pareceres lidos agora são os mesmos dos fatos gravados (listas e data mais recente)."""
+    if not resultado_pareceres or resultado_pareceres[0] == "Erro ao verificar":
+        return False
+    data_pareceres = resultado_pareceres[4]
+    return (resultado_pareceres[1], resultado_pareceres[2], data_pareceres.isoformat() if data_pareceres else None) == \
+        (fatos["Lista Pareceres de Proposta"], fatos["Lista Pareceres do plano de Trabalho"], fatos["data_pareceres"])
+
+
+def coletar_proposta_incremental(indice, num_proposta, situacional, driver, extrator_http=None, indice_propostas=None, estado_propostas=None):
+    """
+    Versão incremental de coletar_proposta: confere a impressão digital da aba 'Requisitos' e, se ela
+    for igual à da última extração, relê os pareceres (um novo parecer técnico não altera os requisitos);
+    com os pareceres também iguais, reaproveita os fatos gravados em vez de refazer a extração completa.
+    Propostas novas, alteradas ou sem link conhecido seguem o fluxo completo.
+
+    Args:
+        Os mesmos de processar_proposta.
+
+    Returns:
+        ColetaProposta: O conteúdo a entregar a analisar_coleta (já com o resultado, se os fatos foram reaproveitados).
+    """
+    anterior = estado_propostas.obter(num_proposta) if estado_propostas else None
+
+    if anterior and not classificar_situacional(situacional.strip()):
+        resultado_requisitos = ler_requisitos_direto(driver, num_proposta, indice_propostas, extrator_http)
+        if resultado_requisitos and impressao_digital_requisitos(resultado_requisitos) == anterior["impressao"] \
+                and pareceres_inalterados(ler_pareceres_direto(driver, num_proposta, indice_propostas, extrator_http),
+                                          anterior["fatos"]):
+            fatos = anterior["fatos"]
+            data_pareceres = datetime.fromisoformat(fatos["data_pareceres"]) if fatos["data_pareceres"] else None
+            data_requisitos = datetime.fromisoformat(fatos["data_requisitos"]) if fatos["data_requisitos"] else None
+            resultado = ResultadoProposta(indice, num_proposta, acao=decidir_acao(
+                data_pareceres, data_requisitos, fatos["Histórico (Evento)"]))
+            for campo, coluna in CAMPOS_RESULTADO.items():
+                if coluna in COLUNAS_EXTRAIDAS:
+                    setattr(resultado, campo, fatos[coluna])
+            print(f"[INFO] Proposta {num_proposta} sem alterações desde {anterior['atualizado_em']}. Fatos reaproveitados.")
+            return ColetaProposta(indice, num_proposta, resultado=resultado)
+        print(f"[INFO] Proposta {num_proposta} alterada ou sem link direto. Extração completa.")
+
+    return coletar_proposta(indice, num_proposta, situacional, driver, extrator_http, indice_propostas)
+
+
+def processar_proposta_incremental(indice, num_proposta, situacional, driver, extrator_http=None, indice_propostas=None, estado_propostas=None):
+    """
+    Versão incremental de processar_proposta (ver coletar_proposta_incremental).
+
+    Args:
+        Os mesmos de processar_proposta.
+
+    Returns:
+        ResultadoProposta: Os valores a gravar na linha da proposta.
+    """
+    coleta = coletar_proposta_incremental(indice, num_proposta, situacional, driver,
+                                          extrator_http, indice_propostas, estado_propostas)
+    return analisar_coleta(coleta, estado_propostas)
+
+
+def benchmark_buffer_resultados(total_linhas=10000):
+    """
+    Compara, com linhas sintéticas, o preenchimento original (df.iterrows e uma escrita df.loc por
+    célula) com a coleta em ResultadoProposta + BufferResultados aplicada de uma só vez.
+
+    Args:
+        total_linhas (int): Quantidade de propostas sintéticas.
+    """
+    base = pd.DataFrame({coluna: [''] * total_linhas for coluna in COLUNAS_SAIDA})
+    base['Nº Proposta'] = [f"{numero:06d}/2025" for numero in range(total_linhas)]
+
+    def valores_sinteticos(numero):
+        return {campo: f"{campo}-{numero}" for campo in CAMPOS_RESULTADO}
+
+    df_legado = base.copy()
+    inicio = time.perf_counter()
+    for idx, linha in df_legado.iterrows():
+        for campo, valor in valores_sinteticos(idx).items():
+            df_legado.loc[idx, CAMPOS_RESULTADO[campo]] = valor
+    tempo_legado = time.perf_counter() - inicio
+
+    df_buffer = base.copy()
+    inicio = time.perf_counter()
+    buffer = BufferResultados()
+    for idx, num_proposta in zip(df_buffer.index, df_buffer['Nº Proposta']):
+        buffer.adicionar(ResultadoProposta(idx, num_proposta, **valores_sinteticos(idx)))
+    df_buffer = buffer.aplicar(df_buffer)
+    tempo_buffer = time.perf_counter() - inicio
+
+    print(f"[BENCH] {total_linhas} linhas | iterrows + df.loc: {tempo_legado:.2f}s | "
+          f"buffer colunar: {tempo_buffer:.3f}s | ganho: {tempo_legado / max(tempo_buffer, 1e-9):.0f}x | "
+          f"resultados idênticos: {'sim' if df_legado.equals(df_buffer) else 'NÃO'}")
+
+
+def registrar_desfecho(estado_propostas, resultado):
+    """Grava na base de estado a causa da falha da proposta, ou a apaga se a proposta foi concluída."""
+    if resultado.causa_falha:
+        estado_propostas.registrar_falha(resultado.num_proposta, resultado.causa_falha)
+    else:
+        estado_propostas.limpar_falha(resultado.num_proposta)
+
+
+def executar_proposta(processar, indice, num_proposta, situacional, driver, *apoio):
+    """
+    Executa processar (processar_proposta ou a versão incremental) dentro do span da proposta e
+    coleta a carga das páginas abertas para ela; em seguida, as abas da proposta são fechadas (ver
+    GerenciadorAbas). Quando a base de estado é informada (último item de
+    apoio), a causa da falha é gravada nela, ou apagada se a proposta foi concluída.
+
+    Returns:
+        tuple: (ResultadoProposta, carga das páginas ou None).
+    """
+    inicio = time.perf_counter()
+    with medir_etapa("proposta", num_proposta) as span:
+        resultado = processar(indice, num_proposta, situacional, driver, *apoio)
+        span["resultado"] = resultado.causa_falha or resultado.acao
+    if apoio and isinstance(estado_propostas := apoio[-1], EstadoPropostas):
+        registrar_desfecho(estado_propostas, resultado)
+    carga = coletar_carga_proposta(driver)
+    gerenciador_abas(driver).apos_proposta(time.perf_counter() - inicio)
+    return resultado, carga
+
+
+class PipelineAnalise:
+    """
+    Lado consumidor do pipeline de extração. Recebe as coletas do(s) navegador(es) e, em uma thread
+    própria, as analisa (analisar_coleta), grava o desfecho na base de estado e entrega o resultado a
+    'concluir' (diário e buffer), enquanto o navegador já carrega a proposta seguinte.
+
+    A fila tem no máximo 'limite' coletas: se a análise ficar para trás, enviar() bloqueia o navegador
+    até abrir uma vaga, de modo que o HTML pendente na memória não cresce. Com ativo=False a análise
+    roda dentro de enviar(), na thread do navegador, como no fluxo sequencial.
+    """
+
+    def __init__(self, concluir, estado_propostas=None, limite=None, ativo=None):
+        """
+        Args:
+            concluir (callable): Recebe cada ResultadoProposta analisado.
+            estado_propostas (EstadoPropostas): Base de estado dos fatos e das falhas (opcional).
+            limite (int): Tamanho máximo da fila (padrão: LIMITE_FILA_ANALISE).
+            ativo (bool): Analisar em uma thread à parte (padrão: PIPELINE_ANALISE).
+        """
+        self.concluir = concluir
+        self.estado_propostas = estado_propostas
+        self.ativo = PIPELINE_ANALISE if ativo is None else ativo
+        self.fila = queue.Queue(maxsize=limite or LIMITE_FILA_ANALISE)
+        self.analisadas = 0
+        self.falhas = 0
+        self.espera_navegador = 0.0
+        self.fila_maxima = 0
+        self._trava = threading.Lock()
+        self._thread = None
+        if self.ativo:
+            self._thread = threading.Thread(target=self._consumir, daemon=True)
+            self._thread.start()
+
+    def enviar(self, coleta):
+        """Entrega a coleta para análise; bloqueia enquanto a fila estiver cheia."""
+        if not self.ativo:
+            self._analisar(coleta)
+            return
+        inicio = time.perf_counter()
+        self.fila.put(coleta)
+        with self._trava:
+            self.espera_navegador += time.perf_counter() - inicio
+            self.fila_maxima = max(self.fila_maxima, self.fila.qsize())
+
+    def _consumir(self):
+        while (coleta := self.fila.get()) is not None:
+            self._analisar(coleta)
+
+    def _analisar(self, coleta):
+        try:
+            with medir_etapa("analise", coleta.num_proposta) as span:
+                resultado = analisar_coleta(coleta, self.estado_propostas)
+                span["resultado"] = resultado.causa_falha or resultado.acao
+            if self.estado_propostas:
+                registrar_desfecho(self.estado_propostas, resultado)
+            self.concluir(resultado)
+        except Exception as e:
+            # A proposta não vai para o diário e será tentada novamente na próxima execução
+            print(f"[ERROR] Falha inesperada na análise da proposta {coleta.num_proposta}: {e}")
+            with self._trava:
+                self.falhas += 1
+            return
+        with self._trava:
+            self.analisadas += 1
+
+    def encerrar(self):
+        """
+        Espera a análise das coletas ainda na fila e encerra a thread.
+
+        Returns:
+            int: Quantidade de propostas cuja análise falhou (ficaram fora do diário).
+        """
+        if self._thread is not None:
+            self.fila.put(None)
+            self._thread.join()
+            self._thread = None
+            print(f"[INFO] Pipeline de análise: {self.analisadas} propostas analisadas em paralelo à navegação | "
+                  f"navegador aguardou a análise por {self.espera_navegador:.1f}s | "
+                  f"fila máxima: {self.fila_maxima}/{self.fila.maxsize}.")
+        return self.falhas
+
+
+def executar_coleta(coletar, analise, indice, num_proposta, situacional, driver, *apoio):
+    """
+    Versão de executar_proposta para o pipeline: no span da proposta o navegador apenas coleta o
+    conteúdo (coletar_proposta ou a versão incremental); a coleta segue para a análise (PipelineAnalise)
+    depois que as abas da proposta são tratadas.
+
+    Returns:
+        dict: A carga das páginas abertas para a proposta, ou None.
+    """
+    inicio = time.perf_counter()
+    with medir_etapa("proposta", num_proposta) as span:
+        coleta = coletar(indice, num_proposta, situacional, driver, *apoio)
+        span["resultado"] = coleta.situacao()
+    carga = coletar_carga_proposta(driver)
+    gerenciador_abas(driver).apos_proposta(time.perf_counter() - inicio)
+    analise.enviar(coleta)
+    return carga
+
+
+def shard_da_proposta(num_proposta, total_shards):
+    """
+    Parte (1..total_shards) à qual a proposta pertence. Depende apenas do 'Nº Proposta' (CRC32),
+    então a divisão é a mesma em qualquer máquina, ordem de linhas ou filtro.
+    """
+    return zlib.crc32(str(num_proposta).strip().encode("utf-8")) % total_shards + 1
+
+
+def mascara_shard(numeros, shard):
+    """Máscara booleana das propostas (Series de 'Nº Proposta') que pertencem à parte shard=(i, N)."""
+    parte, total = shard
+    return numeros.map(lambda num: shard_da_proposta(num, total) == parte)
+
+
+def filtrar_propostas(df, filtro_instrumento, shard=None):
+    """
+    Aplica à planilha de entrada o filtro de instrumento e, se informado, o shard (i, N).
+
+    Returns:
+        pd.DataFrame: As linhas selecionadas, com índice renumerado.
+    """
+    if filtro_instrumento.lower() != 'todos':
+        df = df[df['Instrumento'].str.lower() == filtro_instrumento.lower()].reset_index(drop=True)
+        print(f"[INFO] Após filtro '{filtro_instrumento}': {len(df)} linhas para processar.")
+    if shard:
+        df = df[mascara_shard(df['Nº Proposta'], shard)].reset_index(drop=True)
+        print(f"[INFO] Shard {shard[0]}/{shard[1]}: {len(df)} linhas para processar.")
+    return df
+
+
+def prioridade_propostas(df, estado_propostas, pesos=None, regras=REGRAS_ACAO, agora=None):
+    """
+    Pontua cada linha da planilha pela chance de a proposta precisar de ação (ver PRIORIDADE_FILA),
+    com o situacional e o que a base de estado já sabe dela: se já foi extraída, a causa da última
+    falha, a ação que os fatos gravados dão pelas regras atuais e os dias desde o último evento do
+    Histórico ou documento (pareceres e requisitos). Não abre o navegador.
+
+    Returns:
+        pd.Series: A pontuação de cada linha (mesmo índice de df).
+    """
+    pesos = pesos or PRIORIDADE_FILA
+    agora = agora or datetime.now()
+    chaves = df['Nº Proposta'].astype(str).str.strip()
+
+    colunas_fatos = ["data_pareceres", "data_requisitos", "Histórico (Evento)", "Histórico (Data)"]
+    fatos = estado_propostas.fatos()
+    if fatos.empty:
+        fatos = pd.DataFrame(columns=["Nº Proposta"] + colunas_fatos)
+    fatos = fatos.drop_duplicates("Nº Proposta").set_index("Nº Proposta")
+    tabela = pd.DataFrame({coluna: chaves.map(fatos[coluna]) for coluna in colunas_fatos}, index=df.index)
+    extraidas = chaves.isin(fatos.index)
+
+    pontos = pd.Series(0.0, index=df.index)
+    pontos[~extraidas] += pesos["sem_extracao"]
+    causas = chaves.map({num: causa for num, (causa, _) in estado_propostas.falhas().items()})
+    pontos += causas.map(CAUSAS_FALHA).map(pesos["falha"]).fillna(0)
+    pontos += avaliar_acoes(tabela, regras).where(extraidas).map(pesos["acao_anterior"]).fillna(0)
+
+    ultima_atividade = pd.concat([
+        pd.to_datetime(tabela["data_pareceres"], errors='coerce'),
+        pd.to_datetime(tabela["data_requisitos"], errors='coerce'),
+        pd.to_datetime(tabela["Histórico (Data)"], format='%d/%m/%Y %H:%M:%S', errors='coerce'),
+    ], axis=1).max(axis=1)
+    dias = (agora - ultima_atividade).dt.total_seconds() / 86400
+    pontos += (pesos["atividade_recente"] * (1 - dias / pesos["janela_dias"]).clip(0, 1)).fillna(0)
+    pontos += df['Situacional (Documentação)'].astype(str).str.strip().map(pesos["situacional"]).fillna(0)
+    return pontos
+
+
+def ordenar_pendentes(df, pendentes, estado_propostas):
+    """
+    Ordem de processamento das linhas pendentes: por prioridade, se ORDENAR_POR_PRIORIDADE, ou a
+    ordem da planilha.
+
+    Returns:
+        tuple: (lista de índices das linhas pendentes, pd.Series com a pontuação ou None).
+    """
+    indices = [idx for idx, pendente in zip(df.index, pendentes) if pendente]
+    if not ORDENAR_POR_PRIORIDADE or len(indices) < 2:
+        return indices, None
+    pontos = prioridade_propostas(df, estado_propostas)
+    fila = pontos[indices].sort_values(ascending=False, kind="stable")
+    print(f"[INFO] Fila ordenada por prioridade: {len(fila)} propostas | pontuação de {fila.iloc[0]:.0f} a "
+          f"{fila.iloc[-1]:.0f} (mediana {fila.median():.0f}).")
+    return list(fila.index), pontos
+
+
+def ler_duracao(texto):
+    """Converte '90' ou '90m' (minutos), '2h' ou '1h30' na quantidade de minutos."""
+    casamento = re.fullmatch(r"\s*(?:(\d+(?:[.,]\d+)?)\s*h)?\s*(?:(\d+(?:[.,]\d+)?)\s*(?:m|min)?)?\s*", str(texto).lower())
+    if casamento and any(casamento.groups()):
+        horas, minutos = (float(valor.replace(",", ".")) if valor else 0.0 for valor in casamento.groups())
+        if horas * 60 + minutos > 0:
+            return horas * 60 + minutos
+    raise argparse.ArgumentTypeError(f"duração inválida: '{texto}' (ex: 90, 45m, 2h, 1h30)")
+
+
+class OrcamentoTempo:
+    """
+    Tempo máximo de uma execução, contado a partir da criação. Uma proposta só é iniciada se, pela
+    média das anteriores, ela termina dentro do limite; as demais ficam para a próxima execução.
+    """
+
+    def __init__(self, minutos=None):
+        self.minutos = minutos
+        self.fim = time.monotonic() + minutos * 60 if minutos else None
+
+    def esgotado(self, media_proposta=0.0):
+        return self.fim is not None and time.monotonic() + media_proposta > self.fim
+
+
+def motivo_interrupcao(orcamento):
+    """
+    Motivo da parada antecipada da execução: um seletor quebrado (ver RegistroSeletores) ou o tempo máximo.
+    Só faz sentido quando a execução parou antes do fim (há propostas adiadas).
+    """
+    if alvo := REGISTRO_SELETORES.quebrado:
+        return f"seletor '{alvo}' não encontrado em {REGISTRO_SELETORES.limite_falhas} propostas seguidas"
+    return f"tempo máximo de {orcamento.minutos:g} min atingido"
+
+
+def tratar_seletor_quebrado(estado_propostas):
+    """
+    Se um seletor quebrou na execução, as propostas da sequência de falhas dele ficam com a causa
+    'seletor_ausente' (transitória): sem o link da pesquisa, por exemplo, elas teriam sido dadas como não
+    encontradas e o reprocessamento as pularia.
+    """
+    if afetadas := [num for num in REGISTRO_SELETORES.propostas_afetadas() if num]:
+        estado_propostas.reclassificar_falhas(afetadas, "seletor_ausente")
+        print(f"[WARNING] {len(afetadas)} propostas falharam pelo seletor '{REGISTRO_SELETORES.quebrado}'. Depois de "
+              f"corrigi-lo, use o reprocessamento de falhas para elas.")
+
+
+def relatar_adiadas(paths, df, adiadas, pontos, motivo):
+    """
+    Informa as propostas que ficaram para a próxima execução (pelo motivo da interrupção, ver
+    motivo_interrupcao) e grava a lista, na ordem em que seriam processadas, em paths['adiadas']
+    (JSON). Sem propostas adiadas, a lista de uma execução anterior é apagada.
+    """
+    if not adiadas:
+        if os.path.exists(paths['adiadas']):
+            os.remove(paths['adiadas'])
+        return
+    lista = [{"Nº Proposta": str(df.at[idx, 'Nº Proposta']).strip(),
+              "prioridade": round(float(pontos[idx]), 1) if pontos is not None else None} for idx in adiadas]
+    print(f"[WARNING] Execução interrompida ({motivo}): {len(lista)} propostas adiadas para a "
+          f"próxima execução, que retoma pelo diário (lista em {paths['adiadas']}).")
+    for item in lista[:5]:
+        print(f"  {item['Nº Proposta']} (prioridade {item['prioridade']})")
+    try:
+        with open(paths['adiadas'], 'w', encoding='utf-8') as f:
+            json.dump({"gerado_em": datetime.now().isoformat(timespec="seconds"),
+                       "motivo": motivo, "adiadas": lista}, f, ensure_ascii=False, indent=2)
+    except IOError as e:
+        print(f"[WARNING] Não foi possível gravar a lista de propostas adiadas: {e}")
+
+
+def relatar_sessoes_expiradas(propostas):
+    """Avisa as propostas que falharam porque a sessão do portal expirou (a execução conta como falha)."""
+    if propostas:
+        print(f"[ERROR] A sessão do portal expirou durante a execução ({len(propostas)} propostas afetadas, "
+              f"a primeira {propostas[0]}). Faça login novamente e reexecute.")
+
+
+def rodar_processamento_completo(driver, paths, filtro_instrumento, incremental=False, shard=None, tempo_maximo=None):
+    """
+    Executa o script completo, lendo a planilha de entrada e processando as propostas filtradas.
+
+    Cada proposta concluída é gravada no diário de resultados; propostas já presentes no diário
+    (execução anterior interrompida) são puladas. A planilha de saída é gerada a partir do
+    diário ao final.
+
+    No modo incremental, propostas cuja aba 'Requisitos' não mudou desde a última extração
+    reaproveitam os fatos da base de estado (ver processar_proposta_incremental).
+
+    Com shard=(i, N), apenas a parte i de N das propostas é processada (ver shard_da_proposta).
+    A análise de cada proposta e as gravações rodam em paralelo à navegação (ver PipelineAnalise).
+
+    As propostas pendentes são processadas por ordem de prioridade (ver ordenar_pendentes). Com
+    tempo_maximo (minutos), a execução para antes da proposta que não terminaria no prazo: a planilha
+    de saída é gerada com as concluídas, o diário é mantido e as restantes são relatadas (ver relatar_adiadas).
+    O mesmo vale quando um seletor da navegação quebra (ver RegistroSeletores).
+
+    Returns:
+        bool: True se a execução terminou sem falhas da execução em si: entrada legível e com propostas
+              no filtro, nenhum seletor quebrado, nenhuma sessão expirada, nenhuma proposta perdida por
+              falha inesperada do navegador, nenhuma falha na análise e a planilha de saída gravada.
+              Parar por tempo_maximo não é falha (a próxima execução continua).
+    """
+    modo = "INCREMENTAL" if incremental else "PROCESSAMENTO COMPLETO"
+    print(f"\n--- MODO: {modo} | FILTRO: {filtro_instrumento} ---")
+    orcamento = OrcamentoTempo(tempo_maximo)
+    REGISTRO_SELETORES.reiniciar()
+
+    try:
+        df = ler_entrada_excel(paths['entrada'])
+    except Exception:
+        print("[ERROR] Encerrando script devido a erro na leitura do arquivo de entrada.")
+        return False
+
+    df = filtrar_propostas(df, filtro_instrumento, shard)
+
+    if df.empty:
+        print("[ERROR] Nenhuma proposta encontrada para o filtro especificado. Encerrando.")
+        return False
+
+    diario = DiarioResultados(paths['diario'])
+    concluidas = diario.propostas_registradas()
+    pendentes = [str(num).strip() not in concluidas for num in df['Nº Proposta']]
+    if concluidas:
+        print(f"[INFO] Retomando execução: {len(df) - sum(pendentes)} propostas já registradas no diário serão puladas.")
+    buffer = BufferResultados()
+    preclassificar_situacionais(df, pendentes, diario, buffer)
+    total_a_processar = sum(pendentes)
+
+    tempos = []
+    inicio_total = time.time()
+    estado_propostas = EstadoPropostas(paths['estado'])
+    ordem, pontos = ordenar_pendentes(df, pendentes, estado_propostas)
+    adiadas = []
+    indice_propostas = IndicePropostas(paths['indice'])
+    preparar_aba(driver)
+    extrator_http = criar_extrator_http(driver, indice_propostas)
+    abrir_cache_html(paths)
+    coletar = coletar_proposta_incremental if incremental else coletar_proposta
+    sessoes_expiradas = []
+    perdidas = []
+
+    def concluir(resultado):
+        buffer.adicionar(resultado)
+        diario.registrar(resultado)
+        if CAUSAS_FALHA.get(resultado.causa_falha) == "sessao":
+            sessoes_expiradas.append(resultado.num_proposta)
+
+    analise = PipelineAnalise(concluir, estado_propostas)
+    try:
+        for posicao, idx in enumerate(ordem):
+            if REGISTRO_SELETORES.quebrado or orcamento.esgotado(sum(tempos) / len(tempos) if tempos else 0.0):
+                adiadas = ordem[posicao:]
+                break
+
+            inicio_proposta = time.time()
+            num, situacional = df.at[idx, 'Nº Proposta'], df.at[idx, 'Situacional (Documentação)']
+            prioridade = f" | Prioridade: {pontos[idx]:.0f}" if pontos is not None else ""
+            print(f"\n[INFO] Processando proposta {posicao + 1}/{total_a_processar} | Nº: {num}{prioridade}")
+
+            num_proposta = str(num).strip()
+            if not num_proposta:
+                print("[WARNING] Nº da proposta não encontrado nesta linha. Pulando.")
+                continue
+
+            try:
+                carga = executar_coleta(coletar, analise, idx, num_proposta, situacional, driver,
+                                        extrator_http, indice_propostas, estado_propostas)
+            except Exception as e:
+                # A proposta não vai para o diário e será tentada novamente na próxima execução
+                print(f"[ERROR] Falha inesperada na proposta {num_proposta}: {e}")
+                perdidas.append(num_proposta)
+                continue
+
+            # Cálculo de tempo e estimativa
+            tempo_gasto = time.time() - inicio_proposta
+            tempos.append(tempo_gasto)
+            media_tempo = sum(tempos) / len(tempos)
+            restantes = total_a_processar - len(tempos)
+            estimado = (restantes * media_tempo) / 60
+            print(f"[TIMER] Tempo da proposta: {tempo_gasto:.2f}s | Média: {media_tempo:.2f}s | Estimativa restante: {estimado:.1f} min"
+                  f"{descrever_carga(carga)}")
+    finally:
+        # As coletas já feitas são analisadas e vão para o diário mesmo se a execução for interrompida
+        falhas_analise = analise.encerrar()
+
+    # O diário traz as propostas de execuções anteriores; o buffer, as desta execução
+    df = buffer.aplicar(diario.aplicar(df))
+    salvo = salvar_resultado(df, paths['saida'])
+    tratar_seletor_quebrado(estado_propostas)
+    estado_propostas.fechar()
+    fechar_cache_html()
+    tempo_total = (time.time() - inicio_total) / 60
+    situacao = f"interrompido ({motivo_interrupcao(orcamento)})" if adiadas else "concluído"
+    print(f"\n[SUCCESS] Processamento completo {situacao}! Tempo total: {tempo_total:.1f} min")
+    resumo_esperas()
+    resumo_chamadas_requisitos()
+    resumo_carga_paginas()
+    resumo_reciclagens()
+    finalizar_metricas(paths)
+    relatar_adiadas(paths, df, adiadas, pontos, motivo_interrupcao(orcamento) if adiadas else None)
+    if falhas_analise or perdidas:
+        print("[WARNING] Algumas propostas falharam; o diário foi mantido para a próxima execução retomar.")
+    elif not adiadas:
+        diario.arquivar()
+    relatar_sessoes_expiradas(sessoes_expiradas)
+    return salvo and not (perdidas or falhas_analise or REGISTRO_SELETORES.quebrado or sessoes_expiradas)
+
+
+def rodar_processamento_paralelo(drivers, paths, filtro_instrumento, shard=None, tempo_maximo=None):
+    """
+    Executa o processamento completo distribuindo as propostas entre vários navegadores.
+
+    Cada driver (um Chrome de depuração por porta) é atendido por uma thread que retira
+    índices de uma fila compartilhada. Os resultados vão para o diário e para um buffer
+    colunar compartilhado, aplicado ao DataFrame uma única vez ao final; a análise de todos os
+    navegadores fica com um único PipelineAnalise. Como a retomada é
+    feita pelo 'Nº Proposta' registrado no diário, a ordem de conclusão não importa. A fila segue a
+    ordem de prioridade; o tempo máximo e a parada por seletor quebrado valem como em rodar_processamento_completo.
+
+    Args:
+        drivers (list[webdriver.Chrome]): Drivers conectados, um por aba/porta de depuração.
+        paths (dict): Caminhos de entrada, saída, diário e demais arquivos de apoio.
+        filtro_instrumento (str): Tipo de instrumento a processar ou 'Todos'.
+        shard (tuple): (i, N) para processar apenas a parte i de N das propostas (ver shard_da_proposta).
+        tempo_maximo (float): Minutos disponíveis para a execução (None = sem limite).
+
+    Returns:
+        bool: Como em rodar_processamento_completo.
+    """
+    orcamento = OrcamentoTempo(tempo_maximo)
+    REGISTRO_SELETORES.reiniciar()
+    print(f"\n--- MODO: PROCESSAMENTO PARALELO ({len(drivers)} navegadores) | FILTRO: {filtro_instrumento} ---")
+
+    try:
+        df = ler_entrada_excel(paths['entrada'])
+    except Exception:
+        print("[ERROR] Encerrando script devido a erro na leitura do arquivo de entrada.")
+        return False
+
+    df = filtrar_propostas(df, filtro_instrumento, shard)
+
+    if df.empty:
+        print("[ERROR] Nenhuma proposta encontrada para o filtro especificado. Encerrando.")
+        return False
+
+    diario = DiarioResultados(paths['diario'])
+    concluidas = diario.propostas_registradas()
+    pendentes = [str(num).strip() not in concluidas for num in df['Nº Proposta']]
+    if concluidas:
+        print(f"[INFO] Retomando execução: {len(df) - sum(pendentes)} propostas já registradas no diário serão puladas.")
+    buffer = BufferResultados()
+    preclassificar_situacionais(df, pendentes, diario, buffer)
+    estado_propostas = EstadoPropostas(paths['estado'])
+    ordem, pontos = ordenar_pendentes(df, pendentes, estado_propostas)
+    fila = queue.Queue()
+    for idx in ordem:
+        fila.put(idx)
+
+    # Colunas lidas uma vez: as threads não tocam no DataFrame durante o processamento
+    numeros = [str(num).strip() for num in df['Nº Proposta']]
+    situacionais = list(df['Situacional (Documentação)'])
+    trava = threading.Lock()
+    estado = {'processadas': 0, 'tempo_propostas': 0.0}
+    total_propostas = len(df)
+    total_a_processar = fila.qsize()
+    inicio_total = time.time()
+    indice_propostas = IndicePropostas(paths['indice'])
+    abrir_cache_html(paths)
+    sessoes_expiradas = []
+
+    def concluir(resultado):
+        buffer.adicionar(resultado)
+        diario.registrar(resultado)
+        if CAUSAS_FALHA.get(resultado.causa_falha) == "sessao":
+            sessoes_expiradas.append(resultado.num_proposta)
+
+    analise = PipelineAnalise(concluir, estado_propostas)
+
+    def trabalhador(driver, numero):
+        preparar_aba(driver)
+        extrator_http = criar_extrator_http(driver, indice_propostas)
+        while True:
+            with trava:
+                media_proposta = estado['tempo_propostas'] / estado['processadas'] if estado['processadas'] else 0.0
+            if REGISTRO_SELETORES.quebrado or orcamento.esgotado(media_proposta):
+                return
+            try:
+                idx = fila.get_nowait()
+            except queue.Empty:
+                return
 
+            inicio_proposta = time.time()
+            num_proposta = numeros[idx]
+            print(f"\n[INFO] [Navegador {numero}] Processando proposta {idx + 1}/{total_propostas} | Nº: {num_proposta}")
 
-# ==============================================================================
-# Funções de Lógica de Negócio e Web Scraping
-# ==============================================================================
+            if not num_proposta:
+                print("[WARNING] Nº da proposta não encontrado nesta linha. Pulando.")
+                continue
+            try:
+                carga = executar_coleta(coletar_proposta, analise, idx, num_proposta, situacionais[idx], driver,
+                                        extrator_http, indice_propostas, estado_propostas)
+            except Exception as e:
+                # A proposta não vai para o diário e será tentada novamente na próxima execução
+                print(f"[ERROR] [Navegador {numero}] Falha inesperada na proposta {num_proposta}: {e}")
+                continue
+
+            with trava:
+                estado['processadas'] += 1
+
+                # Com vários navegadores a média útil é a vazão global, não o tempo de cada proposta
+                processadas = estado['processadas']
+                tempo_gasto = time.time() - inicio_proposta
+                estado['tempo_propostas'] += tempo_gasto
+                media_tempo = (time.time() - inicio_total) / processadas
+                restantes = total_a_processar - processadas
+                estimado = (restantes * media_tempo) / 60
+                print(f"[TIMER] [Navegador {numero}] Tempo da proposta: {tempo_gasto:.2f}s | Média efetiva: {media_tempo:.2f}s "
+                      f"| Concluídas: {processadas}/{total_a_processar} | Estimativa restante: {estimado:.1f} min"
+                      f"{descrever_carga(carga)}")
+
+    threads = [
+        threading.Thread(target=trabalhador, args=(driver, numero), daemon=True)
+        for numero, driver in enumerate(drivers, start=1)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    falhas_analise = analise.encerrar()
+    adiadas = []
+    while not fila.empty():
+        adiadas.append(fila.get_nowait())
 
-def navegar_menu_principal(driver, num_proposta):
+    df = buffer.aplicar(diario.aplicar(df))
+    salvo = salvar_resultado(df, paths['saida'])
+    tratar_seletor_quebrado(estado_propostas)
+    estado_propostas.fechar()
+    fechar_cache_html()
+    tempo_total = (time.time() - inicio_total) / 60
+    situacao = f"interrompido ({motivo_interrupcao(orcamento)})" if adiadas else "concluído"
+    print(f"\n[SUCCESS] Processamento paralelo {situacao}! Tempo total: {tempo_total:.1f} min")
+    resumo_esperas()
+    resumo_chamadas_requisitos()
+    resumo_carga_paginas()
+    resumo_reciclagens()
+    finalizar_metricas(paths)
+    relatar_adiadas(paths, df, adiadas, pontos, motivo_interrupcao(orcamento) if adiadas else None)
+
+    perdidas = estado['processadas'] + len(adiadas) < total_a_processar
+    if estado['processadas'] == total_a_processar and not falhas_analise:
+        diario.arquivar()
+    elif perdidas or falhas_analise:
+        print("[WARNING] Algumas propostas falharam; o diário foi mantido para a próxima execução retomar.")
+    relatar_sessoes_expiradas(sessoes_expiradas)
+    return salvo and not (perdidas or falhas_analise or REGISTRO_SELETORES.quebrado or sessoes_expiradas)
+
+
+def reprocessar_falhas(driver, paths, filtro_instrumento, shard=None):
     """
-    Navega através do menu do Transferegov para encontrar e abrir uma proposta específica.
+    Verifica a planilha de saída, encontra linhas com falhas e as reprocessa.
 
-    Args:
-        driver (webdriver.Chrome): A instância do driver do Selenium.
-        num_proposta (str): O número da proposta a ser pesquisada.
+    São consideradas falhas as linhas sem 'Ação Necessária (Automação)', com uma das ações de
+    ACOES_FALHA ou com alguma coluna extraída começando por "Erro". Propostas cuja última falha tem
+    causa permanente (ver CAUSAS_FALHA) são puladas. Falhas transitórias voltam para a fila na mesma
+    execução, com espera exponencial, até TENTATIVAS_MAXIMAS tentativas seguidas, contadas também nas
+    execuções anteriores (tabela 'falhas' da base de estado); uma sessão expirada ou um seletor quebrado
+    (ver RegistroSeletores) interrompe a passada. Com shard=(i, N), apenas as falhas da parte i de N são
+    reprocessadas.
+
+    Os resultados vão para o diário de resultados à medida que cada proposta termina;
+    a planilha de saída é regravada uma única vez, ao final.
 
     Returns:
-        bool: True se a navegação até a página de pareceres for bem-sucedida, False caso contrário.
+        bool: False se a planilha de saída não existir ou não puder ser gravada, ou se a passada foi
+              interrompida por sessão expirada ou seletor quebrado.
     """
-    try:
-        print(f"[INFO] Navegando para a proposta: {num_proposta}")
-        driver.get("https://discricionarias.transferegov.sistema.gov.br/voluntarias/Principal/Principal.do")
-        time.sleep(2)  # Aguarda estática para carregamento inicial da página.
+    print(f"\n--- MODO: REPROCESSAMENTO DE FALHAS | FILTRO: {filtro_instrumento} ---")
+    REGISTRO_SELETORES.reiniciar()
 
-        # Sequência de cliques para navegar pelos menus
-        if not (elemento_menu := esperar_elemento(driver, "/html/body/div[1]/div[3]/div[1]/div[1]/div[1]/div[3]", tempo=5)):
-            print("[WARNING] Elemento do menu principal não encontrado.")
-            return False
-        elemento_menu.click()
+    if not os.path.exists(paths['saida']):
+        print(f"[ERROR] Arquivo de saída '{paths['saida']}' não encontrado. Execute o processamento completo primeiro.")
+        return False
 
-        if not (elemento_submenu := esperar_elemento(driver, "/html/body/div[1]/div[3]/div[2]/div[1]/div[1]/ul/li[3]/a", tempo=5)):
-            print("[WARNING] Elemento do submenu não encontrado.")
-            return False
-        elemento_submenu.click()
-        time.sleep(2)
+    # Um reprocessamento interrompido deixa resultados no diário que ainda não estão na planilha
+    diario = DiarioResultados(paths['diario'])
+    df = pd.read_excel(paths['saida'], dtype=str).fillna('')
+    linhas_do_diario = df['Nº Proposta'].astype(str).str.strip().isin(diario.propostas_registradas())
+    df = diario.aplicar(df)
 
-        # Pesquisa pela proposta
-        if not (campo_pesquisa := esperar_elemento(driver, "/html/body/div[3]/div[15]/div[3]/div/div/form/table/tbody/tr[1]/td[2]/input", tempo=5)):
-            print("[WARNING] Campo de pesquisa não encontrado.")
-            return False
-        campo_pesquisa.clear()
-        campo_pesquisa.send_keys(num_proposta)
+    df_filtrado = df
+    if filtro_instrumento.lower() != 'todos':
+        df_filtrado = df[df['Instrumento'].str.lower() == filtro_instrumento.lower()]
+    if shard:
+        df_filtrado = df_filtrado[mascara_shard(df_filtrado['Nº Proposta'], shard)]
 
-        if not (botao_pesquisar := esperar_elemento(driver, "/html/body/div[3]/div[15]/div[3]/div/div/form/table/tbody/tr[1]/td[2]/span/input")):
-            print("[WARNING] Botão de pesquisa não encontrado.")
-            return False
-        botao_pesquisar.click()
-        time.sleep(2)
+    # Identifica falhas: ação vazia ou de erro, ou alguma coluna extraída marcada com "Erro"
+    acoes = df_filtrado['Ação Necessária (Automação)'].str.strip()
+    com_erro = df_filtrado[COLUNAS_EXTRAIDAS].apply(lambda coluna: coluna.str.startswith('Erro')).any(axis=1)
+    com_falha = (acoes == '') | acoes.isin(ACOES_FALHA) | com_erro
 
-        # Abre a proposta encontrada e muda o foco para a nova aba
-        if not (link_proposta := esperar_elemento(driver, "/html/body/div[3]/div[15]/div[3]/div[3]/table/tbody/tr/td[1]/div/a", tempo=3)):
-            print(f"[WARNING] Proposta '{num_proposta}' não encontrada na lista de resultados.")
-            return False
-        link_proposta.click()
-        time.sleep(2)
+    estado_propostas = EstadoPropostas(paths['estado'])
+    abrir_cache_html(paths)
+    falhas_gravadas = estado_propostas.falhas()
+    numeros = df_filtrado['Nº Proposta'].astype(str).str.strip()
+    tipos = numeros.map(lambda num: CAUSAS_FALHA.get(falhas_gravadas.get(num, (None, 0))[0]))
+    permanentes = tipos == "permanente"
+    # As tentativas gravadas somam as execuções anteriores: o limite vale entre execuções
+    esgotadas = (tipos == "transitoria") & (numeros.map(lambda num: falhas_gravadas.get(num, (None, 0))[1])
+                                            >= TENTATIVAS_MAXIMAS)
+    if (puladas := int((com_falha & permanentes).sum())):
+        print(f"[INFO] {puladas} propostas com falha permanente (proposta não encontrada) serão puladas.")
+    if (puladas := int((com_falha & esgotadas).sum())):
+        print(f"[INFO] {puladas} propostas já falharam {TENTATIVAS_MAXIMAS} vezes seguidas e serão puladas "
+              f"(voltam a ser tentadas no próximo processamento completo).")
+    indices_para_reprocessar = df_filtrado[com_falha & ~permanentes & ~esgotadas].index
 
-        if len(driver.window_handles) > 1:
-            driver.switch_to.window(driver.window_handles[-1])
+    if indices_para_reprocessar.empty:
+        print("[SUCCESS] Nenhuma falha a reprocessar para o filtro especificado.")
+        estado_propostas.fechar()
+        fechar_cache_html()
+        if linhas_do_diario.any():
+            if not salvar_resultado(df, paths['saida'], list(df.index[linhas_do_diario])):
+                return False
+            diario.arquivar()
+        return True
 
-        # Navega para a aba de pareceres
-        if not (plano_trabalho := esperar_elemento(driver, "//*[@id='div_997366806']/span/span", tempo=10)):
-            print("[WARNING] Aba 'Plano de Trabalho' não encontrada.")
-            return False
-        plano_trabalho.click()
-        time.sleep(1)
+    total_falhas = len(indices_para_reprocessar)
+    print(f"[INFO] {total_falhas} propostas com falha encontradas. Iniciando reprocessamento...")
+    indice_propostas = IndicePropostas(paths['indice'])
+    preparar_aba(driver)
+    extrator_http = criar_extrator_http(driver, indice_propostas)
+    buffer = BufferResultados()
+    falhas = df.loc[indices_para_reprocessar, ['Nº Proposta', 'Situacional (Documentação)']]
 
-        if not (subaba_pareceres := esperar_elemento(driver, "/html/body/div[3]/div[15]/div[1]/div/div[2]/a[10]/div/span/span", tempo=10)):
-            print("[WARNING] Sub-aba 'Pareceres' não encontrada.")
-            return False
-        subaba_pareceres.click()
-        time.sleep(2)
+    # Fila ordenada pelo instante em que cada proposta pode ser tentada; novas tentativas entram
+    # com espera exponencial e as demais propostas seguem sendo processadas enquanto isso.
+    fila = [(0.0, ordem, idx, str(num).strip(), situacional)
+            for ordem, (idx, num, situacional) in enumerate(falhas.itertuples(name=None))]
+    heapq.heapify(fila)
+    tentativas = defaultdict(int, {num: total for num, (_, total) in falhas_gravadas.items()})
+    causas_finais = {}
+    interrompida = False
 
-        print("[SUCCESS] Navegação até a página de pareceres concluída.")
-        return True
-    except Exception as e:
-        print(f"[ERROR] Ocorreu um erro inesperado durante a navegação: {e}")
-        return False
+    while fila:
+        pronto_em, ordem, idx, num_proposta, situacional = heapq.heappop(fila)
+        if not num_proposta:
+            print("[WARNING] Nº da proposta não encontrado. Pulando.")
+            continue
+        if (espera := pronto_em - time.monotonic()) > 0:
+            print(f"[INFO] Aguardando {espera:.0f}s para tentar novamente a proposta {num_proposta}...")
+            time.sleep(espera)
 
+        tentativas[num_proposta] += 1
+        print(f"\n[INFO] Reprocessando falha {ordem + 1}/{total_falhas} | Linha do Excel: {idx + 2} "
+              f"| Tentativa {tentativas[num_proposta]}/{TENTATIVAS_MAXIMAS}")
+        resultado, carga = executar_proposta(processar_proposta, idx, num_proposta, situacional, driver,
+                                             extrator_http, indice_propostas, estado_propostas)
+        print(f"[TIMER] Proposta {num_proposta} reprocessada{descrever_carga(carga)}")
+        buffer.adicionar(resultado)
+        diario.registrar(resultado)
+        causas_finais[num_proposta] = resultado.causa_falha
 
-def verificar_pareceres(driver):
-    """
-    Extrai as datas dos pareceres da proposta e do plano de trabalho,
-    considerando apenas os técnicos listados em NOMES_TECNICOS.
+        tipo = CAUSAS_FALHA.get(resultado.causa_falha)
+        if tipo == "sessao":
+            print("[ERROR] A sessão do portal expirou. Faça login novamente e reexecute o reprocessamento.")
+            interrompida = True
+            break
+        if REGISTRO_SELETORES.quebrado:
+            interrompida = True
+            break
+        if tipo == "transitoria" and tentativas[num_proposta] < TENTATIVAS_MAXIMAS:
+            espera = min(ESPERA_BASE_RETENTATIVA * 2 ** (tentativas[num_proposta] - 1), ESPERA_MAXIMA_RETENTATIVA)
+            heapq.heappush(fila, (time.monotonic() + espera, ordem, idx, num_proposta, situacional))
 
-    Args:
-        driver (webdriver.Chrome): A instância do driver do Selenium.
+    df = buffer.aplicar(df)
+    salvo = salvar_resultado(df, paths['saida'], list(df.index[linhas_do_diario]) + buffer.indices())
+    tratar_seletor_quebrado(estado_propostas)
+    estado_propostas.fechar()
+    fechar_cache_html()
 
-    Returns:
-        tuple: Contém (ação, data_proposta, data_plano, data_ajuste, data_mais_recente_geral).
-               Retorna strings de erro em caso de falha.
+    resumo = defaultdict(int)
+    for causa in causas_finais.values():
+        resumo[causa or "resolvida"] += 1
+    print("\n[SUCCESS] Reprocessamento de falhas concluído! "
+          + " | ".join(f"{causa}: {total}" for causa, total in sorted(resumo.items())))
+    resumo_esperas()
+    resumo_chamadas_requisitos()
+    resumo_carga_paginas()
+    resumo_reciclagens()
+    finalizar_metricas(paths)
+    if salvo:
+        diario.arquivar()
+    return salvo and not interrompida
+
+
+def reavaliar_acoes(paths, regras=REGRAS_ACAO):
     """
-    try:
-        print("[INFO] Iniciando verificação de pareceres...")
-        html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        proposta_data = ""
-        plano_data = ""
-        datas_pareceres_validas = []
+    Recalcula a 'Ação Necessária (Automação)' da planilha de saída inteira com a tabela de regras
+    informada, sem abrir o navegador: usa o situacional da própria planilha e os fatos gravados na
+    base de estado. Linhas sem fatos gravados (e sem ação pelo situacional) ficam como estão.
+    Apenas as linhas cuja ação mudou são regravadas. Retorna False se a planilha de saída não
+    existir ou não puder ser gravada.
+    """
+    print(f"\n--- MODO: REAVALIAR AÇÕES | REGRAS v{regras['versao']} ---")
+    if not os.path.exists(paths['saida']):
+        print(f"[ERROR] Arquivo de saída '{paths['saida']}' não encontrado. Execute o processamento completo primeiro.")
+        return False
 
-        # --- Extração de Pareceres da Proposta ---
-        try:
-            tabela_proposta = soup.find("div", {"id": "divPareceresProposta"})
-            if tabela_proposta:
-                linhas = tabela_proposta.find("tbody").find_all("tr")
-                for linha in linhas:
-                    celulas = linha.find_all("td")
-                    if len(celulas) >= 3:
-                        data_texto = celulas[0].text.strip()
-                        responsavel = celulas[2].text.strip()
-                        
-                        if any(nome.lower() in responsavel.lower() for nome in NOMES_TECNICOS):
-                            data_obj, data_formatada = extrair_data(data_texto)
-                            if data_obj:
-                                datas_pareceres_validas.append(data_obj)
-                                print(f"  [PARECER PROPOSTA] Data encontrada: {data_formatada} (Responsável: {responsavel})")
-        except Exception as e:
-            print(f"[WARNING] Não foi possível extrair dados de pareceres da proposta: {e}")
+    inicio = time.perf_counter()
+    df = pd.read_excel(paths['saida'], dtype=str).fillna('')
+    estado_propostas = EstadoPropostas(paths['estado'])
+    fatos = estado_propostas.fatos()
+    estado_propostas.fechar()
 
-        # --- Extração de Pareceres do Plano de Trabalho ---
-        try:
-            tabela_plano = soup.find("div", {"id": "divPareceresPlanoTrabalho"})
-            if tabela_plano:
-                linhas = tabela_plano.find("tbody").find_all("tr")
-                for linha in linhas:
-                    celulas = linha.find_all("td")
-                    if len(celulas) >= 3:
-                        data_texto = celulas[0].text.strip()
-                        responsavel = celulas[2].text.strip()
-                        
-                        if any(nome.lower() in responsavel.lower() for nome in NOMES_TECNICOS):
-                            data_obj, data_formatada = extrair_data(data_texto)
-                            if data_obj:
-                                datas_pareceres_validas.append(data_obj)
-                                print(f"  [PARECER PLANO] Data encontrada: {data_formatada} (Responsável: {responsavel})")
-        except Exception as e:
-            print(f"[WARNING] Não foi possível extrair dados de pareceres do plano de trabalho: {e}")
+    chaves = df['Nº Proposta'].astype(str).str.strip()
+    tabela = pd.DataFrame({"Situacional (Documentação)": df['Situacional (Documentação)']}, index=df.index)
+    colunas_fatos = ["data_pareceres", "data_requisitos", "Histórico (Evento)"]
+    if fatos.empty:
+        fatos = pd.DataFrame(columns=["Nº Proposta"] + colunas_fatos)
+    fatos = fatos.drop_duplicates("Nº Proposta").set_index("Nº Proposta")
+    for coluna in colunas_fatos:
+        tabela[coluna] = chaves.map(fatos[coluna])
 
-        # Determina a data mais recente entre todos os pareceres válidos
-        data_mais_recente_obj = None
-        if datas_pareceres_validas:
-            data_mais_recente_obj = max(datas_pareceres_validas)
-            proposta_data = data_mais_recente_obj.strftime('%d/%m/%Y %H:%M:%S')
-            print(f"[INFO] Data mais recente de parecer (Proposta/Plano): {proposta_data}")
+    novas = avaliar_acoes(tabela, regras)
+    avaliaveis = chaves.isin(fatos.index) | avaliar_situacional(df['Situacional (Documentação)'], regras).notna()
+    alteradas = avaliaveis & (novas != df['Ação Necessária (Automação)'])
+    df.loc[alteradas, 'Ação Necessária (Automação)'] = novas[alteradas]
+    print(f"[INFO] {avaliaveis.sum()} propostas reavaliadas em {time.perf_counter() - inicio:.2f}s; "
+          f"{alteradas.sum()} com ação alterada.")
+    if alteradas.any():
+        return salvar_resultado(df, paths['saida'], list(df.index[alteradas]))
+    return True
 
-        proposta_str = proposta_data if proposta_data else "Nenhum parecer localizado"
-        
-        # O campo 'plano_str' e 'ajuste_str' podem ser preenchidos se necessário,
-        # mas a lógica atual consolida tudo em 'proposta_str'
-        plano_str = "Nenhum parecer localizado" 
-        ajuste_str = "Nenhum parecer localizado"
 
-        return "Ação a Definir", proposta_str, plano_str, ajuste_str, data_mais_recente_obj
+def _reavaliar_paginas(tarefa):
+    """
+    Refaz a leitura e a decisão de uma proposta a partir das páginas guardadas no cache.
+    Roda nos processos de reavaliar_cache.
 
-    except Exception as e:
-        print(f"[ERROR] Falha crítica ao verificar pareceres: {e}")
-        return "Erro ao verificar", "Erro ao extrair", "Erro ao extrair", "Erro ao extrair", None
+    Returns:
+        tuple: (ResultadoProposta, retorno de consolidar_requisitos, data do parecer mais recente).
+    """
+    indice, num_proposta, caminho_pareceres, caminho_requisitos, regras = tarefa
+    with redirect_stdout(StringIO()):
+        with gzip.open(caminho_pareceres, 'rt', encoding='utf-8') as f:
+            resultado_pareceres = analisar_html_pareceres(f.read())
+        with gzip.open(caminho_requisitos, 'rt', encoding='utf-8') as f:
+            resultado_requisitos = consolidar_requisitos(extrair_tabelas_requisitos_html(f.read()))
+        data_pareceres = resultado_pareceres[4]
+        acao = acao_de_falha(resultado_pareceres, resultado_requisitos) or decidir_acao(
+            data_pareceres, resultado_requisitos[0], resultado_requisitos[6], regras)
+    resultado = preencher_extracao(ResultadoProposta(indice, num_proposta, acao=acao), resultado_pareceres, resultado_requisitos)
+    return resultado, resultado_requisitos, data_pareceres
 
 
-def verificar_requisitos(driver):
+def reavaliar_cache(paths, regras=REGRAS_ACAO, processos=None):
     """
-    Navega para a aba de 'Requisitos', extrai as datas de envio de documentos
-    e o status do histórico mais recente.
+    Modo offline: refaz a leitura das páginas de Pareceres e Requisitos e a decisão da ação de toda a
+    planilha de saída a partir do cache de páginas (ver CacheHTML), sem abrir o navegador. Serve para
+    aplicar mudanças nas regras, nos técnicos ou nas palavras ignoradas. As propostas são distribuídas
+    entre processos; propostas sem as duas páginas no cache ficam como estão.
 
     Args:
-        driver (webdriver.Chrome): A instância do driver do Selenium.
+        paths (dict): Caminhos da execução (saída, estado e cache de páginas).
+        regras (dict): Tabela de regras da ação (padrão: REGRAS_ACAO).
+        processos (int): Quantidade de processos (padrão: núcleos da máquina, até 8).
 
     Returns:
-        tuple: Contém os dados extraídos (certidoes, declaracoes, etc.) e a ação derivada.
-               Retorna strings de erro em caso de falha.
+        bool: False se a planilha de saída ou o cache não existirem, ou se a planilha não puder ser gravada.
     """
-    try:
-        print("[INFO] Iniciando verificação de requisitos...")
-        
-        # --- Navegação para a aba e sub-aba de Requisitos ---
-        if not (requisitos_menu := esperar_elemento(driver, "/html/body/div[3]/div[15]/div[1]/div/div[1]/a[3]/div/span/span", tempo=10)):
-            print("[ERROR] Não foi possível acessar a aba 'Requisitos'.")
-            return "Erro de Navegação", "", "", "", "", "", ""
-        requisitos_menu.click()
-        time.sleep(1)
-
-        if not (subaba_requisitos := esperar_elemento_JSPATH(driver, "a[id='menu_link_2144784112_100344749'] div[class='inactiveTab'] span span", tempo=10)):
-            print("[ERROR] Não foi possível acessar a sub-aba 'Requisitos'.")
-            return "Erro de Navegação", "", "", "", "", "", ""
-        subaba_requisitos.click()
-        time.sleep(2)
-
-        # --- Lógica de Extração de Datas dos Documentos ---
-        palavras_ignorar = [
-            "atestado", "capacidade", "técnica", "projeto", "técnico", 
-            "pedagógico", "ptp", "plano", "trabalho", "planilha", "custos"
-        ]
+    print(f"\n--- MODO: REAVALIAR A PARTIR DO CACHE DE PÁGINAS | REGRAS v{regras['versao']} ---")
+    if not os.path.exists(paths['saida']):
+        print(f"[ERROR] Arquivo de saída '{paths['saida']}' não encontrado. Execute o processamento completo primeiro.")
+        return False
+    if not os.path.isdir(paths['cache_html']):
+        print(f"[ERROR] Cache de páginas '{paths['cache_html']}' não encontrado. Ative USAR_CACHE_HTML e processe as propostas.")
+        return False
 
-        def extrair_data_valida_categoria(xpath_tabela, categoria_nome):
-            """Função aninhada para extrair a data mais recente de uma tabela de documentos."""
-            try:
-                linhas = driver.find_elements(By.XPATH, xpath_tabela + "/tbody/tr")
-                datas_validas = []
-                for linha in linhas:
-                    tds = linha.find_elements(By.TAG_NAME, "td")
-                    if len(tds) >= 2:
-                        nome_arquivo = tds[0].text.strip().lower()
-                        data_arquivo_str = tds[1].text.strip()
-                        
-                        # Ignora documentos que não são de conformidade (ex: planos de trabalho)
-                        if not any(palavra in nome_arquivo for palavra in palavras_ignorar):
-                            if (data_dt := extrair_data(data_arquivo_str)[0]):
-                                datas_validas.append(data_dt)
-
-                if datas_validas:
-                    data_recente = max(datas_validas)
-                    data_formatada = data_recente.strftime('%d/%m/%Y %H:%M:%S')
-                    print(f"  [{categoria_nome}] Data mais recente encontrada: {data_formatada}")
-                    return data_recente, data_formatada
-                return None, f"Nenhum(a) {categoria_nome.lower()} localizado(a)"
-            except Exception:
-                return None, f"Erro ao extrair {categoria_nome.lower()}"
-
-        # Extrai data para cada categoria de documento
-        data_certidoes_obj, certidoes_str = extrair_data_valida_categoria(
-            "/html/body/div[3]/div[16]/div[2]/div[2]/form/div[1]/div[1]/table", "Certidões")
-        data_declaracoes_obj, declaracoes_str = extrair_data_valida_categoria(
-            "/html/body/div[3]/div[16]/div[2]/div[2]/form/div[1]/div[2]/table", "Declarações")
-        data_comprovantes_obj, comprovantes_str = extrair_data_valida_categoria(
-            "/html/body/div[3]/div[16]/div[2]/div[2]/form/div[1]/div[3]/table", "Comprovantes de Execução")
-        data_outros_obj, outros_str = extrair_data_valida_categoria(
-            "/html/body/div[3]/div[16]/div[2]/div[2]/form/div[1]/div[4]/table", "Outros")
-
-        # --- Extração do Histórico ---
-        historico_data = ""
-        historico_evento = ""
-        try:
-            historico_evento = driver.find_element(By.XPATH, "/html/body/div[3]/div[16]/div[2]/div[2]/form/div[1]/div[5]/table/tbody/tr[1]/td[1]").text.strip()
-            historico_data_str = driver.find_element(By.XPATH, "/html/body/div[3]/div[16]/div[2]/div[2]/form/div[1]/div[5]/table/tbody/tr[1]/td[3]").text.strip()
-            _, historico_data = extrair_data(historico_data_str)
-            print(f"  [HISTÓRICO] Evento: '{historico_evento}', Data: {historico_data}")
-        except Exception:
-            print("[WARNING] Não foi possível extrair dados do histórico.")
-        
-        # Consolida todas as datas de requisitos para encontrar a mais recente
-        datas_requisitos_validas = [d for d in [data_certidoes_obj, data_declaracoes_obj, data_comprovantes_obj, data_outros_obj] if d]
-        data_mais_recente_requisitos = max(datas_requisitos_validas) if datas_requisitos_validas else None
-        
-        return data_mais_recente_requisitos, certidoes_str, declaracoes_str, comprovantes_str, outros_str, historico_data, historico_evento
+    inicio = time.perf_counter()
+    df = pd.read_excel(paths['saida'], dtype=str).fillna('')
+    cache = CacheHTML(paths['cache_html'])
+    ultimas = cache.ultimas()
+    cache.fechar()
 
-    except Exception as e:
-        print(f"[ERROR] Falha crítica ao verificar requisitos: {e}")
-        return None, "Erro", "Erro", "Erro", "Erro", "Erro", "Erro"
+    buffer = BufferResultados()
+    tarefas = []
+    chaves = df['Nº Proposta'].astype(str).str.strip()
+    for idx, num_proposta, acao_situacional in zip(df.index, chaves, avaliar_situacional(df['Situacional (Documentação)'], regras)):
+        paginas = ultimas.get(num_proposta, {})
+        if acao_situacional:
+            buffer.adicionar(resultado_situacional(idx, num_proposta, acao_situacional))
+        elif "pareceres" in paginas and "requisitos" in paginas:
+            tarefas.append((idx, num_proposta, paginas["pareceres"], paginas["requisitos"], regras))
+    sem_cache = len(df) - len(buffer) - len(tarefas)
 
-# ==============================================================================
-# Funções de Gerenciamento de Arquivos e Processamento em Lote
-# ==============================================================================
+    processos = processos or min(os.cpu_count() or 1, 8)
+    if processos == 1 or len(tarefas) < 50:
+        processos, resultados = 1, map(_reavaliar_paginas, tarefas)
+    else:
+        # Os processos novos não herdam ARQUIVO_TERMOS no Windows: os termos são recarregados em cada um.
+        executor = ProcessPoolExecutor(max_workers=processos, initializer=configurar_termos, initargs=(ARQUIVO_TERMOS,))
+        resultados = executor.map(_reavaliar_paginas, tarefas, chunksize=max(1, len(tarefas) // (processos * 4)))
 
-def ler_checkpoint(caminho):
-    """Lê o último índice processado de um arquivo de checkpoint."""
-    if os.path.exists(caminho):
-        try:
-            with open(caminho, 'r') as f:
-                return json.load(f).get('ultimo_indice', 0)
-        except (json.JSONDecodeError, IOError):
-            return 0
-    return 0
+    estado_propostas = EstadoPropostas(paths['estado'])
+    try:
+        for resultado, resultado_requisitos, data_pareceres in resultados:
+            buffer.adicionar(resultado)
+            gravar_fatos(estado_propostas, resultado, resultado_requisitos, data_pareceres)
+    finally:
+        estado_propostas.fechar()
+        if processos > 1:
+            executor.shutdown()
 
+    acoes_antes = df['Ação Necessária (Automação)'].copy()
+    df = buffer.aplicar(df)
+    alteradas = int((df['Ação Necessária (Automação)'] != acoes_antes).sum())
+    print(f"[INFO] {len(buffer)} propostas reavaliadas em {time.perf_counter() - inicio:.2f}s "
+          f"({len(tarefas)} a partir do cache, {processos} processo(s)); {alteradas} com ação alterada; "
+          f"{sem_cache} sem páginas no cache.")
+    if len(buffer):
+        return salvar_resultado(df, paths['saida'], buffer.indices())
+    return True
 
-def salvar_checkpoint(caminho, indice):
-    """Salva o índice da próxima proposta a ser processada."""
-    try:
-        with open(caminho, 'w') as f:
-            json.dump({'ultimo_indice': indice}, f)
-        print(f"[INFO] Checkpoint salvo. Próximo início no índice {indice}.")
-    except IOError:
-        print("[WARNING] Não foi possível salvar o checkpoint.")
 
+def gerar_planilha_do_diario(paths):
+    """
+    Gera a planilha de saída sob demanda a partir do diário de resultados, sem processar propostas.
 
-def salvar_resultado(df, caminho_saida):
-    """Salva o DataFrame final em um arquivo Excel."""
+    A base é a planilha de saída existente (ou, se ainda não houver, a planilha de entrada),
+    sobre a qual são aplicados os registros do diário. O diário não é arquivado.
+    Retorna True se a planilha foi gravada.
+    """
+    print("\n--- MODO: GERAR PLANILHA A PARTIR DO DIÁRIO ---")
+    diario = DiarioResultados(paths['diario'])
+    if os.path.exists(paths['saida']):
+        df = pd.read_excel(paths['saida'], dtype=str).fillna('')
+        linhas_do_diario = df['Nº Proposta'].astype(str).str.strip().isin(diario.propostas_registradas())
+        return salvar_resultado(diario.aplicar(df), paths['saida'], list(df.index[linhas_do_diario]))
     try:
-        df.to_excel(caminho_saida, index=False)
-        print(f"[SUCCESS] Resultado salvo com sucesso em: {caminho_saida}")
-    except Exception as e:
-        print(f"[ERROR] Falha ao salvar o arquivo de resultado: {e}")
+        df = ler_entrada_excel(paths['entrada'])
+    except Exception:
+        print("[ERROR] Não foi possível ler a planilha de entrada.")
+        return False
+    return salvar_resultado(diario.aplicar(df), paths['saida'])
 
 
-def ler_entrada_excel(caminho):
-    """
-    Lê e prepara a planilha de entrada, filtrando e estruturando os dados.
+def sufixo_shard(shard):
+    return f"_shard{shard[0]}de{shard[1]}" if shard else ""
 
-    Args:
-        caminho (str): O caminho para o arquivo Excel de entrada.
 
-    Returns:
-        pd.DataFrame: DataFrame preparado para o processamento.
+def montar_caminhos(base_path, shard=None, entrada=None, saida=None):
     """
-    try:
-        df = pd.read_excel(caminho, sheet_name='Propostas 2025', dtype=str)
-        print(f"[INFO] Planilha lida. Total de linhas: {len(df)}.")
+    Monta os caminhos de entrada, saída e de apoio (diário, índice, estado e métricas) em base_path.
 
-        colunas_obrigatorias = ['Nº Proposta', 'Instrumento']
-        if not all(col in df.columns for col in colunas_obrigatorias):
-            raise ValueError("As colunas 'Nº Proposta' e 'Instrumento' são obrigatórias.")
+    Com shard=(i, N), todos os arquivos gerados recebem o sufixo '_shard<i>de<N>', de modo que várias
+    máquinas possam gravar na mesma pasta (compartilhada) sem conflito; ver mesclar_shards.
+    """
+    sufixo = sufixo_shard(shard)
 
-        # Limpeza e preparação dos dados
-        df.dropna(subset=['Nº Proposta'], inplace=True)
-        df = df[df['Nº Proposta'].str.strip() != ''].drop_duplicates(subset=['Nº Proposta']).reset_index(drop=True)
-        print(f"[INFO] Após limpeza e remoção de duplicatas: {len(df)} linhas.")
+    def arquivo(nome, extensao):
+        return os.path.join(base_path, f"{nome}{sufixo}{extensao}")
 
-        # Estrutura do DataFrame de saída
-        colunas_saida = [
-            'Nº Proposta', 'Instrumento', 'Técnico Responsável pela Formalização',
-            'Lista Pareceres de Proposta', 'Lista Pareceres do plano de Trabalho',
-            'Certidões', 'Declarações', 'Comprovantes de Execução', 'Outros',
-            'Histórico (Data)', 'Histórico (Evento)',
-            'Fator Pendente para Celebração (Exceto Documentação)',
-            'Situacional (Documentação)', 'Ação Necessária (Automação)'
-        ]
-        
-        # Cria um novo DataFrame com a estrutura correta, preservando dados existentes
-        df_saida = pd.DataFrame(columns=colunas_saida)
-        for col in df_saida.columns:
-            if col in df.columns:
-                df_saida[col] = df[col]
-            else:
-                df_saida[col] = ''
-        
-        return df_saida.fillna('')
+    return {
+        'entrada': entrada or os.path.join(base_path, 'Situacional Propostas SNEAELIS.xlsm'),
+        'saida': saida or arquivo('resultado_analise_propostas', '.xlsx'),
+        'diario': arquivo('diario_resultados', '.jsonl'),
+        'indice': arquivo('indice_propostas', '.json'),
+        'estado': arquivo('estado_propostas', '.sqlite'),
+        'metricas': arquivo('metricas_etapas', '.jsonl'),
+        'prometheus': arquivo('metricas_robo', '.prom'),
+        'cache_html': arquivo('cache_paginas', ''),
+        'adiadas': arquivo('propostas_adiadas', '.json'),
+        # Arquivos de apoio compartilhados pelos shards (ver configurar_arquivos_apoio).
+        'chromedriver': os.path.join(base_path, '.cache_chromedriver.json'),
+        'seletores': os.path.join(base_path, '.seletores_preferidos.json'),
+        'termos': os.path.join(base_path, 'termos_analise.json'),
+    }
 
-    except FileNotFoundError:
-        print(f"[ERROR] Arquivo de entrada não encontrado em: {caminho}")
-        raise
-    except Exception as e:
-        print(f"[ERROR] Erro ao ler e preparar a planilha de entrada: {e}")
-        raise
 
+def configurar_arquivos_apoio(paths):
+    """
+    Aponta os arquivos que o robô lê e grava entre execuções para a pasta dos arquivos de paths,
+    em vez da pasta do script (que pode ser um clone do repositório ou uma pasta só de leitura).
+    """
+    global ARQUIVO_CHROMEDRIVER, ARQUIVO_TERMOS
+    ARQUIVO_CHROMEDRIVER = paths['chromedriver']
+    REGISTRO_SELETORES.usar_arquivo(paths['seletores'])
+    ARQUIVO_TERMOS = paths['termos']
+    _CORRESPONDENCIAS.clear()
 
-def preencher_linha(df, indice, driver, num_proposta):
+
+def mesclar_shards(paths, arquivos=None):
     """
-    Orquestra o processo de extração e análise para uma única proposta (linha do DataFrame).
+    Junta em paths['saida'] os resultados de uma execução dividida em shards.
+
+    A base é a planilha de entrada (ou, sem ela, a concatenação das saídas dos shards). Sobre ela
+    são aplicadas as planilhas de saída de cada shard e, depois, os diários ainda não arquivados
+    (shards interrompidos). Sem arquivos explícitos, usa as saídas e diários '*_shard<i>de<N>' da pasta da saída.
 
     Args:
-        df (pd.DataFrame): O DataFrame principal.
-        indice (int): O índice da linha a ser processada.
-        driver (webdriver.Chrome): A instância do driver do Selenium.
-        num_proposta (str): O número da proposta a ser analisada.
+        paths (dict): Caminhos da execução sem shard (entrada e saída final).
+        arquivos (list[str]): Planilhas (.xlsx) e diários (.jsonl) dos shards (opcional).
 
     Returns:
-        pd.DataFrame: O DataFrame atualizado com os resultados da linha.
+        bool: True se a planilha mesclada foi gravada com todos os shards; falta de algum shard é falha.
     """
-    # --- Regras de Negócio baseadas no "Situacional" (pré-análise) ---
-    situacionais_em_celebracao = [
-        "Parecer e Termo para Correção", "Parecer e Termo Corrigido (Necessidade de Ajuste)",
-        "Parecer para Assinatura", "Termo Disponibilizado Usuário Externo",
-        "Termo Disponibilizado Secretário(a)", "Processo Enviado ao GAB - Para Publicação"
-    ]
-    situacionais_parceria_celebrada = [
-        "Aguardando Registro Transferegov CGFP", "Cláusula Suspensiva 2025", "Enviado à CGAP"
-    ]
-    situacionais_proposta_rejeitada = ["Alteração de Beneficiário", "Proposta Rejeitada"]
-    situacionais_tecnico_analisar = ["Enviar Link Declarações", "Enviado Link Declarações"]
-    
-    situacional = df.loc[indice, "Situacional (Documentação)"].strip()
-    acao_final = None
-
-    if situacional in situacionais_em_celebracao:
-        acao_final = "Em Celebração"
-    elif situacional in situacionais_parceria_celebrada:
-        acao_final = "Parceria Celebrada"
-    elif situacional in situacionais_proposta_rejeitada:
-        acao_final = "Proposta Rejeitada"
-    elif situacional in situacionais_tecnico_analisar:
-        acao_final = "Técnico Analisar"
-
-    # Se uma ação foi definida pela pré-análise, pula a extração web
-    if acao_final:
-        print(f"[INFO] Ação definida como '{acao_final}' com base no situacional '{situacional}'. Pulando extração web.")
-        df.loc[indice, "Ação Necessária (Automação)"] = acao_final
-        for col in ['Lista Pareceres de Proposta', 'Certidões', 'Declarações', 'Histórico (Data)']:
-             df.loc[indice, col] = "N/A (Definido pelo Situacional)"
-        return df
+    print("\n--- MODO: MESCLAR SHARDS ---")
+    prefixos = "|".join(re.escape(os.path.splitext(os.path.basename(paths[chave]))[0]) for chave in ('saida', 'diario'))
+    padrao = re.compile(rf"(?:{prefixos})_shard(\d+)de(\d+)\.(xlsx|jsonl)$")
+    if not arquivos:
+        pasta = os.path.dirname(paths['saida']) or "."
+        arquivos = [os.path.join(pasta, nome) for nome in sorted(os.listdir(pasta)) if padrao.fullmatch(nome)]
+    planilhas = [caminho for caminho in arquivos if caminho.endswith(".xlsx")]
+    diarios = [caminho for caminho in arquivos if caminho.endswith(".jsonl")]
+    if not planilhas and not diarios:
+        print("[ERROR] Nenhuma saída de shard encontrada para mesclar.")
+        return False
 
-    # --- Processo de Extração Web ---
-    if not navegar_menu_principal(driver, num_proposta):
-        df.loc[indice, "Ação Necessária (Automação)"] = "Instrumento não encontrado"
-        return df
+    saidas = [pd.read_excel(caminho, dtype=str).fillna('') for caminho in planilhas]
+    if os.path.exists(paths['entrada']):
+        df = ler_entrada_excel(paths['entrada'])
+    elif saidas:
+        df = pd.concat(saidas, ignore_index=True).drop_duplicates('Nº Proposta', keep='last').reset_index(drop=True)
+    else:
+        print("[ERROR] Sem planilha de entrada nem saídas de shards, os diários não têm onde ser aplicados.")
+        return False
 
-    _, proposta_str, plano_str, _, data_pareceres = verificar_pareceres(driver)
-    
-    data_requisitos, certidoes_str, declaracoes_str, comprovantes_str, outros_str, historico_data, historico_evento = verificar_requisitos(driver)
-
-    # --- Lógica de Decisão da Ação Necessária ---
-    # Compara a data do último parecer do técnico com a data do último documento enviado pela entidade.
-    if data_pareceres and data_requisitos:
-        if data_pareceres > data_requisitos:
-            acao_final = "Entidade Pendência de Documentação"
-        elif data_requisitos > data_pareceres:
-            acao_final = "Técnico Analisar"
-        else: # Datas são iguais, desempate pelo evento do histórico
-            if "Complementação Solicitada" in historico_evento:
-                acao_final = "Entidade Pendência de Documentação"
-            else:
-                acao_final = "Técnico Analisar"
-    elif data_requisitos and not data_pareceres:
-        acao_final = "Técnico Analisar"
-    elif data_pareceres and not data_requisitos:
-        acao_final = "Entidade Pendência de Documentação"
-    else: # Nenhum documento ou parecer encontrado
-        acao_final = "Entidade Pendência de Documentação"
-        
-    # Preenche o DataFrame com os resultados
-    df.loc[indice, "Lista Pareceres de Proposta"] = proposta_str
-    df.loc[indice, "Lista Pareceres do plano de Trabalho"] = plano_str
-    df.loc[indice, "Certidões"] = certidoes_str
-    df.loc[indice, "Declarações"] = declaracoes_str
-    df.loc[indice, "Comprovantes de Execução"] = comprovantes_str
-    df.loc[indice, "Outros"] = outros_str
-    df.loc[indice, "Histórico (Data)"] = historico_data
-    df.loc[indice, "Histórico (Evento)"] = historico_evento
-    df.loc[indice, "Ação Necessária (Automação)"] = acao_final
+    for caminho, saida_shard in zip(planilhas, saidas):
+        df, atualizadas = aplicar_por_proposta(df, saida_shard)
+        print(f"[INFO] {os.path.basename(caminho)}: {atualizadas} linhas.")
+    for caminho in diarios:
+        print(f"[INFO] {os.path.basename(caminho)}:")
+        diario = DiarioResultados(caminho)
+        # Propostas de um shard interrompido antes de gerar a saída ainda não têm linha na base
+        if novas := sorted(diario.propostas_registradas() - set(df['Nº Proposta'].astype(str).str.strip())):
+            df = pd.concat([df, pd.DataFrame({'Nº Proposta': novas}).reindex(columns=df.columns, fill_value='')],
+                           ignore_index=True)
+        df = diario.aplicar(df)
 
-    return df
+    partes = {(int(m.group(1)), int(m.group(2))) for m in map(padrao.search, arquivos) if m}
+    completo = True
+    for total in sorted({total for _, total in partes}):
+        if faltando := sorted(set(range(1, total + 1)) - {parte for parte, t in partes if t == total}):
+            print(f"[ERROR] Shards de {total} sem saída nem diário: {', '.join(map(str, faltando))}.")
+            completo = False
+    sem_acao = int((df['Ação Necessária (Automação)'].astype(str).str.strip() == '').sum())
+    print(f"[INFO] {len(df)} propostas na planilha mesclada; {sem_acao} ainda sem 'Ação Necessária'.")
+    return salvar_resultado(df, paths['saida']) and completo
 
 
-def rodar_processamento_completo(driver, paths, filtro_instrumento):
-    """
-    Executa o script completo, lendo a planilha de entrada e processando as propostas filtradas.
+def benchmark_inicializacao(repeticoes=5):
     """
-    print(f"\n--- MODO: PROCESSAMENTO COMPLETO | FILTRO: {filtro_instrumento} ---")
+    Mede, em processos Python novos, o tempo de carga do script até o menu poder ser exibido,
+    com as importações adiadas (comportamento atual) e com todas carregadas de início (como antes
+    de ImportacaoTardia). Mostra também quanto custou cada importação adiada.
 
-    try:
-        df = ler_entrada_excel(paths['entrada'])
-    except Exception:
-        print("[ERROR] Encerrando script devido a erro na leitura do arquivo de entrada.")
-        return
+    Args:
+        repeticoes (int): Processos medidos em cada cenário (vale a mediana).
+    """
+    carga = (
+        "import importlib.util, time; inicio = time.perf_counter();"
+        "spec = importlib.util.spec_from_file_location('robo', {caminho!r});"
+        "m = importlib.util.module_from_spec(spec); spec.loader.exec_module(m);"
+        "{extra}"
+        "print(time.perf_counter() - inicio)"
+    )
+    forcar = ("[getattr(v, '_carregar')() for v in list(vars(m).values()) if isinstance(v, m.ImportacaoTardia)];"
+              "import json; print(json.dumps(m.TEMPOS_IMPORTACAO));")
+    medianas = {}
+    for cenario, extra in (("adiadas", ""), ("todas no início", forcar)):
+        codigo = carga.format(caminho=os.path.abspath(__file__), extra=extra)
+        tempos = []
+        for _ in range(repeticoes):
+            saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True).stdout
+            linhas = saida.strip().splitlines()
+            tempos.append(float(linhas[-1]))
+        medianas[cenario] = resumo_tempos(tempos)[2]
+        if extra:
+            tempos_importacao = json.loads(linhas[-2])
 
-    if filtro_instrumento.lower() != 'todos':
-        df = df[df['Instrumento'].str.lower() == filtro_instrumento.lower()].reset_index(drop=True)
-        print(f"[INFO] Após filtro '{filtro_instrumento}': {len(df)} linhas para processar.")
+    print(f"[BENCH] Inicialização ({repeticoes} processos por cenário, mediana):")
+    for cenario, mediana in medianas.items():
+        print(f"  importações {cenario:<16} {mediana * 1000:8.0f} ms")
+    for modulo, segundos in sorted(tempos_importacao.items(), key=lambda item: -item[1]):
+        print(f"    {modulo:<48} {segundos * 1000:6.0f} ms")
+    return medianas
 
-    if df.empty:
-        print("[INFO] Nenhuma proposta encontrada para o filtro especificado. Encerrando.")
-        return
 
-    ultimo_indice = ler_checkpoint(paths['checkpoint'])
-    print(f"[INFO] Iniciando a partir do índice {ultimo_indice} (via checkpoint).")
+# ==============================================================================
+# Função Principal e Interface de Usuário
+# ==============================================================================
 
-    tempos = []
-    inicio_total = time.time()
-    total_propostas = len(df)
+# Modos do robô pela linha de comando (equivalentes às opções do menu, mais 'mesclar' e 'benchmark').
+MODOS_CLI = ["completo", "falhas", "indice", "incremental", "planilha", "reavaliar", "offline", "mesclar", "benchmark"]
 
-    for idx, linha in df.iterrows():
-        if idx < ultimo_indice:
-            continue
+# Medições disponíveis no modo 'benchmark' (nenhuma usa o Chrome de depuração).
+BENCHMARKS = {
+    "inicializacao": lambda: benchmark_inicializacao(),
+    "buffer": lambda: benchmark_buffer_resultados(),
+    "termos": lambda: benchmark_correspondencia_termos(),
+    "datas": lambda: benchmark_extrair_data(),
+}
 
-        inicio_proposta = time.time()
-        print(f"\n[INFO] Processando proposta {idx + 1}/{total_propostas} | Nº: {linha['Nº Proposta']}")
-        
-        num_proposta = str(linha.get("Nº Proposta", "")).strip()
-        if not num_proposta:
-            print("[WARNING] Nº da proposta não encontrado nesta linha. Pulando.")
-            continue
 
-        df = preencher_linha(df, idx, driver, num_proposta)
+def pasta_base_padrao():
+    """Pasta dos arquivos de entrada e saída: a variável ROBO_TRANSFEREGOV_PASTA ou ./output."""
+    return os.environ.get("ROBO_TRANSFEREGOV_PASTA") or os.path.join(os.getcwd(), "output")
 
-        # Cálculo de tempo e estimativa
-        tempo_gasto = time.time() - inicio_proposta
-        tempos.append(tempo_gasto)
-        media_tempo = sum(tempos) / len(tempos)
-        restantes = total_propostas - (idx + 1)
-        estimado = (restantes * media_tempo) / 60
-        print(f"[TIMER] Tempo da proposta: {tempo_gasto:.2f}s | Média: {media_tempo:.2f}s | Estimativa restante: {estimado:.1f} min")
 
-        salvar_checkpoint(paths['checkpoint'], idx + 1)
-        # Salva o resultado a cada X iterações para segurança
-        if (idx + 1) % 10 == 0:
-            salvar_resultado(df, paths['saida'])
+def ler_shard(texto):
+    """Converte 'i/N' (1 <= i <= N) na tupla (i, N)."""
+    try:
+        parte, total = (int(valor) for valor in texto.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard deve ter o formato i/N (ex: 2/4), recebido '{texto}'")
+    if not 1 <= parte <= total:
+        raise argparse.ArgumentTypeError(f"shard fora do intervalo: '{texto}' (use 1/N até N/N)")
+    return parte, total
 
 
-    salvar_resultado(df, paths['saida'])
-    tempo_total = (time.time() - inicio_total) / 60
-    print(f"\n[SUCCESS] Processamento completo concluído! Tempo total: {tempo_total:.1f} min")
+def ler_argumentos(argv):
+    """
+    Interpreta a linha de comando. Os valores de --config (JSON com as mesmas chaves das opções,
+    ex: {"filtro": "Convênio", "portas": "9222,9223", "shard": "1/3"}) valem como padrão e podem ser
+    sobrepostos pelas opções informadas.
+    """
+    parser = argparse.ArgumentParser(
+        description="Robô de análise de propostas do Transferegov.",
+        epilog="Sem argumentos, abre o menu interativo.",
+    )
+    parser.add_argument("modo", choices=MODOS_CLI, help="Modo de execução.")
+    parser.add_argument("--config", help="Arquivo JSON com valores padrão das opções.")
+    parser.add_argument("--filtro", default="Todos", help="Tipo de instrumento a processar (padrão: Todos).")
+    parser.add_argument("--pasta", default=pasta_base_padrao(),
+                        help="Pasta dos arquivos de entrada, saída e apoio (padrão: $ROBO_TRANSFEREGOV_PASTA ou ./output).")
+    parser.add_argument("--entrada", help="Planilha de entrada (padrão: <pasta>/Situacional Propostas SNEAELIS.xlsm).")
+    parser.add_argument("--saida", help="Planilha de saída (padrão: <pasta>/resultado_analise_propostas[_shard<i>de<N>].xlsx).")
+    parser.add_argument("--portas", default="9222",
+                        help="Portas de depuração do Chrome, separadas por vírgula; várias portas = modo paralelo.")
+    parser.add_argument("--shard", type=ler_shard,
+                        help="Processa apenas a parte i de N das propostas (i/N, pelo Nº Proposta).")
+    parser.add_argument("--arquivos", nargs="*", help="Modo mesclar: saídas e diários dos shards (padrão: os da pasta).")
+    parser.add_argument("--regras", help="Modos reavaliar e offline: arquivo JSON de regras (padrão: REGRAS_ACAO).")
+    parser.add_argument("--tempo-maximo", "--time-budget", dest="tempo_maximo", type=ler_duracao,
+                        help="Modos completo e incremental: tempo disponível (ex: 90, 45m, 2h, 1h30). As propostas "
+                             "que não couberem ficam para a próxima execução.")
+    parser.add_argument("--processos", type=int, help="Modo offline: quantidade de processos (padrão: núcleos, até 8).")
+    parser.add_argument("--benchmark", choices=list(BENCHMARKS), help="Modo benchmark: medição a executar.")
 
-    if os.path.exists(paths['checkpoint']):
-        os.remove(paths['checkpoint'])
-        print("[INFO] Arquivo de checkpoint removido após conclusão.")
+    previo, _ = parser.parse_known_args(argv)
+    if previo.config:
+        with open(previo.config, 'r', encoding='utf-8') as f:
+            configuracao = {chave.replace("-", "_"): valor for chave, valor in json.load(f).items()}
+        # O Namespace já traz todas as opções (com os padrões), informadas ou não
+        if desconhecidas := set(configuracao) - set(vars(previo)):
+            parser.error(f"opções desconhecidas em {previo.config}: {', '.join(sorted(desconhecidas))}")
+        parser.set_defaults(**configuracao)
+    return parser.parse_args(argv)
 
 
-def reprocessar_falhas(driver, paths, filtro_instrumento):
+def executar_cli(args):
     """
-    Verifica a planilha de saída, encontra linhas com falhas e as reprocessa.
+    Executa um modo sem interação com o usuário. Retorna o código de saída do processo: 0 se o modo
+    terminou bem, 1 se falhou (arquivos ausentes, filtro ou shard vazio, shards faltando, sessão expirada
+    etc., ver o retorno de cada modo) e 2 para argumentos inválidos.
     """
-    print(f"\n--- MODO: REPROCESSAMENTO DE FALHAS | FILTRO: {filtro_instrumento} ---")
-
-    if not os.path.exists(paths['saida']):
-        print(f"[WARNING] Arquivo de saída '{paths['saida']}' não encontrado. Execute o processamento completo primeiro.")
-        return
+    if args.modo == "benchmark":
+        if not args.benchmark:
+            print(f"[ERROR] Informe a medição com --benchmark ({', '.join(BENCHMARKS)}).")
+            return 2
+        return 0 if BENCHMARKS[args.benchmark]() is not False else 1
 
-    df = pd.read_excel(paths['saida'], dtype=str).fillna('')
+    paths = montar_caminhos(args.pasta, args.shard, args.entrada, args.saida)
+    configurar_arquivos_apoio(paths)
+    if args.modo == "planilha":
+        return 0 if gerar_planilha_do_diario(paths) else 1
+    if args.modo == "reavaliar":
+        return 0 if reavaliar_acoes(paths, carregar_regras_acao(args.regras)) else 1
+    if args.modo == "offline":
+        return 0 if reavaliar_cache(paths, carregar_regras_acao(args.regras), args.processos) else 1
+    if args.modo == "mesclar":
+        return 0 if mesclar_shards(montar_caminhos(args.pasta, entrada=args.entrada, saida=args.saida), args.arquivos) else 1
 
-    if filtro_instrumento.lower() != 'todos':
-        df = df[df['Instrumento'].str.lower() == filtro_instrumento.lower()]
+    portas = ler_portas_depuracao(str(args.portas))
+    sessoes = SessoesNavegador()
+    try:
+        if args.modo == "completo" and len(portas) > 1:
+            sucesso = rodar_processamento_paralelo([sessoes.obter(porta) for porta in portas], paths, args.filtro,
+                                                   args.shard, args.tempo_maximo)
+        elif args.modo in ("completo", "incremental"):
+            sucesso = rodar_processamento_completo(sessoes.obter(portas[0]), paths, args.filtro,
+                                                   incremental=args.modo == "incremental", shard=args.shard,
+                                                   tempo_maximo=args.tempo_maximo)
+        elif args.modo == "falhas":
+            sucesso = reprocessar_falhas(sessoes.obter(portas[0]), paths, args.filtro, args.shard)
+        else:
+            sucesso = colher_indice_resultados(sessoes.obter(portas[0]), IndicePropostas(paths['indice'])) > 0
+    finally:
+        sessoes.encerrar()
+    return 0 if sucesso else 1
 
-    # Identifica falhas (células vazias em 'Ação Necessária')
-    indices_para_reprocessar = df[df['Ação Necessária (Automação)'].str.strip() == ''].index
 
-    if indices_para_reprocessar.empty:
-        print("[SUCCESS] Nenhuma falha encontrada para o filtro especificado.")
-        return
+def main(argv=None):
+    """
+    Função principal. Com argumentos de linha de comando, executa o modo pedido sem interação
+    (ver ler_argumentos); sem argumentos, gerencia o menu interativo.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return executar_cli(ler_argumentos(argv))
 
-    total_falhas = len(indices_para_reprocessar)
-    print(f"[INFO] {total_falhas} propostas com falha encontradas. Iniciando reprocessamento...")
-    
-    for count, idx in enumerate(indices_para_reprocessar):
-        linha = df.loc[idx]
-        print(f"\n[INFO] Reprocessando falha {count + 1}/{total_falhas} | Linha do Excel: {idx + 2}")
-        
-        num_proposta = str(linha.get("Nº Proposta", "")).strip()
-        if not num_proposta:
-            print("[WARNING] Nº da proposta não encontrado. Pulando.")
-            continue
-            
-        df = preencher_linha(df, idx, driver, num_proposta)
-        salvar_resultado(df, paths['saida']) # Salva após cada reprocessamento
+    # Os arquivos de entrada, saída e de apoio ficam na pasta de pasta_base_padrao().
+    paths = montar_caminhos(pasta_base_padrao())
+    configurar_arquivos_apoio(paths)
 
-    print("\n[SUCCESS] Reprocessamento de falhas concluído!")
+    sessoes = SessoesNavegador()
+    print(f"[TIMER] Menu pronto em {(time.perf_counter() - INICIO_PROCESSO) * 1000:.0f} ms desde o início do processo.")
+    try:
+        executar_menu(sessoes, paths)
+    finally:
+        sessoes.encerrar()
 
-# ==============================================================================
-# Função Principal e Interface de Usuário
-# ==============================================================================
 
-def main():
+def executar_menu(sessoes, paths):
     """
-    Função principal que gerencia o fluxo de execução e a interação com o usuário.
+    Laço do menu interativo; as conexões com o navegador vêm de sessoes e são reaproveitadas.
+    A opção 3 continua sendo Sair, como antes dos novos modos, que vêm a partir da 4.
     """
-    # Defina os caminhos para os arquivos de entrada, saída e checkpoint.
-    # Recomenda-se usar caminhos relativos ou variáveis de ambiente para portabilidade.
-    base_path = r'C:\Users\diego.brito\Downloads\robov1\output'
-    paths = {
-        'entrada': os.path.join(base_path, 'Situacional Propostas SNEAELIS.xlsm'),
-        'saida': os.path.join(base_path, 'resultado_analise_propostas.xlsx'),
-        'checkpoint': os.path.join(base_path, 'checkpoint.json')
-    }
-
     while True:
         print("\n" + "="*50)
         print("    ROBÔ DE ANÁLISE DE PROPOSTAS - TRANSFEREGOV")
         print("="*50)
         print("Escolha o modo de execução:")
-        print("[1] Rodar processamento completo (do início ou checkpoint)")
+        print("[1] Rodar processamento completo (do início ou retomando pelo diário)")
         print("[2] Reprocessar apenas as falhas")
         print("[3] Sair")
+        print("[4] Atualizar o índice de links das propostas (coleta em lote)")
+        print("[5] Rodar processamento incremental (apenas propostas alteradas)")
+        print("[6] Gerar a planilha de resultado a partir do diário")
+        print("[7] Reavaliar as ações da planilha com as regras atuais (sem navegador)")
+        print("[8] Refazer a análise a partir do cache de páginas (offline)")
 
-        escolha = input("Digite sua escolha (1, 2 ou 3): ").strip()
+        escolha = input("Digite sua escolha: ").strip()
 
-        if escolha in ['1', '2']:
+        if escolha in ['1', '2', '5']:
             print("\nInforme o tipo de instrumento para filtrar (ex: 'Convênio')")
             filtro_instrumento = input("Ou digite 'Todos' para processar todos: ").strip()
             if not filtro_instrumento:
                 filtro_instrumento = 'Todos'
             print(f"[INFO] Filtro selecionado: {filtro_instrumento}")
-            
-            driver = conectar_navegador_existente()
+
+            portas = [9222]
             if escolha == '1':
+                print("\nPara processar em paralelo, informe várias portas de depuração (ex: '9222,9223').")
+                portas = ler_portas_depuracao(input("Portas do Chrome (Enter = 9222): "))
+
+            if escolha == '1' and len(portas) > 1:
+                drivers = [sessoes.obter(porta) for porta in portas]
+                rodar_processamento_paralelo(drivers, paths, filtro_instrumento)
+            elif escolha == '1':
+                driver = sessoes.obter(portas[0])
                 rodar_processamento_completo(driver, paths, filtro_instrumento)
             elif escolha == '2':
+                driver = sessoes.obter()
                 reprocessar_falhas(driver, paths, filtro_instrumento)
+            elif escolha == '5':
+                driver = sessoes.obter()
+                rodar_processamento_completo(driver, paths, filtro_instrumento, incremental=True)
             
             print("[INFO] Processamento finalizado. O navegador permanecerá aberto.")
 
+        elif escolha == '4':
+            driver = sessoes.obter()
+            colher_indice_resultados(driver, IndicePropostas(paths['indice']))
+
+        elif escolha == '6':
+            gerar_planilha_do_diario(paths)
+
+        elif escolha == '7':
+            reavaliar_acoes(paths)
+
+        elif escolha == '8':
+            reavaliar_cache(paths)
+
         elif escolha == '3':
             print("[INFO] Encerrando o programa.")
             break
         else:
-            print("[WARNING] Escolha inválida. Por favor, digite 1, 2 ou 3.")
+            print("[WARNING] Escolha inválida. Por favor, digite uma das opções do menu.")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
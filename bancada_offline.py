@@ -0,0 +1,483 @@
+# -*- coding: utf-8 -*-
+"""
+Bancada de testes offline do robô Parecer-Requisitos: um servidor HTTP local que imita as páginas
+do Transferegov usadas pelo robô, com propostas sintéticas, e as medições que rodam contra ele.
+
+As páginas são montadas a partir da estrutura de divs que os XPaths do robô esperam, não de páginas
+capturadas do portal: a bancada mede desempenho e confere a coerência entre navegador e HTML, mas não
+detecta uma mudança de layout do portal.
+
+Uso:
+  python bancada_offline.py offline --propostas 20 --latencia 80 --jitter 30   (Chrome headless)
+  python bancada_offline.py pipeline --propostas 100 --latencia 40 --jitter 10  (sem Chrome)
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import redirect_stdout
+from datetime import datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from urllib.parse import parse_qs, urlparse
+
+CAMINHO_ROBO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Parecer-Requisitos.py")
+
+
+def carregar_robo():
+    """O script do robô carregado como módulo (o nome do arquivo tem hífen e não pode ser importado direto)."""
+    modulo = sys.modules.get("parecer_requisitos")
+    if modulo is None:
+        spec = importlib.util.spec_from_file_location("parecer_requisitos", CAMINHO_ROBO)
+        modulo = importlib.util.module_from_spec(spec)
+        sys.modules["parecer_requisitos"] = modulo
+        spec.loader.exec_module(modulo)
+    return modulo
+
+
+robo = carregar_robo()
+
+
+# Arquivos fictícios e eventos do histórico usados na geração das propostas sintéticas.
+ARQUIVOS_FIXTURE = [
+    "Certidao_Regularidade_FGTS.pdf", "Certidao_Negativa_Debitos.pdf", "Declaracao_Adimplencia.pdf",
+    "Estatuto_Social.pdf", "Plano_de_Trabalho.pdf", "Planilha_de_Custos.xlsx",
+    "Atestado_Capacidade_Tecnica.pdf", "Comprovante_Execucao_Evento.pdf", "Ata_Eleicao_Diretoria.pdf",
+]
+EVENTOS_FIXTURE = ["Complementação Solicitada", "Proposta Enviada para Análise", "Análise Registrada"]
+
+
+def gerar_fixtures_propostas(total=30, semente=2025):
+    """
+    Gera propostas sintéticas e anonimizadas para o servidor local: pareceres (técnicos de
+    NOMES_TECNICOS do robô e responsáveis fictícios), documentos de cada categoria e histórico.
+
+    Args:
+        total (int): Quantidade de propostas.
+        semente (int): Semente do gerador, para que cada execução produza os mesmos dados.
+
+    Returns:
+        dict: {Nº Proposta: {'id', 'pareceres_proposta', 'pareceres_plano', 'documentos', 'historico'}}.
+    """
+    aleatorio = random.Random(semente)
+
+    def data_aleatoria():
+        return datetime(2025, aleatorio.randint(1, 6), aleatorio.randint(1, 28),
+                        aleatorio.randint(8, 18), aleatorio.randint(0, 59), aleatorio.randint(0, 59))
+
+    def pareceres():
+        responsaveis = robo.NOMES_TECNICOS + [f"Servidor Externo {n}" for n in range(1, 4)]
+        return [[data_aleatoria().strftime("%d/%m/%Y %H:%M:%S"), "Parecer Técnico", aleatorio.choice(responsaveis)]
+                for _ in range(aleatorio.randint(0, 4))]
+
+    propostas = {}
+    for numero in range(total):
+        documentos = {
+            categoria: [[f"{numero}_{aleatorio.choice(ARQUIVOS_FIXTURE)}", data_aleatoria().strftime("%d/%m/%Y %H:%M:%S")]
+                        for _ in range(aleatorio.randint(0, 3))]
+            for categoria in robo.XPATHS_REQUISITOS
+        }
+        historico = sorted(
+            ([aleatorio.choice(EVENTOS_FIXTURE), "Usuário Fictício", data_aleatoria()] for _ in range(aleatorio.randint(1, 3))),
+            key=lambda linha: linha[2], reverse=True,
+        )
+        propostas[f"{900000 + numero}/2025"] = {
+            "id": 100000 + numero,
+            "pareceres_proposta": pareceres(),
+            "pareceres_plano": pareceres(),
+            "documentos": documentos,
+            "historico": [[evento, usuario, data.strftime("%d/%m/%Y %H:%M:%S")] for evento, usuario, data in historico],
+        }
+    return propostas
+
+
+def _tabela_fixture(linhas, cabecalho=None, atributos=""):
+    cabecalho_html = ""
+    if cabecalho:
+        cabecalho_html = "<thead><tr>" + "".join(f"<th>{escape(c)}</th>" for c in cabecalho) + "</tr></thead>"
+    corpo = "".join("<tr>" + "".join(f"<td>{escape(str(c))}</td>" for c in linha) + "</tr>" for linha in linhas)
+    return f"<table{atributos}>{cabecalho_html}<tbody>{corpo}</tbody></table>"
+
+
+def _aba_fixture(rotulo, href, id_link=None, id_div=None, classe="inactiveTab"):
+    atributo_link = f' id="{id_link}"' if id_link else ""
+    atributo_div = f' id="{id_div}"' if id_div else ""
+    return f'<a{atributo_link} href="{href}"><div{atributo_div} class="{classe}"><span><span>{rotulo}</span></span></div></a>'
+
+
+def pagina_fixture(titulo, conteudo="", abas="", sub_abas="", cabecalho="", requisitos=""):
+    """
+    Monta uma página do servidor local com a mesma estrutura de divs do portal, de modo que os
+    XPaths absolutos usados pelo robô (menu, pesquisa, abas, Pareceres e Requisitos) funcionem sem alteração.
+    """
+    rotulos_submenu = ["Incluir Proposta", "Consultar Pré-Instrumento", "Consultar Propostas"]
+    submenu = "".join(
+        f'<li><a href="{"/voluntarias/ConsultarProposta/ConsultarProposta.do" if i == 2 else "#"}">{rotulo}</a></li>'
+        for i, rotulo in enumerate(rotulos_submenu)
+    )
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{escape(titulo)}</title></head><body>'
+        # body/div[1]: cabeçalho com o menu principal (div[3]/div[1]/.../div[3]) e o submenu (div[3]/div[2]/.../li[3]/a)
+        '<div><div></div><div></div><div>'
+        '<div><div><div><div></div><div></div>'
+        '<div onclick="document.getElementById(\'submenu\').style.display=\'block\'">Propostas</div>'
+        '</div></div></div>'
+        f'<div id="submenu" style="display:none"><div><div><ul>{submenu}</ul></div></div></div>'
+        '</div></div>'
+        '<div></div>'
+        # body/div[3]: div[15] com abas e conteúdo, div[16] com as tabelas da aba Requisitos
+        '<div>' + '<div></div>' * 14 +
+        f'<div><div><div><div>{abas}</div><div>{sub_abas}</div></div></div><div>{cabecalho}</div><div>{conteudo}</div></div>'
+        f'<div><div></div><div><div></div><div><form><div>{requisitos}</div></form></div></div></div>'
+        '</div></body></html>'
+    )
+
+
+class ServidorTransferegovLocal:
+    """
+    Servidor HTTP local que imita as páginas do Transferegov usadas pelo robô (Principal.do,
+    pesquisa de propostas, Plano de Trabalho, Pareceres e Requisitos) a partir de propostas
+    sintéticas, com latência e variação (jitter) configuráveis por requisição.
+
+    Uso:
+        with ServidorTransferegovLocal(gerar_fixtures_propostas(), latencia_ms=80) as servidor:
+            ...  # apontar robo.URL_BASE para servidor.url
+    """
+
+    POR_PAGINA = 20
+
+    def __init__(self, propostas, latencia_ms=0, jitter_ms=0, porta=0, semente=None):
+        """
+        Args:
+            propostas (dict): Retorno de gerar_fixtures_propostas.
+            latencia_ms (float): Atraso médio de cada resposta, em milissegundos.
+            jitter_ms (float): Variação máxima (para mais ou para menos) sobre a latência.
+            porta (int): Porta local (0 = escolhida pelo sistema).
+        """
+        self.propostas = propostas
+        self.por_id = {str(dados["id"]): (num, dados) for num, dados in propostas.items()}
+        self.latencia_ms = latencia_ms
+        self.jitter_ms = jitter_ms
+        self.requisicoes = 0
+        self._aleatorio = random.Random(semente)
+        self._trava = threading.Lock()
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", porta), self._criar_manipulador())
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._servidor.server_address[1]}"
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"[INFO] Servidor local do Transferegov em {self.url} "
+              f"(latência {self.latencia_ms} ms ± {self.jitter_ms} ms, {len(self.propostas)} propostas).")
+        return self
+
+    def parar(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *erro):
+        self.parar()
+
+    def _atraso(self):
+        with self._trava:
+            self.requisicoes += 1
+            atraso = self.latencia_ms + self._aleatorio.uniform(-self.jitter_ms, self.jitter_ms)
+        if atraso > 0:
+            time.sleep(atraso / 1000)
+
+    def _abas_proposta(self, id_proposta):
+        return "".join([
+            _aba_fixture("Dados", f"/voluntarias/Proposta/Detalhar.do?id={id_proposta}"),
+            _aba_fixture("Participantes", "#"),
+            _aba_fixture("Requisitos", f"/voluntarias/Proposta/RequisitosMenu.do?id={id_proposta}"),
+            _aba_fixture("Plano de Trabalho", f"/voluntarias/Proposta/PlanoTrabalho.do?id={id_proposta}", id_div="div_997366806"),
+        ])
+
+    def _sub_abas_plano(self, id_proposta):
+        rotulos = ["Dados", "Metas", "Etapas", "Cronograma", "Crono Desembolso",
+                   "Plano de Aplicação", "Anexos", "Custos", "Responsáveis"]
+        return "".join(_aba_fixture(r, "#") for r in rotulos) + \
+            _aba_fixture("Pareceres", f"/voluntarias/Proposta/Pareceres.do?id={id_proposta}")
+
+    def pagina(self, caminho, parametros):
+        """Retorna (status, html) da página pedida."""
+        if caminho.endswith("/Principal/Principal.do"):
+            return 200, pagina_fixture("Principal")
+
+        if caminho.endswith("/ConsultarProposta/ConsultarProposta.do"):
+            return 200, self._pagina_pesquisa(parametros)
+
+        id_proposta = parametros.get("id", [""])[0]
+        if id_proposta not in self.por_id:
+            return 404, pagina_fixture("Proposta não encontrada", "Proposta não encontrada")
+        num_proposta, dados = self.por_id[id_proposta]
+        cabecalho = f"<h3>Proposta nº {escape(num_proposta)}</h3>"
+        abas = self._abas_proposta(id_proposta)
+
+        if caminho.endswith("/Proposta/Detalhar.do"):
+            return 200, pagina_fixture("Proposta", "Dados da proposta", abas, cabecalho=cabecalho)
+        if caminho.endswith("/Proposta/PlanoTrabalho.do"):
+            return 200, pagina_fixture("Plano de Trabalho", "Dados do plano de trabalho", abas,
+                                       self._sub_abas_plano(id_proposta), cabecalho)
+        if caminho.endswith("/Proposta/Pareceres.do"):
+            colunas = ["Data", "Tipo", "Responsável"]
+            conteudo = (
+                f'<div id="divPareceresProposta">{_tabela_fixture(dados["pareceres_proposta"], colunas)}</div>'
+                f'<div id="divPareceresPlanoTrabalho">{_tabela_fixture(dados["pareceres_plano"], colunas)}</div>'
+            )
+            return 200, pagina_fixture("Pareceres", conteudo, abas, self._sub_abas_plano(id_proposta), cabecalho)
+        if caminho.endswith("/Proposta/RequisitosMenu.do") or caminho.endswith("/Proposta/Requisitos.do"):
+            sub_abas = _aba_fixture("Requisitos", f"/voluntarias/Proposta/Requisitos.do?id={id_proposta}",
+                                    id_link="menu_link_2144784112_100344749")
+            requisitos = ""
+            if caminho.endswith("/Proposta/Requisitos.do"):
+                tabelas = [_tabela_fixture(dados["documentos"][categoria], ["Arquivo", "Data de Envio"])
+                           for categoria in robo.XPATHS_REQUISITOS]
+                tabelas.append(_tabela_fixture(dados["historico"], ["Evento", "Responsável", "Data"]))
+                requisitos = "".join(f"<div>{tabela}</div>" for tabela in tabelas)
+            return 200, pagina_fixture("Requisitos", "", abas, sub_abas, cabecalho, requisitos)
+
+        return 404, pagina_fixture("Página não encontrada", "Página não encontrada")
+
+    def _pagina_pesquisa(self, parametros):
+        formulario = (
+            '<div><div><form action="/voluntarias/ConsultarProposta/ConsultarProposta.do" method="get">'
+            '<table><tbody><tr><td>Número da Proposta</td><td><input type="text" name="numero">'
+            '<span><input type="submit" value="Pesquisar"></span></td></tr></tbody></table>'
+            '</form></div></div><div></div>'
+        )
+        if "numero" not in parametros and "pagina" not in parametros:
+            return pagina_fixture("Consultar Propostas", formulario + "<div></div>")
+
+        numero = parametros.get("numero", [""])[0].strip()
+        encontrados = [num for num in self.propostas if not numero or num == numero]
+        pagina = int(parametros.get("pagina", ["1"])[0])
+        inicio = (pagina - 1) * self.POR_PAGINA
+        linhas = "".join(
+            f'<tr><td><div><a href="/voluntarias/Proposta/Detalhar.do?id={self.propostas[num]["id"]}">{escape(num)}</a></div></td>'
+            f'<td>Proposta sintética</td></tr>'
+            for num in encontrados[inicio:inicio + self.POR_PAGINA]
+        )
+        paginacao = ""
+        if inicio + self.POR_PAGINA < len(encontrados):
+            paginacao = (f'<span class="pagelinks"><a href="/voluntarias/ConsultarProposta/ConsultarProposta.do?'
+                         f'numero={numero}&amp;pagina={pagina + 1}">Próx</a></span>')
+        return pagina_fixture("Consultar Propostas", f"{formulario}<div><table><tbody>{linhas}</tbody></table>{paginacao}</div>")
+
+    def _criar_manipulador(self):
+        bancada = self
+
+        class Manipulador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                bancada._atraso()
+                endereco = urlparse(self.path)
+                status, html = bancada.pagina(endereco.path, parse_qs(endereco.query, keep_blank_values=True))
+                corpo = html.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, formato, *args):
+                pass
+
+        return Manipulador
+
+
+def acao_esperada_fixture(servidor, num_proposta):
+    """Ação calculada diretamente sobre o HTML servido (sem navegador), usada como referência no benchmark."""
+    dados = servidor.propostas[num_proposta]
+    _, html_pareceres = servidor.pagina("/voluntarias/Proposta/Pareceres.do", {"id": [str(dados["id"])]})
+    _, html_requisitos = servidor.pagina("/voluntarias/Proposta/Requisitos.do", {"id": [str(dados["id"])]})
+    data_pareceres = robo.analisar_html_pareceres(html_pareceres)[4]
+    resultado_requisitos = robo.consolidar_requisitos(robo.extrair_tabelas_requisitos_html(html_requisitos))
+    return robo.decidir_acao(data_pareceres, resultado_requisitos[0], resultado_requisitos[6])
+
+
+def criar_navegador_headless():
+    """Abre um Chrome próprio, sem interface, para a bancada offline (não usa a sessão de depuração)."""
+    options = robo.webdriver.ChromeOptions()
+    for argumento in ("--headless=new", "--no-sandbox", "--disable-gpu", "--disable-dev-shm-usage", "--window-size=1366,900"):
+        options.add_argument(argumento)
+    return robo.webdriver.Chrome(service=robo.Service(robo.caminho_chromedriver()), options=options)
+
+
+def benchmark_offline(total_propostas=20, latencia_ms=80, jitter_ms=30, driver=None):
+    """
+    Executa o fluxo do robô de ponta a ponta contra o servidor local, com Chrome headless,
+    medindo cada etapa (navegar_menu_principal, verificar_pareceres, verificar_requisitos) e a
+    proposta completa (preencher_linha), e confere a ação obtida com a calculada sobre o HTML.
+
+    Args:
+        total_propostas (int): Quantidade de propostas sintéticas.
+        latencia_ms (float): Latência simulada por requisição.
+        jitter_ms (float): Variação da latência simulada.
+        driver (webdriver.Chrome): Navegador a usar; se omitido, um Chrome headless é aberto e fechado aqui.
+
+    Returns:
+        dict: {etapa: (quantidade, média, p50, p95, máximo)} mais 'propostas_por_hora' e 'divergencias'.
+    """
+    propostas = gerar_fixtures_propostas(total_propostas)
+    tempos = defaultdict(list)
+    bytes_por_proposta = []
+    divergencias = []
+
+    with ServidorTransferegovLocal(propostas, latencia_ms, jitter_ms) as servidor:
+        url_original, robo.URL_BASE = robo.URL_BASE, servidor.url
+        proprio = driver is None
+        driver = driver or criar_navegador_headless()
+        robo.preparar_aba(driver)
+        try:
+            # Etapas isoladas
+            robo.coletar_carga_proposta(driver)
+            for num_proposta in propostas:
+                inicio = time.perf_counter()
+                navegou = robo.navegar_menu_principal(driver, num_proposta)
+                tempos["navegar_menu_principal"].append(time.perf_counter() - inicio)
+                if not navegou:
+                    divergencias.append((num_proposta, "navegação falhou"))
+                    continue
+                inicio = time.perf_counter()
+                robo.verificar_pareceres(driver)
+                tempos["verificar_pareceres"].append(time.perf_counter() - inicio)
+                inicio = time.perf_counter()
+                robo.verificar_requisitos(driver)
+                tempos["verificar_requisitos"].append(time.perf_counter() - inicio)
+
+            # Proposta completa, como no processamento real
+            robo.coletar_carga_proposta(driver)
+            df = robo.pd.DataFrame({coluna: [''] * len(propostas) for coluna in robo.COLUNAS_SAIDA})
+            df['Nº Proposta'] = list(propostas)
+            for idx, num_proposta in zip(df.index, df['Nº Proposta']):
+                inicio = time.perf_counter()
+                df = robo.preencher_linha(df, idx, driver, num_proposta)
+                tempos["preencher_linha"].append(time.perf_counter() - inicio)
+                if carga := robo.coletar_carga_proposta(driver):
+                    bytes_por_proposta.append(carga["bytes"])
+                obtida, esperada = df.at[idx, 'Ação Necessária (Automação)'], acao_esperada_fixture(servidor, num_proposta)
+                if obtida != esperada:
+                    divergencias.append((num_proposta, f"ação '{obtida}' != '{esperada}'"))
+            requisicoes = servidor.requisicoes
+        finally:
+            robo.URL_BASE = url_original
+            if proprio:
+                driver.quit()
+
+    robo.resumo_carga_paginas()
+    robo.finalizar_metricas({})
+    relatorio = {etapa: robo.resumo_tempos(valores) for etapa, valores in tempos.items()}
+    media_proposta = relatorio["preencher_linha"][1]
+    relatorio["propostas_por_hora"] = 3600 / media_proposta if media_proposta else 0.0
+    relatorio["divergencias"] = divergencias
+    relatorio["bytes_por_proposta"] = sum(bytes_por_proposta) / len(bytes_por_proposta) if bytes_por_proposta else 0
+
+    print(f"\n[BENCH] Bancada offline: {total_propostas} propostas | latência {latencia_ms} ms ± {jitter_ms} ms "
+          f"| {requisicoes} requisições")
+    print(f"  {'Etapa':<24}{'n':>5}{'média':>10}{'p50':>10}{'p95':>10}{'máx':>10}")
+    for etapa, (quantidade, media, p50, p95, maximo) in ((e, relatorio[e]) for e in tempos):
+        print(f"  {etapa:<24}{quantidade:>5}{media:>9.2f}s{p50:>9.2f}s{p95:>9.2f}s{maximo:>9.2f}s")
+    print(f"  Vazão: {relatorio['propostas_por_hora']:.0f} propostas/hora | "
+          f"{relatorio['bytes_por_proposta'] / 1024:.0f} KB por proposta ({'modo enxuto' if robo.MODO_ENXUTO else 'modo normal'}) | "
+          f"divergências: {len(divergencias)}")
+    for num_proposta, motivo in divergencias[:10]:
+        print(f"    {num_proposta}: {motivo}")
+    return relatorio
+
+
+def benchmark_pipeline(total_propostas=100, latencia_ms=40, jitter_ms=10):
+    """
+    Compara, contra o servidor local e sem Chrome, o fluxo sequencial (coleta e análise na mesma
+    thread) com o pipeline de análise. A coleta baixa as páginas pelo ExtratorHTTP, no papel do
+    navegador; a análise é a real, com gravação na base de estado e no diário (em uma pasta temporária).
+
+    Args:
+        total_propostas (int): Quantidade de propostas sintéticas.
+        latencia_ms (float): Latência simulada por requisição.
+        jitter_ms (float): Variação da latência simulada.
+
+    Returns:
+        dict: {'sequencial': segundos, 'pipeline': segundos, 'ganho': razão, 'divergencias': quantidade}.
+    """
+    propostas = gerar_fixtures_propostas(total_propostas)
+    tempos = {}
+    acoes = {}
+
+    with ServidorTransferegovLocal(propostas, latencia_ms, jitter_ms) as servidor, \
+            tempfile.TemporaryDirectory() as pasta:
+        url_original, robo.URL_BASE = robo.URL_BASE, servidor.url
+        indice_propostas = robo.IndicePropostas(None)
+        for num_proposta, dados in propostas.items():
+            indice_propostas.registrar(
+                num_proposta, url_pareceres=f"{servidor.url}/voluntarias/Proposta/Pareceres.do?id={dados['id']}",
+                url_requisitos=f"{servidor.url}/voluntarias/Proposta/Requisitos.do?id={dados['id']}")
+        extrator_http = robo.ExtratorHTTP(sessao=robo.requests.Session(), indice_propostas=indice_propostas)
+        try:
+            for modo, ativo in (("sequencial", False), ("pipeline", True)):
+                estado_propostas = robo.EstadoPropostas(os.path.join(pasta, f"estado_{modo}.sqlite"))
+                diario = robo.DiarioResultados(os.path.join(pasta, f"diario_{modo}.jsonl"))
+                resultados = {}
+
+                def concluir(resultado):
+                    diario.registrar(resultado)
+                    resultados[resultado.num_proposta] = resultado.acao
+
+                with redirect_stdout(StringIO()):
+                    inicio = time.perf_counter()
+                    analise = robo.PipelineAnalise(concluir, estado_propostas, ativo=ativo)
+                    for idx, num_proposta in enumerate(propostas):
+                        analise.enviar(robo.coletar_proposta(idx, num_proposta, "", None, extrator_http))
+                    analise.encerrar()
+                    tempos[modo] = time.perf_counter() - inicio
+                estado_propostas.fechar()
+                acoes[modo] = resultados
+        finally:
+            robo.URL_BASE = url_original
+
+    robo.REGISTRO_ETAPAS.limpar()
+    divergencias = sum(acoes["sequencial"].get(num) != acoes["pipeline"].get(num) for num in propostas)
+    ganho = tempos["sequencial"] / max(tempos["pipeline"], 1e-9)
+    print(f"[BENCH] Pipeline de análise: {total_propostas} propostas | latência {latencia_ms} ms ± {jitter_ms} ms")
+    print(f"  Sequencial: {tempos['sequencial']:.2f}s ({3600 * total_propostas / tempos['sequencial']:.0f} propostas/hora)")
+    print(f"  Pipeline:   {tempos['pipeline']:.2f}s ({3600 * total_propostas / tempos['pipeline']:.0f} propostas/hora) "
+          f"| ganho: {ganho:.2f}x | divergências: {divergencias}")
+    return {**tempos, "ganho": ganho, "divergencias": divergencias}
+
+
+# Medições disponíveis na linha de comando: {nome: (função, propostas, latência, jitter) padrão}.
+BENCHMARKS = {
+    "offline": (benchmark_offline, 20, 80, 30),
+    "pipeline": (benchmark_pipeline, 100, 40, 10),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bancada de testes offline do robô Parecer-Requisitos.")
+    parser.add_argument("benchmark", choices=list(BENCHMARKS))
+    parser.add_argument("--propostas", type=int, help="Quantidade de propostas sintéticas.")
+    parser.add_argument("--latencia", type=float, help="Latência simulada por requisição, em ms.")
+    parser.add_argument("--jitter", type=float, help="Variação máxima da latência, em ms.")
+    args = parser.parse_args(argv)
+
+    funcao, propostas, latencia, jitter = BENCHMARKS[args.benchmark]
+    relatorio = funcao(args.propostas or propostas, args.latencia if args.latencia is not None else latencia,
+                       args.jitter if args.jitter is not None else jitter)
+    return 1 if relatorio["divergencias"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
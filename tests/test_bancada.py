@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Fluxo de coleta e análise contra o servidor local da bancada offline (sem Chrome).
+Execute com: python -m pytest tests
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+CAMINHO_BANCADA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bancada_offline.py")
+
+
+@pytest.fixture(scope="module")
+def bancada():
+    """bancada_offline.py carregado como módulo (ele mesmo carrega o script do robô)."""
+    spec = importlib.util.spec_from_file_location("bancada_offline", CAMINHO_BANCADA)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules["bancada_offline"] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def test_pipeline_chega_ao_mesmo_resultado_que_o_fluxo_sequencial(bancada):
+    relatorio = bancada.benchmark_pipeline(total_propostas=15, latencia_ms=0, jitter_ms=0)
+    assert relatorio["divergencias"] == 0
+
+
+def test_paginas_servidas_identificam_a_proposta(bancada):
+    propostas = bancada.gerar_fixtures_propostas(total=3)
+    with bancada.ServidorTransferegovLocal(propostas) as servidor:
+        for num_proposta, dados in propostas.items():
+            status, html = servidor.pagina("/voluntarias/Proposta/Requisitos.do", {"id": [str(dados["id"])]})
+            assert status == 200 and num_proposta in html
+            assert bancada.acao_esperada_fixture(servidor, num_proposta) in (
+                "Técnico Analisar", "Entidade Pendência de Documentação")
+        assert servidor.pagina("/voluntarias/Proposta/Pareceres.do", {"id": ["0"]})[0] == 404
+
+
+def test_extrator_http_recusa_pagina_de_outra_proposta(bancada):
+    robo = bancada.robo
+    propostas = bancada.gerar_fixtures_propostas(total=2)
+    (numero, dados), (_, outra) = propostas.items()
+    with bancada.ServidorTransferegovLocal(propostas) as servidor:
+        indice = robo.IndicePropostas(None)
+        extrator = robo.ExtratorHTTP(sessao=robo.requests.Session(), indice_propostas=indice)
+        # A URL de outra proposta imita uma página .do que devolve a última proposta aberta na sessão.
+        indice.registrar(numero, url_pareceres=f"{servidor.url}/voluntarias/Proposta/Pareceres.do?id={outra['id']}",
+                         url_requisitos=f"{servidor.url}/voluntarias/Proposta/Requisitos.do?id={dados['id']}")
+        assert extrator.baixar(numero) is None
+        indice.registrar(numero, url_pareceres=f"{servidor.url}/voluntarias/Proposta/Pareceres.do?id={dados['id']}",
+                         url_requisitos=f"{servidor.url}/voluntarias/Proposta/Requisitos.do?id={outra['id']}")
+        assert extrator.baixar(numero) is None
+        assert robo.ler_requisitos_direto(None, numero, indice, extrator) is None
+        indice.registrar(numero, url_requisitos=f"{servidor.url}/voluntarias/Proposta/Requisitos.do?id={dados['id']}")
+        assert extrator.baixar(numero) is not None
+
+
+def test_extrator_http_trata_redirecionamento_para_o_login_como_sessao_expirada(bancada):
+    robo = bancada.robo
+
+    class SessaoRedirecionada:
+        def get(self, url, timeout=None):
+            return type("Resposta", (), {"status_code": 200, "url": "https://sso.acesso.gov.br/authorize", "text": ""})()
+
+    robo.limpar_falha()
+    assert robo.ExtratorHTTP(sessao=SessaoRedirecionada()).obter_html("http://127.0.0.1/x.do") is None
+    assert robo.causa_falha_atual() == "sessao_expirada"
+    robo.limpar_falha()
+
+
+def test_incremental_refaz_a_extracao_quando_surge_um_novo_parecer(bancada, tmp_path):
+    robo = bancada.robo
+    propostas = bancada.gerar_fixtures_propostas(total=1)
+    numero, dados = next(iter(propostas.items()))
+    with bancada.ServidorTransferegovLocal(propostas) as servidor:
+        indice = robo.IndicePropostas(None)
+        indice.registrar(numero, url_pareceres=f"{servidor.url}/voluntarias/Proposta/Pareceres.do?id={dados['id']}",
+                         url_requisitos=f"{servidor.url}/voluntarias/Proposta/Requisitos.do?id={dados['id']}")
+        extrator = robo.ExtratorHTTP(sessao=robo.requests.Session(), indice_propostas=indice)
+        estado = robo.EstadoPropostas(str(tmp_path / "estado.sqlite"))
+        try:
+            analise = robo.PipelineAnalise(lambda resultado: None, estado, ativo=False)
+            analise.enviar(robo.coletar_proposta(0, numero, "", None, extrator))
+            analise.encerrar()
+
+            reaproveitada = robo.coletar_proposta_incremental(0, numero, "", None, extrator, indice, estado)
+            assert reaproveitada.resultado is not None
+
+            # Um parecer técnico novo não altera a aba Requisitos, mas muda a data que decide a ação.
+            dados["pareceres_proposta"].append(["30/06/2025 18:00:00", "Parecer Técnico", robo.NOMES_TECNICOS[0]])
+            alterada = robo.coletar_proposta_incremental(0, numero, "", None, extrator, indice, estado)
+            assert alterada.resultado is None and alterada.html_pareceres
+        finally:
+            estado.fechar()
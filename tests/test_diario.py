@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Diário de resultados (DiarioResultados): retomada pelos números registrados, última linha truncada
+por uma queda e gravação em lote. Execute com: python -m pytest tests
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+CAMINHO_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Parecer-Requisitos.py")
+
+
+@pytest.fixture(scope="module")
+def robo():
+    """O script carregado como módulo (o nome do arquivo tem hífen e não pode ser importado direto)."""
+    spec = importlib.util.spec_from_file_location("parecer_requisitos", CAMINHO_SCRIPT)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules["parecer_requisitos"] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "diario_resultados.jsonl")
+
+
+def resultado(robo, indice, num_proposta, acao="Técnico Analisar", **campos):
+    return robo.ResultadoProposta(indice, num_proposta, acao=acao, **campos)
+
+
+def test_registrar_lote_grava_uma_linha_por_proposta(robo, caminho):
+    diario = robo.DiarioResultados(caminho)
+    diario.registrar_lote([resultado(robo, 0, "1/2025"), resultado(robo, 1, "2/2025", certidoes="Sim")])
+    diario.registrar_lote([])
+
+    with open(caminho, encoding="utf-8") as f:
+        linhas = [json.loads(texto) for texto in f]
+    assert [linha["Nº Proposta"] for linha in linhas] == ["1/2025", "2/2025"]
+    assert linhas[1]["Certidões"] == "Sim"
+    assert linhas[0]["gravado_em"] == linhas[1]["gravado_em"]
+
+
+def test_retomada_usa_os_numeros_registrados_e_o_registro_mais_recente(robo, caminho):
+    robo.DiarioResultados(caminho).registrar(resultado(robo, 0, "1/2025", acao="Erro de Navegação"))
+    # Nova execução sobre o mesmo diário, com a planilha de entrada em outra ordem
+    diario = robo.DiarioResultados(caminho)
+    diario.registrar(resultado(robo, 5, "1/2025"))
+    diario.registrar(resultado(robo, 6, "3/2025"))
+
+    assert diario.propostas_registradas() == {"1/2025", "3/2025"}
+    assert diario.ler()["1/2025"]["Ação Necessária (Automação)"] == "Técnico Analisar"
+
+    df = pd.DataFrame({coluna: [""] * 3 for coluna in robo.COLUNAS_SAIDA})
+    df["Nº Proposta"] = ["3/2025", "2/2025", " 1/2025 "]
+    df["Certidões"] = "Não"
+    df = diario.aplicar(df)
+    assert list(df["Ação Necessária (Automação)"]) == ["Técnico Analisar", "", "Técnico Analisar"]
+    # Campos None no resultado deixam a coluna como estava
+    assert list(df["Certidões"]) == ["Não", "Não", "Não"]
+
+
+def test_ultima_linha_truncada_e_ignorada_e_nao_cola_no_proximo_registro(robo, caminho):
+    robo.DiarioResultados(caminho).registrar(resultado(robo, 0, "1/2025"))
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write('{"Nº Proposta": "2/2025", "Ação Neces')
+
+    diario = robo.DiarioResultados(caminho)
+    assert diario.propostas_registradas() == {"1/2025"}
+    diario.registrar(resultado(robo, 2, "3/2025"))
+    assert diario.propostas_registradas() == {"1/2025", "3/2025"}
+
+
+def test_arquivar_libera_o_diario_para_a_proxima_execucao(robo, caminho):
+    diario = robo.DiarioResultados(caminho)
+    diario.registrar(resultado(robo, 0, "1/2025"))
+    diario.arquivar()
+
+    assert not os.path.exists(caminho)
+    assert robo.DiarioResultados(caminho).propostas_registradas() == set()
+    assert len(os.listdir(os.path.dirname(caminho))) == 1
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Códigos de saída da linha de comando e resultado dos modos de processamento, sem navegador
+(a coleta de cada proposta é substituída). Execute com: python -m pytest tests
+"""
+
+import importlib.util
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+CAMINHO_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Parecer-Requisitos.py")
+
+
+@pytest.fixture(scope="module")
+def robo():
+    """O script carregado como módulo (o nome do arquivo tem hífen e não pode ser importado direto)."""
+    spec = importlib.util.spec_from_file_location("parecer_requisitos", CAMINHO_SCRIPT)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules["parecer_requisitos"] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+@pytest.fixture
+def entrada(robo, monkeypatch):
+    """Planilha de entrada com três propostas de convênio e navegador dispensado."""
+    df = pd.DataFrame({coluna: [""] * 3 for coluna in robo.COLUNAS_SAIDA})
+    df["Nº Proposta"] = ["1/2025", "2/2025", "3/2025"]
+    df["Instrumento"] = "Convênio"
+    monkeypatch.setattr(robo, "ler_entrada_excel", lambda caminho: df.copy())
+    monkeypatch.setattr(robo, "preparar_aba", lambda driver: None)
+    return df
+
+
+def coleta_com_causa(robo, causa):
+    """Substituto de executar_coleta que conclui cada proposta com a ação e a causa dadas."""
+    def executar_coleta(coletar, analise, indice, num_proposta, situacional, driver, *apoio):
+        acao = "Erro de Navegação" if causa else "Técnico Analisar"
+        analise.enviar(robo.ColetaProposta(indice, num_proposta, resultado=robo.ResultadoProposta(
+            indice, num_proposta, acao=acao, causa_falha=causa)))
+    return executar_coleta
+
+
+@pytest.mark.parametrize("modo", ["planilha", "reavaliar", "offline", "mesclar"])
+def test_modo_sem_arquivos_termina_com_codigo_de_falha(robo, tmp_path, modo):
+    assert robo.main([modo, "--pasta", str(tmp_path)]) == 1
+
+
+def test_processamento_completo_bem_sucedido(robo, entrada, tmp_path, monkeypatch):
+    monkeypatch.setattr(robo, "executar_coleta", coleta_com_causa(robo, None))
+    assert robo.rodar_processamento_completo(None, robo.montar_caminhos(str(tmp_path)), "Todos") is True
+    assert os.path.exists(tmp_path / "resultado_analise_propostas.xlsx")
+
+
+def test_processamento_completo_falha_com_sessao_expirada(robo, entrada, tmp_path, monkeypatch):
+    monkeypatch.setattr(robo, "executar_coleta", coleta_com_causa(robo, "sessao_expirada"))
+    assert robo.rodar_processamento_completo(None, robo.montar_caminhos(str(tmp_path)), "Todos") is False
+
+
+def test_processamento_completo_falha_com_filtro_vazio(robo, entrada, tmp_path):
+    assert robo.rodar_processamento_completo(None, robo.montar_caminhos(str(tmp_path)), "Termo de Fomento") is False
+
+
+def test_processamento_completo_continua_apos_falha_inesperada(robo, entrada, tmp_path, monkeypatch):
+    concluir = coleta_com_causa(robo, None)
+
+    def executar_coleta(coletar, analise, indice, num_proposta, *args):
+        if num_proposta == "2/2025":
+            raise RuntimeError("o navegador deixou de responder")
+        return concluir(coletar, analise, indice, num_proposta, *args)
+
+    monkeypatch.setattr(robo, "executar_coleta", executar_coleta)
+    paths = robo.montar_caminhos(str(tmp_path))
+    assert robo.rodar_processamento_completo(None, paths, "Todos") is False
+    # As demais propostas foram analisadas e gravadas; o diário fica para a próxima execução retomar
+    assert robo.DiarioResultados(paths["diario"]).propostas_registradas() == {"1/2025", "3/2025"}
+    assert os.path.exists(paths["saida"])
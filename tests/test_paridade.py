@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Paridade das implementações atuais com a lógica original do robô.
+
+As funções *_original abaixo são cópias congeladas do código antes da tabela de regras
+(REGRAS_ACAO) e da conversão de datas por FORMATOS_DATA; o script não as importa. Execute com: python -m pytest tests
+"""
+
+import importlib.util
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+CAMINHO_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Parecer-Requisitos.py")
+
+
+@pytest.fixture(scope="module")
+def robo():
+    """O script carregado como módulo (o nome do arquivo tem hífen e não pode ser importado direto)."""
+    spec = importlib.util.spec_from_file_location("parecer_requisitos", CAMINHO_SCRIPT)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules["parecer_requisitos"] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def classificar_situacional_original(situacional):
+    situacionais_em_celebracao = [
+        "Parecer e Termo para Correção", "Parecer e Termo Corrigido (Necessidade de Ajuste)",
+        "Parecer para Assinatura", "Termo Disponibilizado Usuário Externo",
+        "Termo Disponibilizado Secretário(a)", "Processo Enviado ao GAB - Para Publicação"
+    ]
+    situacionais_parceria_celebrada = [
+        "Aguardando Registro Transferegov CGFP", "Cláusula Suspensiva 2025", "Enviado à CGAP"
+    ]
+    situacionais_proposta_rejeitada = ["Alteração de Beneficiário", "Proposta Rejeitada"]
+    situacionais_tecnico_analisar = ["Enviar Link Declarações", "Enviado Link Declarações"]
+
+    if situacional in situacionais_em_celebracao:
+        return "Em Celebração"
+    elif situacional in situacionais_parceria_celebrada:
+        return "Parceria Celebrada"
+    elif situacional in situacionais_proposta_rejeitada:
+        return "Proposta Rejeitada"
+    elif situacional in situacionais_tecnico_analisar:
+        return "Técnico Analisar"
+    return None
+
+
+def decidir_acao_original(data_pareceres, data_requisitos, historico_evento):
+    if data_pareceres and data_requisitos:
+        if data_pareceres > data_requisitos:
+            return "Entidade Pendência de Documentação"
+        elif data_requisitos > data_pareceres:
+            return "Técnico Analisar"
+        else: # Datas são iguais, desempate pelo evento do histórico
+            if "Complementação Solicitada" in historico_evento:
+                return "Entidade Pendência de Documentação"
+            else:
+                return "Técnico Analisar"
+    elif data_requisitos and not data_pareceres:
+        return "Técnico Analisar"
+    elif data_pareceres and not data_requisitos:
+        return "Entidade Pendência de Documentação"
+    else: # Nenhum documento ou parecer encontrado
+        return "Entidade Pendência de Documentação"
+
+
+def casos_regras(regras):
+    """Todas as combinações relevantes de situacional, datas (ausente, iguais, diferentes) e evento do histórico."""
+    situacionais = [s for _, lista in regras["situacional"] for s in lista] + ["", "Em análise", "Outro situacional"]
+    datas = [None, datetime(2025, 3, 1, 9, 0), datetime(2025, 3, 1, 9, 0, 30), datetime(2025, 5, 20)]
+    eventos = ["", "Complementação Solicitada", "Análise Registrada", "Erro de Navegação"]
+    return [(s, dp, dr, ev) for s in situacionais for dp in datas for dr in datas for ev in eventos]
+
+
+def test_avaliar_acoes_reproduz_logica_original(robo):
+    casos = casos_regras(robo.REGRAS_ACAO)
+    corpus = pd.DataFrame(casos, columns=["Situacional (Documentação)", "data_pareceres",
+                                          "data_requisitos", "Histórico (Evento)"])
+    esperado = [classificar_situacional_original(s.strip()) or decidir_acao_original(dp, dr, ev)
+                for s, dp, dr, ev in casos]
+    obtido = robo.avaliar_acoes(corpus)
+    divergentes = corpus[obtido.values != pd.Series(esperado).values]
+    assert divergentes.empty, divergentes.head(10).to_string()
+
+
+def test_decisao_por_proposta_reproduz_logica_original(robo):
+    for situacional, data_pareceres, data_requisitos, evento in casos_regras(robo.REGRAS_ACAO):
+        esperado = classificar_situacional_original(situacional.strip()) or \
+            decidir_acao_original(data_pareceres, data_requisitos, evento)
+        obtido = robo.classificar_situacional(situacional.strip()) or \
+            robo.decidir_acao(data_pareceres, data_requisitos, evento)
+        assert obtido == esperado, (situacional, data_pareceres, data_requisitos, evento)
+
+
+def test_decidir_acao_coincide_com_avaliar_acoes(robo):
+    datas = [None, pd.NaT, datetime(2025, 1, 1), datetime(2025, 1, 2)]
+    eventos = [None, "", "Complementação Solicitada pelo técnico", "Envio"]
+    casos = [(dp, dr, ev) for dp in datas for dr in datas for ev in eventos]
+    vetorizado = robo.avaliar_acoes(pd.DataFrame(casos, columns=["data_pareceres", "data_requisitos", "Histórico (Evento)"]))
+    for caso, esperado in zip(casos, vetorizado):
+        assert robo.decidir_acao(*caso) == esperado, caso
+
+
+def extrair_data_original(texto_data):
+    if not texto_data:
+        return None, None
+
+    formatos_suportados = ["%d/%m/%Y %H:%M:%S", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]
+    for formato in formatos_suportados:
+        try:
+            data_obj = datetime.strptime(texto_data, formato)
+            return data_obj, data_obj.strftime("%d/%m/%Y %H:%M:%S")
+        except ValueError:
+            continue
+    return None, None
+
+
+def corpus_datas():
+    """Textos de data: formatos válidos, dígitos únicos, datas inválidas, espaços e textos que não são datas."""
+    corpus = [
+        "", "Erro ao extrair", "Nenhum(a) outros localizado(a)", "N/A (Definido pelo Situacional)",
+        "01/02/2025 10:11:12", "1/2/2025 1:2:3", "31/12/2024 23:59:59", "01/02/2025", "1/2/2025",
+        "2025-02-01 10:11:12", "2025-2-1 1:2:3", "2025-02-01", "2025-2-1",
+        "31/02/2025", "29/02/2024 00:00:00", "29/02/2023", "00/01/2025", "01/13/2025", "2025-13-01",
+        "01/02/2025 24:00:00", "01/02/2025 10:60:00", "01/02/2025 10:00:60", "01/02/2025 10:00:61",
+        "01/02/2025 10:11", " 01/02/2025", "01/02/2025 ", "01/02/2025  10:11:12", " 1/02/2025",
+        "01-02-2025", "2025/02/01", "01/02/25", "001/02/2025", "01/02/02025", "2025-02-01T10:11:12",
+        "01/02/2025 10:11:12.5", "١/٢/٢٠٢٥", "01/02/2025\n", "01 / 02 / 2025",
+    ]
+    for dia in (1, 9, 10, 28, 29, 30, 31):
+        for mes in (1, 2, 9, 12):
+            for ano in (1999, 2024, 2025):
+                corpus += [f"{dia}/{mes}/{ano}", f"{dia:02d}/{mes:02d}/{ano} 08:30:00",
+                           f"{ano}-{mes:02d}-{dia:02d}", f"{ano}-{mes}-{dia} 8:30:0"]
+    return corpus
+
+
+@pytest.mark.parametrize("texto", corpus_datas())
+def test_extrair_data_reproduz_conversao_original(robo, texto):
+    assert robo.extrair_data(texto) == extrair_data_original(texto)
+
+
+def test_extrair_datas_em_lote_reproduz_conversao_original(robo):
+    corpus = corpus_datas()
+    _, formatadas = robo.extrair_datas(pd.Series(corpus))
+    assert list(formatadas) == [extrair_data_original(texto)[1] for texto in corpus]
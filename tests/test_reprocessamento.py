@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Fila de novas tentativas do reprocessamento de falhas (reprocessar_falhas), sem navegador: causas
+transitórias e permanentes, espera exponencial e limite de tentativas entre execuções.
+Execute com: python -m pytest tests
+"""
+
+import importlib.util
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+CAMINHO_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Parecer-Requisitos.py")
+
+
+@pytest.fixture(scope="module")
+def robo():
+    """O script carregado como módulo (o nome do arquivo tem hífen e não pode ser importado direto)."""
+    spec = importlib.util.spec_from_file_location("parecer_requisitos", CAMINHO_SCRIPT)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules["parecer_requisitos"] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+@pytest.fixture
+def paths(robo, tmp_path, monkeypatch):
+    """Planilha de saída com duas propostas que falharam e uma concluída; navegador dispensado."""
+    df = pd.DataFrame({coluna: [""] * 3 for coluna in robo.COLUNAS_SAIDA})
+    df["Nº Proposta"] = ["1/2025", "2/2025", "3/2025"]
+    df["Instrumento"] = "Convênio"
+    df["Ação Necessária (Automação)"] = ["Erro de Navegação", "Instrumento não encontrado", "Técnico Analisar"]
+    paths = robo.montar_caminhos(str(tmp_path))
+    df.to_excel(paths["saida"], index=False)
+    monkeypatch.setattr(robo, "preparar_aba", lambda driver: None)
+    return paths
+
+
+@pytest.fixture
+def esperas(robo, monkeypatch):
+    """Esperas pedidas a time.sleep, sem esperar de fato."""
+    pedidas = []
+    monkeypatch.setattr(robo.time, "sleep", pedidas.append)
+    return pedidas
+
+
+def tentativas_com_causas(robo, causas):
+    """
+    Substituto de executar_proposta: cada chamada da proposta consome a próxima causa da sua lista
+    (None = concluída) e grava o desfecho na base de estado, como o original. Retorna as chamadas feitas.
+    """
+    chamadas = []
+
+    def executar_proposta(processar, indice, num_proposta, situacional, driver, *apoio):
+        causa = causas[num_proposta][sum(num == num_proposta for num in chamadas)]
+        chamadas.append(num_proposta)
+        resultado = robo.ResultadoProposta(indice, num_proposta, acao="Erro de Navegação" if causa else
+                                           "Técnico Analisar", causa_falha=causa)
+        robo.registrar_desfecho(apoio[-1], resultado)
+        return resultado, None
+
+    return executar_proposta, chamadas
+
+
+def falhas_gravadas(robo, paths):
+    estado = robo.EstadoPropostas(paths["estado"])
+    try:
+        return estado.falhas()
+    finally:
+        estado.fechar()
+
+
+def test_falha_transitoria_volta_para_a_fila_com_espera_exponencial(robo, paths, esperas, monkeypatch):
+    executar_proposta, chamadas = tentativas_com_causas(robo, {
+        "1/2025": ["timeout", "seletor_ausente", None],
+        "2/2025": [None],
+    })
+    monkeypatch.setattr(robo, "executar_proposta", executar_proposta)
+
+    assert robo.reprocessar_falhas(None, paths, "Todos") is True
+    assert chamadas == ["1/2025", "2/2025", "1/2025", "1/2025"]
+    base = robo.ESPERA_BASE_RETENTATIVA
+    assert [round(espera) for espera in esperas] == [base, 2 * base]
+    assert falhas_gravadas(robo, paths) == {}
+    df = pd.read_excel(paths["saida"], dtype=str)
+    assert list(df["Ação Necessária (Automação)"]) == ["Técnico Analisar"] * 3
+
+
+def test_espera_nao_passa_do_limite(robo, paths, esperas, monkeypatch):
+    monkeypatch.setattr(robo, "TENTATIVAS_MAXIMAS", 4)
+    monkeypatch.setattr(robo, "ESPERA_BASE_RETENTATIVA", 30)
+    monkeypatch.setattr(robo, "ESPERA_MAXIMA_RETENTATIVA", 45)
+    executar_proposta, chamadas = tentativas_com_causas(robo, {
+        "1/2025": ["timeout"] * 4,
+        "2/2025": [None],
+    })
+    monkeypatch.setattr(robo, "executar_proposta", executar_proposta)
+
+    robo.reprocessar_falhas(None, paths, "Todos")
+    assert chamadas.count("1/2025") == 4
+    assert [round(espera) for espera in esperas] == [30, 45, 45]
+
+
+def test_falha_permanente_nao_e_tentada(robo, paths, esperas, monkeypatch):
+    estado = robo.EstadoPropostas(paths["estado"])
+    estado.registrar_falha("2/2025", "nao_encontrado")
+    estado.fechar()
+    executar_proposta, chamadas = tentativas_com_causas(robo, {"1/2025": [None]})
+    monkeypatch.setattr(robo, "executar_proposta", executar_proposta)
+
+    assert robo.reprocessar_falhas(None, paths, "Todos") is True
+    assert chamadas == ["1/2025"]
+    assert esperas == []
+    assert falhas_gravadas(robo, paths) == {"2/2025": ("nao_encontrado", 1)}
+
+
+def test_tentativas_maximas_contam_as_execucoes_anteriores(robo, paths, esperas, monkeypatch):
+    estado = robo.EstadoPropostas(paths["estado"])
+    estado.registrar_falha("2/2025", "nao_encontrado")
+    for _ in range(robo.TENTATIVAS_MAXIMAS - 1):
+        estado.registrar_falha("1/2025", "timeout")
+    estado.fechar()
+    executar_proposta, chamadas = tentativas_com_causas(robo, {"1/2025": ["timeout"] * robo.TENTATIVAS_MAXIMAS})
+    monkeypatch.setattr(robo, "executar_proposta", executar_proposta)
+
+    # Resta uma única tentativa, sem nova volta à fila
+    robo.reprocessar_falhas(None, paths, "Todos")
+    assert chamadas == ["1/2025"]
+    assert esperas == []
+    assert falhas_gravadas(robo, paths)["1/2025"] == ("timeout", robo.TENTATIVAS_MAXIMAS)
+
+    # Na execução seguinte a proposta já esgotou as tentativas e é pulada
+    assert robo.reprocessar_falhas(None, paths, "Todos") is True
+    assert chamadas == ["1/2025"]
+
+
+def test_sessao_expirada_interrompe_a_passada(robo, paths, esperas, monkeypatch):
+    executar_proposta, chamadas = tentativas_com_causas(robo, {
+        "1/2025": ["sessao_expirada"],
+        "2/2025": [None],
+    })
+    monkeypatch.setattr(robo, "executar_proposta", executar_proposta)
+
+    assert robo.reprocessar_falhas(None, paths, "Todos") is False
+    assert chamadas == ["1/2025"]
+    # A proposta seguinte fica como estava, para o reprocessamento após o novo login
+    df = pd.read_excel(paths["saida"], dtype=str)
+    assert df["Ação Necessária (Automação)"][1] == "Instrumento não encontrado"
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Registro de seletores (RegistroSeletores), com um navegador falso: ordem das estratégias alternativas,
+estratégia preferida gravada entre execuções e alvo quebrado. Execute com: python -m pytest tests
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+CAMINHO_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Parecer-Requisitos.py")
+
+SELETORES = {
+    "botao": [
+        ("xpath", "/html/body/div[3]/form/input"),
+        ("css", "form input[type='submit']"),
+        ("xpath", "//input[@value='Pesquisar']"),
+    ],
+    "link": [
+        ("xpath", "/html/body/table/tr/td/a"),
+        ("xpath", "//a[normalize-space(.)='{num_proposta}']"),
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def robo():
+    """O script carregado como módulo (o nome do arquivo tem hífen e não pode ser importado direto)."""
+    spec = importlib.util.spec_from_file_location("parecer_requisitos", CAMINHO_SCRIPT)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules["parecer_requisitos"] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+class ElementoFalso:
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+
+class NavegadorFalso:
+    """Página em que só os seletores de 'presentes' encontram elementos."""
+
+    def __init__(self, *presentes):
+        self.presentes = set(presentes)
+        self.consultas = []
+
+    def find_elements(self, por, seletor):
+        self.consultas.append(seletor)
+        return [ElementoFalso()] if seletor in self.presentes else []
+
+
+@pytest.fixture(autouse=True)
+def espera_unica(robo, monkeypatch):
+    """Avalia a condição de espera uma única vez, sem WebDriverWait nem tempo limite."""
+    monkeypatch.setattr(robo, "esperar_condicao", lambda driver, condicao, etapa=None, tempo=None:
+                        condicao(driver) or None)
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / ".seletores_preferidos.json")
+
+
+def test_estrategias_seguem_a_ordem_de_seletores(robo, caminho):
+    registro = robo.RegistroSeletores(SELETORES, caminho)
+    assert registro.estrategias("botao") == SELETORES["botao"]
+
+    navegador = NavegadorFalso(*(seletor for _, seletor in SELETORES["botao"]))
+    assert registro.localizar(navegador, "botao") is not None
+    assert navegador.consultas == [SELETORES["botao"][0][1]]
+    assert not os.path.exists(caminho)
+
+
+def test_alternativa_que_funcionou_passa_a_ser_a_preferida(robo, caminho):
+    registro = robo.RegistroSeletores(SELETORES, caminho)
+    alternativa = SELETORES["botao"][2]
+    navegador = NavegadorFalso(alternativa[1])
+
+    assert registro.localizar(navegador, "botao") is not None
+    assert navegador.consultas == [seletor for _, seletor in SELETORES["botao"]]
+    assert registro.estrategias("botao") == [alternativa, *SELETORES["botao"][:2]]
+    # A preferida é consultada primeiro, mesmo que o seletor original volte a funcionar
+    navegador = NavegadorFalso(SELETORES["botao"][0][1], alternativa[1])
+    registro.localizar(navegador, "botao")
+    assert navegador.consultas == [alternativa[1]]
+
+
+def test_preferida_vale_entre_execucoes(robo, caminho):
+    robo.RegistroSeletores(SELETORES, caminho).localizar(NavegadorFalso(SELETORES["botao"][1][1]), "botao")
+    with open(caminho, encoding="utf-8") as f:
+        assert json.load(f) == {"botao": list(SELETORES["botao"][1])}
+
+    assert robo.RegistroSeletores(SELETORES, caminho).estrategias("botao")[0] == SELETORES["botao"][1]
+    assert robo.RegistroSeletores(SELETORES, None).estrategias("botao") == SELETORES["botao"]
+
+
+def test_preferida_que_saiu_de_seletores_e_descartada(robo, caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump({"botao": ["css", "button.antigo"], "link": "xpath"}, f)
+    registro = robo.RegistroSeletores(SELETORES, caminho)
+    assert registro.estrategias("botao") == SELETORES["botao"]
+    assert registro.estrategias("link") == SELETORES["link"]
+
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write("{ilegível")
+    assert robo.RegistroSeletores(SELETORES, caminho).estrategias("botao") == SELETORES["botao"]
+
+
+def test_usar_arquivo_rele_as_preferidas(robo, tmp_path):
+    primeiro, segundo = str(tmp_path / "a.json"), str(tmp_path / "b.json")
+    with open(segundo, "w", encoding="utf-8") as f:
+        json.dump({"botao": list(SELETORES["botao"][2])}, f)
+    registro = robo.RegistroSeletores(SELETORES, primeiro)
+    assert registro.estrategias("botao")[0] == SELETORES["botao"][0]
+
+    registro.usar_arquivo(segundo)
+    assert registro.estrategias("botao")[0] == SELETORES["botao"][2]
+
+
+def test_seletor_modelo_recebe_o_numero_da_proposta(robo, caminho):
+    registro = robo.RegistroSeletores(SELETORES, caminho)
+    navegador = NavegadorFalso("//a[normalize-space(.)='12/2025']")
+    assert registro.localizar(navegador, "link", num_proposta="12/2025") is not None
+    assert registro.estrategias("link")[0] == SELETORES["link"][1]
+
+
+def test_alvo_quebrado_apos_limite_de_propostas_seguidas(robo, caminho):
+    registro = robo.RegistroSeletores(SELETORES, caminho, limite_falhas=3)
+    vazio = NavegadorFalso()
+    for num_proposta in ["1/2025", "1/2025", "2/2025"]:
+        with robo.REGISTRO_ETAPAS.medir("proposta", num_proposta):
+            assert registro.localizar(vazio, "botao") is None
+    assert registro.quebrado is None
+
+    # Encontrar o alvo zera a sequência de falhas
+    registro.localizar(NavegadorFalso(SELETORES["botao"][0][1]), "botao")
+    for num_proposta in ["3/2025", "4/2025", "5/2025"]:
+        with robo.REGISTRO_ETAPAS.medir("proposta", num_proposta):
+            registro.localizar(vazio, "botao")
+    assert registro.quebrado == "botao"
+    assert registro.propostas_afetadas() == ["3/2025", "4/2025", "5/2025"]
+
+    registro.reiniciar()
+    assert registro.quebrado is None
+    assert registro.propostas_afetadas() == []
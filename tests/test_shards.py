@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Divisão das propostas em shards (shard_da_proposta, mascara_shard) e junção das saídas e diários dos
+shards (mesclar_shards). Execute com: python -m pytest tests
+"""
+
+import importlib.util
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+CAMINHO_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Parecer-Requisitos.py")
+
+PROPOSTAS = [f"{numero}/2025" for numero in range(1, 41)]
+
+
+@pytest.fixture(scope="module")
+def robo():
+    """O script carregado como módulo (o nome do arquivo tem hífen e não pode ser importado direto)."""
+    spec = importlib.util.spec_from_file_location("parecer_requisitos", CAMINHO_SCRIPT)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules["parecer_requisitos"] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def planilha(robo, numeros, acao=""):
+    df = pd.DataFrame({coluna: [""] * len(numeros) for coluna in robo.COLUNAS_SAIDA})
+    df["Nº Proposta"] = list(numeros)
+    df["Instrumento"] = "Convênio"
+    df["Ação Necessária (Automação)"] = acao
+    return df
+
+
+def partes(robo, total):
+    """{parte: propostas de PROPOSTAS que pertencem a ela}."""
+    return {parte: [num for num in PROPOSTAS if robo.shard_da_proposta(num, total) == parte]
+            for parte in range(1, total + 1)}
+
+
+@pytest.mark.parametrize("total", [1, 2, 3, 4])
+def test_cada_proposta_pertence_a_exatamente_um_shard(robo, total):
+    numeros = pd.Series(PROPOSTAS)
+    mascaras = [robo.mascara_shard(numeros, (parte, total)) for parte in range(1, total + 1)]
+    assert (sum(mascara.astype(int) for mascara in mascaras) == 1).all()
+    assert all(1 <= robo.shard_da_proposta(num, total) <= total for num in PROPOSTAS)
+
+
+def test_shard_depende_apenas_do_numero_da_proposta(robo):
+    assert robo.shard_da_proposta(" 7/2025 ", 4) == robo.shard_da_proposta("7/2025", 4)
+    df = planilha(robo, PROPOSTAS)
+    invertida = df.iloc[::-1].reset_index(drop=True)
+    assert (set(robo.filtrar_propostas(df, "Todos", (2, 4))["Nº Proposta"])
+            == set(robo.filtrar_propostas(invertida, "Todos", (2, 4))["Nº Proposta"])
+            == set(partes(robo, 4)[2]))
+
+
+def test_mesclar_sobrepoe_saidas_e_diarios_dos_shards(robo, tmp_path, monkeypatch):
+    paths = robo.montar_caminhos(str(tmp_path))
+    open(paths["entrada"], "wb").close()
+    monkeypatch.setattr(robo, "ler_entrada_excel", lambda caminho: planilha(robo, PROPOSTAS))
+    divisao = partes(robo, 2)
+
+    # O shard 1 terminou; o shard 2 gravou a saída com parte das propostas e foi interrompido depois
+    robo.salvar_resultado(planilha(robo, divisao[1], "Técnico Analisar"),
+                          robo.montar_caminhos(str(tmp_path), (1, 2))["saida"])
+    paths_shard2 = robo.montar_caminhos(str(tmp_path), (2, 2))
+    concluidas, interrompidas = divisao[2][:3], divisao[2][3:]
+    robo.salvar_resultado(pd.concat([planilha(robo, concluidas, "Erro de Navegação"), planilha(robo, interrompidas)]),
+                          paths_shard2["saida"])
+    robo.DiarioResultados(paths_shard2["diario"]).registrar_lote(
+        [robo.ResultadoProposta(0, num, acao="Técnico Analisar") for num in concluidas + interrompidas[:1]])
+
+    assert robo.mesclar_shards(paths) is True
+    df = pd.read_excel(paths["saida"], dtype=str).fillna("").set_index("Nº Proposta")
+    assert list(df.index) == PROPOSTAS
+    acoes = df["Ação Necessária (Automação)"]
+    # O diário do shard interrompido prevalece sobre a saída que ele havia gravado
+    assert (acoes[divisao[1] + concluidas + interrompidas[:1]] == "Técnico Analisar").all()
+    assert (acoes[interrompidas[1:]] == "").all()
+
+
+def test_mesclar_inclui_propostas_que_so_constam_do_diario(robo, tmp_path):
+    paths = robo.montar_caminhos(str(tmp_path))
+    divisao = partes(robo, 2)
+    robo.salvar_resultado(planilha(robo, divisao[1], "Técnico Analisar"),
+                          robo.montar_caminhos(str(tmp_path), (1, 2))["saida"])
+    robo.DiarioResultados(robo.montar_caminhos(str(tmp_path), (2, 2))["diario"]).registrar(
+        robo.ResultadoProposta(0, divisao[2][0], acao="Técnico Analisar"))
+
+    assert robo.mesclar_shards(paths) is True
+    df = pd.read_excel(paths["saida"], dtype=str)
+    assert set(df["Nº Proposta"]) == set(divisao[1]) | {divisao[2][0]}
+
+
+def test_mesclar_com_shard_faltando_grava_e_falha(robo, tmp_path):
+    paths = robo.montar_caminhos(str(tmp_path))
+    divisao = partes(robo, 3)
+    for parte in (1, 3):
+        robo.salvar_resultado(planilha(robo, divisao[parte], "Técnico Analisar"),
+                              robo.montar_caminhos(str(tmp_path), (parte, 3))["saida"])
+
+    assert robo.mesclar_shards(paths) is False
+    df = pd.read_excel(paths["saida"], dtype=str)
+    assert set(df["Nº Proposta"]) == set(divisao[1]) | set(divisao[3])